@@ -0,0 +1,200 @@
+"""
+Throughput benchmarks for `mavetools.client` against a local stand-in for the MaveDB API.
+
+The benchmarks run fully offline. The stand-in server, `mavetools.client.testing.StandInServer`, runs in a separate
+process so that it does not compete with the client for the event loop. Each scenario is run at each concurrency
+level with a new client, and reports requests per second, latency percentiles and the peak memory allocated by
+Python while it ran. Memory is measured in a separate run, since tracing allocations slows the client down.
+
+Example::
+
+    python benchmarks/bench_client.py --scenarios get upload download --concurrency 1 10 50 --requests 500 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from mavetools.client.client import Client, Submission
+from mavetools.client.metrics import ClientMetrics
+from mavetools.client.retry import RetryPolicy
+from mavetools.client.testing import StandInServer
+
+SCENARIOS = ("get", "create", "upload", "download")
+
+EXPERIMENT = {
+    "title": "Benchmark experiment",
+    "short_description": "An experiment created by the client benchmarks.",
+    "abstract_text": "Abstract.",
+    "method_text": "Methods.",
+}
+
+
+def serve(options: Dict, connection) -> None:
+    """Run a stand-in server until the process is terminated, sending its URL through `connection`."""
+
+    async def main() -> None:
+        server = StandInServer(**options)
+        connection.send(await server.start())
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+async def bench_get(client: Client, requests: int, concurrency: int, args: argparse.Namespace) -> None:
+    urns = [f"urn:mavedb:{i:08}-a-1" for i in range(1, requests + 1)]
+    await client.get_datasets(urns, concurrency=concurrency)
+
+
+async def bench_create(client: Client, requests: int, concurrency: int, args: argparse.Namespace) -> None:
+    submissions = [Submission(str(i), EXPERIMENT) for i in range(requests)]
+    await client.create_datasets(submissions, concurrency=concurrency)
+
+
+async def bench_upload(client: Client, requests: int, concurrency: int, args: argparse.Namespace) -> None:
+    scores = pd.DataFrame(
+        {"hgvs_pro": [f"p.Ala{i}Val" for i in range(1, args.rows + 1)], "score": np.linspace(0, 1, args.rows)}
+    )
+    limit = asyncio.Semaphore(concurrency)
+
+    async def upload(i: int) -> None:
+        async with limit:
+            await client.upload_dataframes({"urn": f"urn:mavedb:{i:08}-a-1"}, scores)
+
+    await asyncio.gather(*(upload(i) for i in range(1, requests + 1)))
+
+
+async def bench_download(client: Client, requests: int, concurrency: int, args: argparse.Namespace) -> None:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def download(i: int) -> None:
+        async with limit:
+            async for _ in client.iter_scores(f"urn:mavedb:{i:08}-a-1"):
+                pass
+
+    await asyncio.gather(*(download(i) for i in range(1, requests + 1)))
+
+
+BENCHMARKS = {"get": bench_get, "create": bench_create, "upload": bench_upload, "download": bench_download}
+
+
+async def run(url: str, scenario: str, concurrency: int, args: argparse.Namespace, trace_memory: bool) -> Dict:
+    """Run a scenario once with a new client and return its measurements."""
+    measurements = []
+    client = Client(
+        base_url=url,
+        auth_token="benchmark",
+        memory_cache_size=0,
+        retry=RetryPolicy(backoff=args.backoff),
+        metrics=ClientMetrics(callback=measurements.append),
+    )
+    async with client:
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        await BENCHMARKS[scenario](client, args.requests, concurrency, args)
+        elapsed = time.perf_counter() - started
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    latencies = np.array([m.total for m in measurements]) if measurements else np.zeros(1)
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": len(measurements),
+        "errors": sum(1 for m in measurements if m.error is not None),
+        "retries": sum(m.retries for m in measurements),
+        "seconds": elapsed,
+        "requests_per_second": len(measurements) / elapsed,
+        "p50": float(np.percentile(latencies, 50)),
+        "p95": float(np.percentile(latencies, 95)),
+        "p99": float(np.percentile(latencies, 99)),
+        "max": float(latencies.max()),
+        "peak_memory": peak,
+    }
+
+
+def format_result(result: Dict) -> str:
+    memory = "-" if result["peak_memory"] is None else "{:.1f}".format(result["peak_memory"] / 2**20)
+    return "{:<8}{:>6}{:>9}{:>8}{:>10.1f}{:>10.1f}{:>10.1f}{:>10.1f}{:>10.1f}{:>10}".format(
+        result["scenario"],
+        result["concurrency"],
+        result["requests"],
+        result["errors"],
+        result["requests_per_second"],
+        result["p50"] * 1000,
+        result["p95"] * 1000,
+        result["p99"] * 1000,
+        result["max"] * 1000,
+        memory,
+    )
+
+
+HEADER = "{:<8}{:>6}{:>9}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}{:>10}".format(
+    "scenario", "conc", "requests", "errors", "req/s", "p50 ms", "p95 ms", "p99 ms", "max ms", "peak MiB"
+)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--latency", type=float, default=0.0, help="server response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum random extra delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail with 503")
+    parser.add_argument("--payload-size", type=int, default=1024, help="characters of text per record")
+    parser.add_argument("--rows", type=int, default=10000, help="rows of each uploaded or downloaded score table")
+    parser.add_argument("--backoff", type=float, default=0.05, help="retry backoff in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip measuring memory")
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> None:
+    args = parse_args(argv)
+    options = dict(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        payload_size=args.payload_size,
+        table_rows=args.rows,
+        seed=args.seed,
+    )
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(options, sender), daemon=True)
+    server.start()
+    try:
+        url = receiver.recv()
+        results = []
+        print(HEADER)
+        for scenario in args.scenarios:
+            for concurrency in args.concurrency:
+                result = asyncio.run(run(url, scenario, concurrency, args, trace_memory=False))
+                if not args.no_memory:
+                    memory = asyncio.run(run(url, scenario, concurrency, args, trace_memory=True))
+                    result["peak_memory"] = memory["peak_memory"]
+                results.append(result)
+                print(format_result(result), flush=True)
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,294 @@
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cached API response.
+
+    Attributes
+    ----------
+    data : Any
+        The decoded JSON body of the response.
+    etag : Optional[str]
+        The ETag header of the response.
+    last_modified : Optional[str]
+        The Last-Modified header of the response.
+    stored_at : float
+        The time the response was stored or last revalidated, in seconds since the epoch.
+    """
+
+    data: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of decoded JSON API responses.
+
+    Each response is stored as a JSON file together with its ETag and Last-Modified headers so that it can be
+    revalidated with a conditional request once it is older than `ttl`. Responses fetched with an auth token
+    are stored in a separate directory per token, so private records are never served to other users or to
+    requests made without a token. When the cache grows beyond `max_size` bytes, the least recently used
+    responses are removed.
+    """
+
+    PUBLIC_SCOPE = "public"
+
+    def __init__(self, directory: str, ttl: float = 3600, max_size: int = 100 * 2**20):
+        """
+        Instantiate a new ResponseCache object.
+
+        Parameters
+        ----------
+        directory : str
+            The directory to store responses in. It is created if it does not exist.
+        ttl : float
+            Number of seconds a response is used without revalidating it with the server.
+        max_size : int
+            The maximum total size of the stored responses in bytes.
+        """
+        self.directory = os.path.normpath(os.path.expanduser(directory))
+        self.ttl = ttl
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = self._scan_size()
+
+    def _scope(self, auth_token: Optional[str]) -> str:
+        if not auth_token:
+            return self.PUBLIC_SCOPE
+        return "private-" + hashlib.sha256(auth_token.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, url: str, auth_token: Optional[str]) -> str:
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, self._scope(auth_token), f"{name}.json")
+
+    def _entries(self):
+        for scope in os.scandir(self.directory):
+            if scope.is_dir():
+                for entry in os.scandir(scope.path):
+                    if entry.name.endswith(".json"):
+                        yield entry
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def get(self, url: str, auth_token: Optional[str] = None) -> Optional[CacheEntry]:
+        """
+        Return the cached response for a url, or None if there is none. Marks the response as recently used.
+
+        Parameters
+        ----------
+        url : str
+            The url of the request.
+        auth_token : Optional[str]
+            The auth token the request is made with.
+
+        Returns
+        -------
+        Optional[CacheEntry]
+        """
+        path = self._path(url, auth_token)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                entry = CacheEntry(**json.load(handle))
+            os.utime(path)
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Return True if a cached response is younger than the TTL and can be used without revalidating it.
+        """
+        return time.time() - entry.stored_at < self.ttl
+
+    def put(
+        self,
+        url: str,
+        data: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        auth_token: Optional[str] = None,
+    ) -> CacheEntry:
+        """
+        Store a response, replacing any cached response for the same url and auth token.
+
+        Parameters
+        ----------
+        url : str
+            The url of the request.
+        data : Any
+            The decoded JSON body of the response.
+        etag : Optional[str]
+            The ETag header of the response.
+        last_modified : Optional[str]
+            The Last-Modified header of the response.
+        auth_token : Optional[str]
+            The auth token the request was made with.
+
+        Returns
+        -------
+        CacheEntry
+            The stored entry.
+        """
+        entry = CacheEntry(data, etag, last_modified, time.time())
+        path = self._path(url, auth_token)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+
+        # write to a temporary file first so that readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(entry._asdict(), handle)
+        os.replace(tmp_path, path)
+
+        self._size += os.path.getsize(path) - old_size
+        if self._size > self.max_size:
+            self.evict()
+        return entry
+
+    def remove(self, url: str, auth_token: Optional[str] = None) -> None:
+        """
+        Remove the cached response for a url, if any.
+        """
+        path = self._path(url, auth_token)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        self._size -= size
+
+    def refresh(self, url: str, entry: CacheEntry, auth_token: Optional[str] = None) -> CacheEntry:
+        """
+        Restart the TTL of a cached response after the server confirmed it is unchanged.
+        """
+        return self.put(url, entry.data, entry.etag, entry.last_modified, auth_token)
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used responses until the cache is no larger than `max_size`.
+        """
+        entries = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in self._entries()))
+        size = sum(e[1] for e in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """
+        Remove all cached responses.
+        """
+        for entry in list(self._entries()):
+            os.remove(entry.path)
+        self._size = 0
+
+
+class MemoryCache:
+    """
+    In-process LRU cache of API responses with single-flight request deduplication.
+
+    Concurrent requests for the same key share one in-flight request. Completed responses are kept for `ttl`
+    seconds, up to `max_entries` responses. The same response object is returned to every caller, so callers
+    should not modify it.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60):
+        """
+        Instantiate a new MemoryCache object.
+
+        Parameters
+        ----------
+        max_entries : int
+            The maximum number of responses kept. 0 keeps no responses, but concurrent requests are still
+            deduplicated.
+        ttl : float
+            Number of seconds a response is kept.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached response for `key`, or await `fetch` to request it. If a request for `key` is already
+        in flight, its result is awaited instead of calling `fetch`.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the response.
+        fetch : Callable[[], Awaitable[Any]]
+            Called without arguments to request the response.
+
+        Returns
+        -------
+        Any
+            The response.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._fetched, key))
+        # a caller being cancelled should not cancel the request shared with other callers
+        return await asyncio.shield(task)
+
+    def _fetched(self, key: Hashable, task: asyncio.Future) -> None:
+        if task.cancelled():
+            error = None
+        else:
+            error = task.exception()  # also marks the exception as retrieved
+        if self._in_flight.get(key) is not task:
+            return  # invalidated while in flight
+        del self._in_flight[key]
+        if task.cancelled() or error is not None or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic(), task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """
+        Remove cached responses. Requests in flight for removed keys are not stored when they complete.
+
+        Parameters
+        ----------
+        predicate : Optional[Callable[[Hashable], bool]]
+            Called with each key to decide whether to remove it. If None, all responses are removed.
+        """
+        for store in (self._entries, self._in_flight):
+            for key in [k for k in store if predicate is None or predicate(k)]:
+                del store[key]
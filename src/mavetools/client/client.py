@@ -1,13 +1,28 @@
-import json
+import asyncio
+import hashlib
 import os
 import ssl
-from typing import Awaitable, Mapping, Optional
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 from urllib.parse import urlparse
-from urllib.request import urlopen
 
 import aiohttp
 import certifi
-import humps
 import pandas as pd
 from aiohttp import ClientResponseError
 from mavedb.lib.validation.urn_re import (
@@ -16,23 +31,241 @@ from mavedb.lib.validation.urn_re import (
     MAVEDB_SCORE_SET_URN_RE,
 )
 
+from mavetools.client.cache import MemoryCache, ResponseCache
+from mavetools.client.decode import (
+    DECAMELIZE_MODES,
+    JsonDecoder,
+    decamelize,
+    default_json_decoder,
+)
+from mavetools.client.download import (
+    arrow_schema,
+    import_pyarrow,
+    iter_csv_batches,
+    to_arrow,
+)
+from mavetools.client.metrics import ClientMetrics, RequestTrace
+from mavetools.client.ratelimit import RateLimiter
+from mavetools.client.retry import HedgePolicy, RetryPolicy
+from mavetools.client.upload import (
+    UploadLedger,
+    UploadSource,
+    content_hash,
+    multipart_upload,
+    score_set_key,
+)
 from mavetools.client.util import infer_record_type, validate_dataset_with_create_model
-
-# from mavedb.lib.validation.dataframe import validate_and_standardize_dataframe_pair
-# from mavedb.lib.validation.exceptions import ValidationError
+from mavetools.client.validation import validate_upload_sources
 
 MAVEDB_API_URL = "MAVEDB_API_URL"
 
 
+class DatasetResult(NamedTuple):
+    """
+    The result of requesting a single dataset with `Client.get_datasets`.
+
+    Attributes
+    ----------
+    urn : str
+        The URN that was requested.
+    dataset : Optional[Mapping]
+        The dataset in JSON format, or None if the request failed.
+    error : Optional[Exception]
+        The error raised by the request, or None if it succeeded.
+    retries : int
+        The number of times the request was retried.
+    """
+
+    urn: str
+    dataset: Optional[Mapping] = None
+    error: Optional[Exception] = None
+    retries: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Submission(NamedTuple):
+    """
+    A dataset to create with `Client.create_datasets`.
+
+    Attributes
+    ----------
+    key : str
+        A name for the submission that is unique among the submissions, used to refer to it as a parent.
+    dataset : Mapping
+        The experiment or score set to create, see `Client.create_dataset`.
+    parent : Optional[str]
+        The key of the submission this dataset belongs to: the experiment of a score set, or an experiment in the
+        experiment set of an experiment. Its URN is filled in once it has been created.
+    scores_df : Optional[UploadSource]
+        The scores of a score set.
+    counts_df : Optional[UploadSource]
+        The counts of a score set.
+    """
+
+    key: str
+    dataset: Mapping
+    parent: Optional[str] = None
+    scores_df: Optional[UploadSource] = None
+    counts_df: Optional[UploadSource] = None
+
+
+class SubmissionResult(NamedTuple):
+    """
+    The result of a submission to `Client.create_datasets`.
+
+    Attributes
+    ----------
+    key : str
+        The key of the submission.
+    urn : Optional[str]
+        The URN of the created dataset, or None if it was not created.
+    dataset : Optional[Mapping]
+        The created dataset, decamelized according to the client's `decamelize` mode, or None if it was not created.
+    error : Optional[Exception]
+        The error that stopped the submission, or None if it succeeded. A score set can have a URN and an error if its
+        data frames failed to upload.
+    uploaded : bool
+        True if the data frames of a score set were uploaded, or were already uploaded according to the client's
+        upload ledger.
+    """
+
+    key: str
+    urn: Optional[str] = None
+    dataset: Optional[Mapping] = None
+    error: Optional[Exception] = None
+    uploaded: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def _aiter(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    """Iterate over a synchronous or asynchronous iterable."""
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def _search_results(data: Any) -> List[Mapping]:
+    """
+    Return the results of a search response, which is either a list of results or an object with a list of results,
+    e.g. under "scoreSets" or "experiments".
+    """
+    if isinstance(data, list):
+        return data
+    for value in data.values():
+        if isinstance(value, list):
+            return value
+    return []
+
+
+async def _read_nothing(resp: aiohttp.ClientResponse) -> None:
+    return None
+
+
+def _upload_files(scores_df: UploadSource, counts_df: Optional[UploadSource]) -> Dict[str, UploadSource]:
+    """Return the files of a score set upload keyed by form field name."""
+    upload_files = dict(scores_file=scores_df)
+    if counts_df is not None:
+        upload_files["counts_file"] = counts_df
+    return upload_files
+
+
+def _check_submission_graph(submissions: List[Submission]) -> None:
+    """
+    Raise a ValueError if submission keys are not unique, or if a parent is missing or part of a cycle.
+    """
+    parents = {}
+    for submission in submissions:
+        if submission.key in parents:
+            raise ValueError(f"duplicate submission key '{submission.key}'")
+        parents[submission.key] = submission.parent
+    for submission in submissions:
+        seen = set()
+        key = submission.key
+        while key is not None:
+            if key not in parents:
+                raise ValueError(f"parent '{key}' of a submission is not part of the submissions")
+            if key in seen:
+                raise ValueError(f"submission '{submission.key}' is part of a cycle")
+            seen.add(key)
+            key = parents[key]
+
+
+def _child_datasets(dataset: Mapping) -> List[Tuple[str, str]]:
+    """
+    Return the URN and record_type of the children of a dataset: the experiments of an experiment set and the score
+    sets of an experiment. Accepts camelized and decamelized datasets.
+    """
+    children = []
+    for experiment in dataset.get("experiments") or []:
+        children.append((experiment if isinstance(experiment, str) else experiment["urn"], "experiment"))
+    for score_set_urn in dataset.get("scoreSetUrns", dataset.get("score_set_urns")) or []:
+        children.append((score_set_urn, "score_set"))
+    return children
+
+
+def _referenced_urns(dataset: Mapping) -> List[str]:
+    """
+    Return the URN of a dataset and the URNs of the records it refers to, including the URNs of nested records such
+    as the experiment of a score set. Accepts camelized and decamelized datasets.
+    """
+    urns = []
+    for key, value in dataset.items():
+        if key == "urn" or key.endswith(("_urn", "Urn")):
+            urns.append(value)
+        elif key.endswith(("_urns", "Urns")) and isinstance(value, list):
+            urns.extend(value)
+        elif isinstance(value, Mapping):
+            urns.extend(_referenced_urns(value))
+    return [urn for urn in urns if isinstance(urn, str)]
+
+
 class Client:
     """
     Client objects provide an object-oriented Python interface for the MaveDB API.
+
+    A Client holds a pool of connections that is released by `close`. It can be used as an async context manager::
+
+        async with Client(base_url=api_url) as client:
+            dataset = await client.get_dataset(urn)
+
+    From synchronous code, use `mavetools.client.sync.SyncClient` instead.
     """
 
-    def __init__(self, base_url: Optional[str] = None, auth_token: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        auth_token: Optional[str] = None,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        ttl_dns_cache: Optional[int] = 10,
+        keepalive_timeout: float = 15.0,
+        force_close: bool = False,
+        cache: Optional[ResponseCache] = None,
+        memory_cache_size: int = 1024,
+        memory_cache_ttl: float = 60,
+        retry: Optional[RetryPolicy] = None,
+        upload_ledger: Optional[UploadLedger] = None,
+        json_decoder: Optional[JsonDecoder] = None,
+        decamelize: str = "eager",
+        metrics: Optional[ClientMetrics] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hedge: Optional[HedgePolicy] = None,
+    ):
         """
         Instantiate a new Client object.
 
+        Requests share a pool of keep-alive connections, so repeated requests to the server reuse
+        TCP connections and TLS sessions instead of opening a new connection for every request.
+
         Parameters
         ----------
         base_url : Optional[str]
@@ -43,7 +276,50 @@ class Client:
         auth_token: Optional[str]
             The API authorization token from the user's profile on the MaveDB server.
             This token is required to enable data deposition (POST) operations and private record access.
+        limit: int
+            The maximum number of simultaneous connections. 0 means no limit.
+        limit_per_host: int
+            The maximum number of simultaneous connections to the same host. 0 means no limit.
+        ttl_dns_cache: Optional[int]
+            Number of seconds DNS lookups are cached for. None caches them forever.
+        keepalive_timeout: float
+            Number of seconds an idle connection is kept open for reuse. Ignored if `force_close` is True.
+        force_close: bool
+            Close the connection after every request instead of keeping it open for reuse.
+        cache: Optional[ResponseCache]
+            A persistent cache for datasets requested with `get_dataset` and `get_datasets`.
+            Cached datasets are revalidated with the server once they are older than the cache's TTL.
+        memory_cache_size: int
+            The number of datasets kept in memory. Concurrent requests for the same dataset always share a
+            single request, even if this is 0.
+        memory_cache_ttl: float
+            Number of seconds a dataset is kept in memory.
+        retry: Optional[RetryPolicy]
+            The policy for retrying failed requests. If this is None, a `RetryPolicy` with default settings is used.
+        upload_ledger: Optional[UploadLedger]
+            A record of created score sets and successful uploads, so that an interrupted deposition can be run
+            again cheaply. A score set that was already created for the same experiment with the same dataset and
+            data is reused instead of being created again, and uploads of data that is already recorded for a score
+            set are skipped.
+        json_decoder: Optional[JsonDecoder]
+            The function that decodes JSON response bodies from bytes. If this is None, the fastest available
+            decoder is used, see `mavetools.client.decode.default_json_decoder`.
+        decamelize: str
+            How the keys of created datasets are decamelized: "eager" converts all keys, "lazy" converts keys as
+            they are read, see `mavetools.client.decode.DecamelizedDict`, and "none" keeps the keys of the API.
+        metrics: Optional[ClientMetrics]
+            Collects latencies, status codes, retries and bytes of every request sent to the server. Requests are
+            not traced if this is None.
+        rate_limiter: Optional[RateLimiter]
+            Limits the rate of requests sent to the server, including retries. A limiter can be shared by several
+            clients, and by several processes, see `mavetools.client.ratelimit`. When the server responds with
+            429 Too Many Requests, the limiter holds back all requests until the request is retried.
+        hedge: Optional[HedgePolicy]
+            Sends a second request for a dataset that is slower than most recent dataset requests, and uses
+            whichever response arrives first, see `HedgePolicy`. Requests are not hedged if this is None.
         """
+        if decamelize not in DECAMELIZE_MODES:
+            raise ValueError(f"decamelize must be one of {', '.join(DECAMELIZE_MODES)}")
         if base_url is None:
             if os.environ.get(MAVEDB_API_URL) is None:
                 raise ValueError(
@@ -61,17 +337,34 @@ class Client:
         self.api_root = parse_result.path
         self.base_url = base_url
 
-        connector = aiohttp.TCPConnector(ssl=ssl.create_default_context(cafile=certifi.where()), force_close=True)
+        connector_options = dict(limit=limit, limit_per_host=limit_per_host, ttl_dns_cache=ttl_dns_cache)
+        if force_close:
+            connector_options["force_close"] = True
+        else:
+            connector_options["keepalive_timeout"] = keepalive_timeout
+        connector = aiohttp.TCPConnector(
+            ssl=ssl.create_default_context(cafile=certifi.where()), use_dns_cache=True, **connector_options
+        )
         self.session = aiohttp.ClientSession(
             base_url=self.base_url,
             connector=connector,
             raise_for_status=True,
+            trace_configs=None if metrics is None else [metrics.trace_config()],
         )
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self.hedge = hedge
+        self.cache = cache
+        self.memory_cache = MemoryCache(memory_cache_size, memory_cache_ttl)
+        self.retry = RetryPolicy() if retry is None else retry
+        self.upload_ledger = upload_ledger
+        self.json_decoder = default_json_decoder() if json_decoder is None else json_decoder
+        self.decamelize = decamelize
+        self._api_version: Optional[str] = None
         if auth_token is None:
             self.auth_token = ""
         else:
             self.auth_token = auth_token
-        print("started session using force_close")
 
         self.endpoints = {
             "score_set": "score-sets",
@@ -79,27 +372,61 @@ class Client:
             "experiment_set": "experiment-sets",
         }
 
-    def api_version(self) -> str:
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        """True if the client has been closed."""
+        return self.session.closed
+
+    async def close(self) -> None:
+        """
+        Close the client's connections. The client cannot be used after it is closed.
+        """
+        await self.session.close()
+
+    async def _read_json(self, resp: aiohttp.ClientResponse) -> Any:
+        return self.json_decoder(await resp.read())
+
+    async def api_version(self, refresh: bool = False) -> str:
         """
         Return the API version number.
 
+        The version is requested once per client and then cached.
+
         Parameters
         ----------
-        None
+        refresh : bool
+            Request the version from the server again instead of using the cached version.
 
         Returns
         -------
         str
             The version number.
+
+        Raises
+        ------
+        aiohttp.ClientError
+            If the request fails.
         """
-        with urlopen(f"{self.base_url[:-1]}{self.api_root}api/version") as response:
-            r = response.read()
-            return json.loads(r)["version"]
+        if self._api_version is None or refresh:
+            url_path = "/".join(x.strip("/") for x in ("", self.api_root, "api", "version"))
+            version, _ = await self._request("GET", url_path, self._read_json)
+            self._api_version = version["version"]
+        return self._api_version
 
-    async def get_dataset(self, urn: str, record_type: Optional[str] = None) -> Awaitable[str]:
+    async def get_dataset(
+        self, urn: str, record_type: Optional[str] = None, deadline: Optional[float] = None
+    ) -> Awaitable[str]:
         """
         Request a dataset from the API in JSON format.
 
+        Failed requests are retried according to the client's `RetryPolicy`.
+
         Parameters
         ----------
         urn : str
@@ -108,6 +435,9 @@ class Client:
             The type of record to get, one of "score_set", "experiment", or "experiment_set".
             If this is None, the record_type will be inferred from the URN.
             Note that this must be provided for `tmp:` records.
+        deadline : Optional[float]
+            The overall time limit in seconds for the request, including all retries.
+            If this is None, the deadline of the client's `RetryPolicy` is used.
 
         Returns
         -------
@@ -121,28 +451,696 @@ class Client:
         ValueError
             If the record_type is invalid.
         """
-        # infer record_type if needed
+        url_path = self.dataset_url_path(urn, record_type)
+        try:
+            return await self.fetch_dataset(urn, record_type, deadline)
+        except ClientResponseError as e:
+            print(f"error {e.status} while requesting {url_path} ({getattr(e, 'retries', 0)} retries)")
+
+    def dataset_record_type(self, urn: str, record_type: Optional[str] = None) -> str:
+        """
+        Return the record_type of a dataset, inferring it from the URN if needed.
+
+        Parameters
+        ----------
+        urn : str
+            The URN of the dataset.
+        record_type : Optional[str]
+            The type of record, see `get_dataset`.
+
+        Returns
+        -------
+        str
+            The record_type.
+
+        Raises
+        ------
+        ValueError
+            If the URN cannot be inferred.
+        ValueError
+            If the record_type is invalid.
+        """
         if record_type is None:
             if MAVEDB_SCORE_SET_URN_RE.match(urn):
-                record_type = "score_set"
+                return "score_set"
             elif MAVEDB_EXPERIMENT_URN_RE.match(urn):
-                record_type = "experiment"
+                return "experiment"
             elif MAVEDB_EXPERIMENT_SET_URN_RE.match(urn):
-                record_type = "experiment_set"
+                return "experiment_set"
             else:
                 raise ValueError(f"unable to infer record_type for '{urn}'")
         elif record_type not in self.endpoints.keys():
             raise ValueError(f"invalid record_type '{record_type}'")
+        return record_type
+
+    def dataset_url_path(self, urn: str, record_type: Optional[str] = None) -> str:
+        """
+        Return the API path of a dataset, inferring the record_type from the URN if needed.
+
+        Parameters
+        ----------
+        urn : str
+            The URN of the dataset.
+        record_type : Optional[str]
+            The type of record, see `get_dataset`.
+
+        Returns
+        -------
+        str
+            The path of the dataset relative to the server's base url.
+
+        Raises
+        ------
+        ValueError
+            If the URN cannot be inferred.
+        ValueError
+            If the record_type is invalid.
+        """
+        record_type = self.dataset_record_type(urn, record_type)
+        return "/".join(x.strip("/") for x in ("", self.api_root, self.endpoints[record_type], urn, ""))
+
+    async def fetch_dataset(
+        self, urn: str, record_type: Optional[str] = None, deadline: Optional[float] = None
+    ) -> Mapping:
+        """
+        Request a dataset from the API in JSON format. Unlike `get_dataset`, errors are raised.
+
+        Datasets are kept in memory for `memory_cache_ttl` seconds and concurrent requests for the same dataset share
+        a single request. The same object is returned to every caller, so it should not be modified.
+
+        Parameters
+        ----------
+        urn : str
+            The URN of the dataset being requested.
+        record_type : Optional[str]
+            The type of record to get, see `get_dataset`.
+        deadline : Optional[float]
+            The overall time limit for the request, see `get_dataset`.
 
-        url_path = "/".join(x.strip("/") for x in ("", self.api_root, self.endpoints[record_type], urn, ""))
+        Returns
+        -------
+        Mapping
+            The dataset in JSON format.
+
+        Raises
+        ------
+        ValueError
+            If the URN cannot be inferred or the record_type is invalid.
+        aiohttp.ClientError
+            If the request fails. The number of retries made is stored in the `retries` attribute of the error.
+        asyncio.TimeoutError
+            If the deadline is exceeded.
+        """
+        dataset, _ = await self._fetch_dataset(urn, record_type, deadline)
+        return dataset
+
+    async def _fetch_dataset(
+        self, urn: str, record_type: Optional[str], deadline: Optional[float]
+    ) -> Tuple[Mapping, int]:
+        record_type = self.dataset_record_type(urn, record_type)
+        if deadline is None:
+            deadline = self.retry.deadline
+        fetch = self.memory_cache.get_or_fetch(
+            (record_type, urn, self.auth_token), lambda: self._request_dataset(urn, record_type, deadline)
+        )
+        if deadline is None:
+            return await fetch
+        # callers sharing an in-flight request may have a shorter deadline than the caller that started it
+        return await asyncio.wait_for(fetch, deadline)
+
+    async def _request_dataset(self, urn: str, record_type: str, deadline: Optional[float]) -> Tuple[Mapping, int]:
+        url_path = self.dataset_url_path(urn, record_type)
+        headers = {"X-API-key": self.auth_token}
+        if self.cache is None:
+            return await self._hedged(
+                lambda: self._request("GET", url_path, self._read_json, deadline, headers=headers)
+            )
+
+        cache_key = f"{self.base_url[:-1]}{url_path}"
+        entry = self.cache.get(cache_key, self.auth_token)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                return entry.data, 0
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        async def read(resp: aiohttp.ClientResponse) -> Mapping:
+            if resp.status == 304 and entry is not None:
+                self.cache.refresh(cache_key, entry, self.auth_token)
+                return entry.data
+            data = await self._read_json(resp)
+            self.cache.put(
+                cache_key, data, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), self.auth_token
+            )
+            return data
+
+        return await self._hedged(lambda: self._request("GET", url_path, read, deadline, headers=headers))
+
+    async def _hedged(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `request()`, sending it a second time if it has not completed after the delay of `self.hedge`, and
+        return the result of whichever copy succeeds first. The other copy is cancelled. If both copies fail, the
+        error of the first is raised.
+        """
+        if self.hedge is None:
+            return await request()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.hedge.start()
+        delay = self.hedge.delay()
+        tasks = [asyncio.ensure_future(request())]
         try:
-            async with self.session.get(url_path, headers={"X-API-key": self.auth_token}) as resp:
-                return await resp.json()
-        except ClientResponseError as e:
-            print(f"error {e.status} while requesting {url_path}")
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self.hedge.allow_hedge():
+                    tasks.append(asyncio.ensure_future(request()))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # retrieve every error, so that failed copies are not reported as unhandled
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    self.hedge.observe(loop.time() - started)
+                    return succeeded[0].result()
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        read: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]],
+        deadline: Optional[float] = None,
+        body: Optional[Callable[[], Any]] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs,
+    ) -> Tuple[Any, int]:
+        """
+        Send a request, retrying it according to `self.retry`, and return the result of calling `read` on the
+        response together with the number of retries. Errors are raised with the number of retries in their
+        `retries` attribute. Streaming bodies can only be sent once, so they are given as a `body` callable that
+        creates the request data for each attempt. If `read` is None, the response is returned unread for the caller
+        to stream and release, and only opening the response is retried. `idempotent` marks requests that can be
+        retried regardless of their method, see `RetryPolicy.is_retryable`. Each request is measured if the client
+        has `metrics`.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if deadline is None:
+            deadline = self.retry.deadline
+        stop = None if deadline is None else loop.time() + deadline
+        retries = 0
+        while True:
+            trace = await self._prepare_attempt(kwargs, body, stop)
+            try:
+                resp = await self.session.request(method, url, **kwargs)
+                if read is None:
+                    result = resp
+                else:
+                    async with resp:
+                        result = await read(resp)
+                self._record(method, url, trace, retries, loop.time() - started)
+                return result, retries
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                delay = self.retry.retry_delay(method, e, retries, idempotent)
+                self._throttled(e, delay)
+                if delay is None or (stop is not None and loop.time() + delay >= stop):
+                    e.retries = retries
+                    self._record(method, url, trace, retries, loop.time() - started, e)
+                    raise
+            retries += 1
+            await asyncio.sleep(delay)
+
+    async def _prepare_attempt(
+        self, kwargs: Dict[str, Any], body: Optional[Callable[[], Any]], stop: Optional[float]
+    ) -> Optional[RequestTrace]:
+        """
+        Wait for the rate limiter, then set the timeout, data and trace of the next attempt of a request in `kwargs`.
+        Returns the trace if the client has metrics.
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        if stop is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=max(stop - asyncio.get_running_loop().time(), 0.001))
+        if body is not None:
+            kwargs["data"] = body()
+        if self.metrics is None:
+            return None
+        trace = kwargs["trace_request_ctx"] = RequestTrace()
+        return trace
+
+    def _throttled(self, error: BaseException, delay: Optional[float]) -> None:
+        """
+        Hold back the requests of the rate limiter after the server responded with 429 Too Many Requests, until the
+        request is retried or for the time given in its Retry-After header, up to the policy's `max_retry_after`.
+        """
+        if self.rate_limiter is None or not isinstance(error, ClientResponseError) or error.status != 429:
+            return
+        if delay is None:
+            retry_after = self.retry.retry_after(error)
+            delay = None if retry_after is None else min(retry_after, self.retry.max_retry_after)
+        if delay:
+            self.rate_limiter.defer(delay)
+
+    def _record(
+        self,
+        method: str,
+        url: str,
+        trace: Optional[RequestTrace],
+        retries: int,
+        total: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        if trace is not None:
+            self.metrics.record(trace.result(method, url, retries, total, error))
+
+    async def iter_datasets(
+        self,
+        urns: Union[Iterable[str], AsyncIterable[str]],
+        record_type: Optional[str] = None,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[DatasetResult]:
+        """
+        Request many datasets from the API with at most `concurrency` requests in flight, yielding the results
+        in the order of `urns` as they become available.
+
+        Parameters
+        ----------
+        urns : Union[Iterable[str], AsyncIterable[str]]
+            The URNs of the datasets being requested. URNs are consumed as request slots become free, so this can
+            be an unbounded async iterator.
+        record_type : Optional[str]
+            The type of record to get, see `get_dataset`. Inferred separately for each URN if None.
+        concurrency : int
+            The maximum number of requests in flight.
+        deadline : Optional[float]
+            The overall time limit for each request, see `get_dataset`.
+
+        Yields
+        ------
+        DatasetResult
+            The result of each URN. Failed requests are reported in `DatasetResult.error` instead of being raised.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        pending: Deque[asyncio.Task] = deque()
+        try:
+            async for urn in _aiter(urns):
+                pending.append(asyncio.ensure_future(self._dataset_result(urn, record_type, deadline)))
+                if len(pending) >= concurrency:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_datasets(
+        self,
+        urns: Union[Iterable[str], AsyncIterable[str]],
+        record_type: Optional[str] = None,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+    ) -> List[DatasetResult]:
+        """
+        Request many datasets from the API with at most `concurrency` requests in flight.
+
+        Parameters
+        ----------
+        urns : Union[Iterable[str], AsyncIterable[str]]
+            The URNs of the datasets being requested.
+        record_type : Optional[str]
+            The type of record to get, see `get_dataset`. Inferred separately for each URN if None.
+        concurrency : int
+            The maximum number of requests in flight.
+        deadline : Optional[float]
+            The overall time limit for each request, see `get_dataset`.
+
+        Returns
+        -------
+        List[DatasetResult]
+            The result of each URN, in the order of `urns`. Failed requests are reported in `DatasetResult.error`
+            instead of being raised.
+        """
+        return [result async for result in self.iter_datasets(urns, record_type, concurrency, deadline)]
+
+    async def fetch_tree(
+        self,
+        urn: str,
+        record_type: Optional[str] = None,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, DatasetResult]:
+        """
+        Request a dataset and all of its descendants: the experiments of an experiment set and the score sets of
+        each experiment.
+
+        The children of a dataset are requested as soon as it arrives, with at most `concurrency` requests in flight,
+        instead of one level of the tree at a time.
+
+        Parameters
+        ----------
+        urn : str
+            The URN of the experiment set, experiment or score set at the root of the tree.
+        record_type : Optional[str]
+            The type of the root record, see `get_dataset`.
+        concurrency : int
+            The maximum number of requests in flight.
+        deadline : Optional[float]
+            The overall time limit for each request, see `get_dataset`.
+
+        Returns
+        -------
+        Dict[str, DatasetResult]
+            The result of each dataset in the tree keyed by URN. Failed requests are reported in
+            `DatasetResult.error` instead of being raised, and the children of failed datasets are not requested.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        index: Dict[str, DatasetResult] = {}
+        seen = set()
+        pending: List[asyncio.Task] = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        def visit(urn: str, record_type: Optional[str]) -> None:
+            if urn not in seen:
+                seen.add(urn)
+                pending.append(asyncio.ensure_future(crawl(urn, record_type)))
+
+        async def crawl(urn: str, record_type: Optional[str]) -> None:
+            async with semaphore:
+                result = await self._dataset_result(urn, record_type, deadline)
+            index[urn] = result
+            if result.ok:
+                for child_urn, child_record_type in _child_datasets(result.dataset):
+                    visit(child_urn, child_record_type)
+
+        visit(urn, record_type)
+        try:
+            while pending:
+                await pending.pop()
+        finally:
+            for task in pending:
+                task.cancel()
+        return index
+
+    async def _dataset_result(self, urn: str, record_type: Optional[str], deadline: Optional[float]) -> DatasetResult:
+        try:
+            dataset, retries = await self._fetch_dataset(urn, record_type, deadline)
+        except (ValueError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return DatasetResult(urn, error=e, retries=getattr(e, "retries", 0))
+        return DatasetResult(urn, dataset, retries=retries)
+
+    def search_score_sets(
+        self,
+        text: Optional[str] = None,
+        page_size: int = 100,
+        full: bool = False,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+        **filters,
+    ) -> AsyncIterator:
+        """
+        Search the score sets of the API, yielding the results as they are received. See `search_experiments`.
+        """
+        return self._search("score_set", text, page_size, full, concurrency, deadline, filters)
+
+    def search_experiments(
+        self,
+        text: Optional[str] = None,
+        page_size: int = 100,
+        full: bool = False,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+        **filters,
+    ) -> AsyncIterator:
+        """
+        Search the experiments of the API, yielding the results as they are received.
+
+        Results are requested a page at a time, and the next page is requested while the results of the current
+        page are being processed. Pages are requested with `limit` and `offset`. Servers that return all results at
+        once, or repeat results, are handled as well: the search ends after a page that is not full or has no new
+        results, and each URN is yielded once.
+
+        Parameters
+        ----------
+        text : Optional[str]
+            Text to search for.
+        page_size : int
+            The number of results per page.
+        full : bool
+            Request the full dataset of each result with at most `concurrency` requests in flight, see
+            `iter_datasets`, and yield `DatasetResult` objects instead of search results.
+        concurrency : int
+            The maximum number of dataset requests in flight if `full` is True.
+        deadline : Optional[float]
+            The overall time limit for each request, see `get_dataset`.
+        **filters
+            Other search fields supported by the API, such as `targets` or `keywords`.
+
+        Yields
+        ------
+        Mapping or DatasetResult
+            The search results as returned by the API, or the results of requesting their full datasets if `full`
+            is True.
+        """
+        return self._search("experiment", text, page_size, full, concurrency, deadline, filters)
+
+    def _search(
+        self,
+        record_type: str,
+        text: Optional[str],
+        page_size: int,
+        full: bool,
+        concurrency: int,
+        deadline: Optional[float],
+        filters: Mapping,
+    ) -> AsyncIterator:
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        query = dict(filters)
+        if text is not None:
+            query["text"] = text
+        results = self._iter_search(record_type, query, page_size, deadline)
+        if not full:
+            return results
+        return self.iter_datasets((result["urn"] async for result in results), record_type, concurrency, deadline)
+
+    async def _iter_search(
+        self, record_type: str, query: Mapping, page_size: int, deadline: Optional[float]
+    ) -> AsyncIterator[Mapping]:
+        url_path = self._collection_url_path(record_type) + "search"
+
+        def request_page(offset: int) -> asyncio.Task:
+            return asyncio.ensure_future(
+                self._request(
+                    "POST",
+                    url_path,
+                    self._read_json,
+                    deadline,
+                    idempotent=True,
+                    json=dict(query, limit=page_size, offset=offset),
+                    headers={"X-API-key": self.auth_token},
+                )
+            )
+
+        seen = set()
+        offset = 0
+        page = request_page(offset)
+        try:
+            while page is not None:
+                data, _ = await page
+                results = _search_results(data)
+                new_results = [result for result in results if result["urn"] not in seen]
+                page = None
+                if len(results) == page_size and new_results:
+                    offset += page_size
+                    # prefetch the next page while the caller handles this one
+                    page = request_page(offset)
+                for result in new_results:
+                    seen.add(result["urn"])
+                    yield result
+        finally:
+            if page is not None:
+                page.cancel()
+                # a prefetched page that failed is not an error if the caller stopped before reaching it
+                page.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    def iter_scores(
+        self, urn: str, batch_size: int = 10000, deadline: Optional[float] = None
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        Download the scores of a score set, yielding data frames of up to `batch_size` rows as they are received.
+
+        The response is parsed while it is received, so about one batch is held in memory. The HGVS and accession
+        columns are read as strings.
+
+        Parameters
+        ----------
+        urn : str
+            The URN of the score set.
+        batch_size : int
+            The number of rows per data frame.
+        deadline : Optional[float]
+            The overall time limit for the download, see `get_dataset`.
+
+        Yields
+        ------
+        pd.DataFrame
+
+        Raises
+        ------
+        aiohttp.ClientError
+            If the request fails.
+        """
+        return self._iter_table(urn, "scores", batch_size, deadline)
+
+    def iter_counts(
+        self, urn: str, batch_size: int = 10000, deadline: Optional[float] = None
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        Download the counts of a score set, yielding data frames of up to `batch_size` rows as they are received.
+        See `iter_scores`.
+        """
+        return self._iter_table(urn, "counts", batch_size, deadline)
+
+    async def get_scores(self, urn: str, arrow: bool = False, deadline: Optional[float] = None):
+        """
+        Download the scores of a score set.
+
+        Parameters
+        ----------
+        urn : str
+            The URN of the score set.
+        arrow : bool
+            Return a `pyarrow.Table` instead of a data frame. Requires the optional `pyarrow` package.
+            HGVS and accession columns are strings and all other columns are 64-bit floats.
+        deadline : Optional[float]
+            The overall time limit for the download, see `get_dataset`.
+
+        Returns
+        -------
+        Union[pd.DataFrame, pyarrow.Table]
+            The scores.
+        """
+        return await self._get_table(urn, "scores", arrow, deadline)
+
+    async def get_counts(self, urn: str, arrow: bool = False, deadline: Optional[float] = None):
+        """
+        Download the counts of a score set. See `get_scores`.
+        """
+        return await self._get_table(urn, "counts", arrow, deadline)
+
+    async def write_parquet(
+        self,
+        urn: str,
+        path: str,
+        table: str = "scores",
+        batch_size: int = 100000,
+        deadline: Optional[float] = None,
+    ) -> int:
+        """
+        Download the scores or counts of a score set straight into a Parquet file, one row group per batch, without
+        holding the whole table in memory. Requires the optional `pyarrow` package.
+
+        Parameters
+        ----------
+        urn : str
+            The URN of the score set.
+        path : str
+            The path of the Parquet file to write. Nothing is written if the table is empty.
+        table : str
+            The table to download, "scores" or "counts".
+        batch_size : int
+            The number of rows per row group.
+        deadline : Optional[float]
+            The overall time limit for the download, see `get_dataset`.
+
+        Returns
+        -------
+        int
+            The number of rows written.
+        """
+        pa = import_pyarrow()
+        loop = asyncio.get_running_loop()
+        writer = schema = None
+        rows = 0
+        try:
+            async for batch in self._iter_table(urn, table, batch_size, deadline):
+                if writer is None:
+                    schema = arrow_schema(batch)
+                    writer = pa.parquet.ParquetWriter(path, schema)
+                await loop.run_in_executor(None, writer.write_table, to_arrow(batch, schema))
+                rows += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    async def _iter_table(
+        self, urn: str, table: str, batch_size: int, deadline: Optional[float]
+    ) -> AsyncIterator[pd.DataFrame]:
+        if table not in ("scores", "counts"):
+            raise ValueError(f"invalid table '{table}'")
+        url_path = "/".join(x.strip("/") for x in ("", self.api_root, self.endpoints["score_set"], urn, table))
+        resp, _ = await self._request("GET", url_path, None, deadline, headers={"X-API-key": self.auth_token})
+        async with resp:
+            async for batch in iter_csv_batches(resp.content, batch_size):
+                yield batch
+
+    async def _get_table(self, urn: str, table: str, arrow: bool, deadline: Optional[float]):
+        if not arrow:
+            batches = [batch async for batch in self._iter_table(urn, table, 100000, deadline)]
+            return pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
+
+        # convert each batch as it arrives so that the whole table is not held twice
+        pa = import_pyarrow()
+        tables = []
+        schema = None
+        async for batch in self._iter_table(urn, table, 100000, deadline):
+            if schema is None:
+                schema = arrow_schema(batch)
+            tables.append(to_arrow(batch, schema))
+        return pa.concat_tables(tables) if tables else pa.table({})
+
+    def invalidate(self, urns: Optional[Iterable[str]] = None) -> None:
+        """
+        Remove datasets from the in-memory cache and the persistent cache, so that they are requested from the server
+        again. Called by `create_dataset` for the records the new dataset refers to.
+
+        Parameters
+        ----------
+        urns : Optional[Iterable[str]]
+            The URNs of the datasets to remove. If None, all datasets are removed from the in-memory cache. Datasets
+            in the persistent cache whose record_type cannot be inferred from the URN are not removed.
+        """
+        if urns is None:
+            self.memory_cache.invalidate()
+            return
+
+        urns = set(urns)
+        self.memory_cache.invalidate(lambda key: key[1] in urns)
+        if self.cache is not None:
+            for urn in urns:
+                try:
+                    url_path = self.dataset_url_path(urn)
+                except ValueError:
+                    continue
+                self.cache.remove(f"{self.base_url[:-1]}{url_path}", self.auth_token)
 
     async def create_dataset(
-        self, dataset: Mapping, scores_df: Optional[pd.DataFrame] = None, counts_df: Optional[pd.DataFrame] = None
+        self,
+        dataset: Mapping,
+        scores_df: Optional[UploadSource] = None,
+        counts_df: Optional[UploadSource] = None,
+        deadline: Optional[float] = None,
     ) -> Optional[str]:
         """
         Submit a dataset to the API.
@@ -153,10 +1151,13 @@ class Client:
         ----------
         dataset: Mapping
             Instance of the dataset that will be POSTed.
-        scores_df: Optional[pd.DataFrame]
-            The scores file associated with score set.
-        counts_df: Optional[pd.DataFrame]
-            The counts file associated with score set.
+        scores_df: Optional[UploadSource]
+            The scores file associated with score set, see `upload_dataframes`.
+        counts_df: Optional[UploadSource]
+            The counts file associated with score set, see `upload_dataframes`.
+        deadline: Optional[float]
+            The overall time limit in seconds for each request, including all retries, see `get_dataset`.
+            The request is only retried if the connection to the server could not be established.
 
         Returns
         -------
@@ -169,6 +1170,8 @@ class Client:
             If the auth_token is missing.
         ValueError
             If the dataset is a ScoreSet and there is no scores_df provided.
+        ValueError
+            If the dataset or its data frames are not valid. Nothing is sent to the server.
         """
         # check for existence of self.auth_token, raise error if does not exist
         if not self.auth_token:
@@ -183,43 +1186,113 @@ class Client:
             raise ValueError("must include a scores_df when creating a score set")
 
         # perform validation
-        validate_dataset_with_create_model(dataset)
+        validate_dataset_with_create_model(dataset, record_type)
+        if record_type == "score_set":
+            validate_upload_sources(scores_df, counts_df)
 
-        url_path = "/".join(x.strip("/") for x in ("", self.api_root, self.endpoints[record_type], ""))
         urn = None
-
         try:  # to post data
-            r = await self.session.request(
-                method="POST", url=url_path, json=dataset, headers={"X-API-key": self.auth_token}
-            )
-            r.raise_for_status()
-            dataset = await r.json()
-            dataset = humps.decamelize(dataset)
+            dataset = await self._post_once(dataset, record_type, scores_df, counts_df, deadline)
             urn = dataset["urn"]
         except ClientResponseError as e:
-            print(f"error response {e.status} while requesting {url_path}")
+            url_path = self._collection_url_path(record_type)
+            print(f"error response {e.status} while requesting {url_path} ({getattr(e, 'retries', 0)} retries)")
 
         if record_type == "score_set" and urn is not None:
-            await self.upload_dataframes(dataset, scores_df, counts_df)
+            await self.upload_dataframes(dataset, scores_df, counts_df, deadline, validate=False)
 
         # return the URN of the created model instance
         return urn
 
+    def _collection_url_path(self, record_type: str) -> str:
+        return "/".join(x.strip("/") for x in ("", self.api_root, self.endpoints[record_type], ""))
+
+    async def _post_dataset(self, dataset: Mapping, record_type: str, deadline: Optional[float]) -> Mapping:
+        """
+        POST a validated dataset and return the created dataset, decamelized according to the client's `decamelize`
+        mode. Errors are raised.
+        """
+        created, _ = await self._request(
+            "POST",
+            self._collection_url_path(record_type),
+            self._read_json,
+            deadline,
+            json=dataset,
+            headers={"X-API-key": self.auth_token},
+        )
+        # parent records list their children, so cached copies are now out of date
+        self.invalidate(_referenced_urns(created))
+        return decamelize(created, self.decamelize)
+
+    async def _post_once(
+        self,
+        dataset: Mapping,
+        record_type: str,
+        scores_df: Optional[UploadSource],
+        counts_df: Optional[UploadSource],
+        deadline: Optional[float],
+    ) -> Mapping:
+        """
+        POST a validated dataset, see `_post_dataset`. If the client has an upload ledger and it shows that a score set
+        was already created from the same dataset and data, that score set is returned instead, so that a deposition
+        that is run again does not create it twice. Errors are raised.
+        """
+        if self.upload_ledger is None or record_type != "score_set":
+            return await self._post_dataset(dataset, record_type, deadline)
+
+        loop = asyncio.get_running_loop()
+        files = {}
+        for name, source in _upload_files(scores_df, counts_df).items():
+            files[name] = await loop.run_in_executor(None, content_hash, source)
+        key = score_set_key(dataset, files)
+        urn = self.upload_ledger.created(key)
+        if urn is not None:
+            try:
+                return decamelize(await self.fetch_dataset(urn, record_type, deadline), self.decamelize)
+            except ClientResponseError as e:
+                # the score set was deleted since, so it is created again
+                if e.status != 404:
+                    raise
+        created = await self._post_dataset(dataset, record_type, deadline)
+        self.upload_ledger.put_created(key, created["urn"])
+        return created
+
     async def upload_dataframes(
-        self, score_set: Mapping, scores_df: pd.DataFrame, counts_df: Optional[pd.DataFrame] = None
+        self,
+        score_set: Mapping,
+        scores_df: UploadSource,
+        counts_df: Optional[UploadSource] = None,
+        deadline: Optional[float] = None,
+        batch_size: int = 10000,
+        compress: bool = False,
+        validate: bool = True,
     ) -> None:
         """
         Validate and upload data frames for a score set.
 
+        Data frames are validated locally before any data is sent, see `mavetools.client.validation`. Files are left
+        to the server to validate. The data is streamed to the server as it is converted to CSV, `batch_size` rows at
+        a time, so that only about one batch is held in memory. If the client has an upload ledger, data that was
+        already uploaded to the score set is not uploaded again.
+
         Parameters
         ----------
         score_set: Mapping
             Object for the score set associated with these data frames.
             Used to get the URN and target sequence information.
-        scores_df: pd.DataFrame
-            Pandas data frame containing the scores.
-        counts_df: Optional[pd.DataFrame]
-            Pandas data frame containing the counts (if available).
+        scores_df: UploadSource
+            Pandas data frame containing the scores, or the path of a CSV or Parquet file containing them.
+            CSV files are uploaded as is. Reading Parquet files requires the optional `pyarrow` package.
+        counts_df: Optional[UploadSource]
+            Pandas data frame containing the counts (if available), or the path of a CSV or Parquet file.
+        deadline: Optional[float]
+            The overall time limit for the upload, see `create_dataset`.
+        batch_size: int
+            The number of rows converted to CSV at a time.
+        compress: bool
+            Compress the request body with gzip. The server must accept gzip encoded requests.
+        validate: bool
+            Validate the data frames before uploading them.
 
         Returns
         -------
@@ -230,33 +1303,197 @@ class Client:
         None
 
         """
-        url_path = "/".join(
-            x.strip("/")
-            for x in ("", self.api_root, self.endpoints["score_set"], score_set["urn"], "variants", "data", "")
+        if validate:
+            try:
+                validate_upload_sources(scores_df, counts_df)
+            except ValueError as e:
+                print(f"data frames for '{score_set['urn']}' failed to validate: {e}")
+                return
+        try:  # to post data
+            await self._upload(score_set["urn"], scores_df, counts_df, deadline, batch_size, compress)
+        except ClientResponseError as e:
+            url_path = self._upload_url_path(score_set["urn"])
+            print(f"error response {e.status} while uploading data to {url_path} ({getattr(e, 'retries', 0)} retries)")
+
+    def _upload_url_path(self, urn: str) -> str:
+        return "/".join(
+            x.strip("/") for x in ("", self.api_root, self.endpoints["score_set"], urn, "variants", "data", "")
         )
+
+    async def _upload(
+        self,
+        urn: str,
+        scores_df: UploadSource,
+        counts_df: Optional[UploadSource],
+        deadline: Optional[float],
+        batch_size: int = 10000,
+        compress: bool = False,
+    ) -> bool:
         """
-        # TODO: this needs to be updated for the current multi-target validator
+        Upload the data frames of a score set. Errors are raised.
+
+        If the client has an upload ledger, the upload is skipped if the ledger shows the same data was already
+        uploaded to the score set, and successful uploads are recorded. Returns False if the upload was skipped.
+        """
+        upload_files = _upload_files(scores_df, counts_df)
+        if self.upload_ledger is not None and await self._already_uploaded(urn, upload_files, batch_size):
+            return False
+
+        # the body is rebuilt for every attempt, so the digests always hash the data of the last attempt
+        digests = {}
+
+        def body() -> aiohttp.MultipartWriter:
+            digests.update((name, hashlib.sha256()) for name in upload_files)
+            return multipart_upload(upload_files, batch_size, digests)
+
+        await self._request(
+            "POST",
+            self._upload_url_path(urn),
+            _read_nothing,
+            deadline,
+            body=body,
+            compress="gzip" if compress else None,
+            headers={"X-API-key": self.auth_token},
+        )
+        if self.upload_ledger is not None:
+            self.upload_ledger.put(urn, {name: digest.hexdigest() for name, digest in digests.items()})
+        return True
+
+    async def _already_uploaded(self, urn: str, upload_files: Dict[str, UploadSource], batch_size: int) -> bool:
+        """
+        Return True if the ledger shows that exactly these files were the last successful upload to a score set.
+        Data is only hashed ahead of the upload if an upload to the score set has been recorded.
+        """
+        recorded = self.upload_ledger.get(urn)
+        if recorded is None or recorded.keys() != upload_files.keys():
+            return False
+        loop = asyncio.get_running_loop()
+        for name, source in upload_files.items():
+            digest = await loop.run_in_executor(None, content_hash, source, batch_size)
+            if digest != recorded[name]:
+                return False
+        return True
+
+    async def create_datasets(
+        self,
+        submissions: Iterable[Submission],
+        concurrency: int = 4,
+        upload_concurrency: int = 2,
+        deadline: Optional[float] = None,
+    ) -> List[SubmissionResult]:
+        """
+        Submit many related datasets to the API, such as the experiments and score sets of a study.
+
+        Each submission may name the key of its parent submission. A submission is sent as soon as its parent has
+        been created, with the parent's URN filled in: the `experiment_urn` of a score set is the URN of its parent
+        experiment, and the `experiment_set_urn` of an experiment is the experiment set of its parent experiment.
+        Independent submissions are sent concurrently, and the data frames of a score set are uploaded while other
+        datasets are still being created. If the client has an upload ledger, score sets and uploads that succeeded in
+        an earlier run of the same submissions are not sent again.
+
+        Parameters
+        ----------
+        submissions : Iterable[Submission]
+            The datasets to create. Keys must be unique and parents must be part of the submissions.
+        concurrency : int
+            The maximum number of datasets being created at the same time.
+        upload_concurrency : int
+            The maximum number of score set data frame uploads at the same time.
+        deadline : Optional[float]
+            The overall time limit for each request, see `create_dataset`.
+
+        Returns
+        -------
+        List[SubmissionResult]
+            The result of each submission, in the order of `submissions`. Failures are reported in
+            `SubmissionResult.error` instead of being raised, and descendants of failed submissions are not sent.
+
+        Raises
+        ------
+        ValueError
+            If the auth_token is missing, if keys are not unique, or if a parent is missing or part of a cycle.
+        """
+        if not self.auth_token:
+            raise ValueError("client must have an auth token to create datasets")
+        if concurrency < 1 or upload_concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        submissions = list(submissions)
+        _check_submission_graph(submissions)
+
+        loop = asyncio.get_running_loop()
+        created = {submission.key: loop.create_future() for submission in submissions}
+        post_limit = asyncio.Semaphore(concurrency)
+        upload_limit = asyncio.Semaphore(upload_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._submission_result(submission, created, post_limit, upload_limit, deadline))
+            for submission in submissions
+        ]
         try:
-            new_scores_df, new_counts_df = validate_and_standardize_dataframe_pair(
-                scores_df,
-                counts_df,
-                score_set["target_genes"],
-                None,
-            )
-        except ValidationError as e:
-            print(f"data frames for '{score_set['urn']}' failed to validate: {e}")
-            return
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _submission_result(
+        self,
+        submission: Submission,
+        created: Dict[str, asyncio.Future],
+        post_limit: asyncio.Semaphore,
+        upload_limit: asyncio.Semaphore,
+        deadline: Optional[float],
+    ) -> SubmissionResult:
+        try:
+            dataset = await self._submit(submission, created, post_limit, deadline)
+        except (ValueError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return SubmissionResult(submission.key, error=e)
+        finally:
+            # children of a failed submission are waiting for it
+            if not created[submission.key].done():
+                created[submission.key].set_result(None)
+
+        if submission.scores_df is None:
+            return SubmissionResult(submission.key, dataset["urn"], dataset)
+        try:
+            async with upload_limit:
+                await self._upload(dataset["urn"], submission.scores_df, submission.counts_df, deadline)
+        except (ValueError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return SubmissionResult(submission.key, dataset["urn"], dataset, error=e)
+        return SubmissionResult(submission.key, dataset["urn"], dataset, uploaded=True)
+
+    async def _submit(
+        self,
+        submission: Submission,
+        created: Dict[str, asyncio.Future],
+        post_limit: asyncio.Semaphore,
+        deadline: Optional[float],
+    ) -> Mapping:
         """
-        # TODO test this with a really big dataframe
-        upload_data = dict()
-        upload_data["scores_file"] = bytes(scores_df.to_csv(index=False), encoding="utf-8")
-        if counts_df is not None:
-            upload_data["counts_file"] = bytes(counts_df.to_csv(index=False), encoding="utf-8")
+        Wait for the parent of a submission, then validate and POST its dataset. The created dataset is published
+        in `created` before it is returned, so that children can be sent while its data frames are uploaded.
+        """
+        dataset = dict(submission.dataset)
+        record_type = infer_record_type(dataset)
+        if record_type is None:
+            raise ValueError("could not infer record type for dataset")
+        if record_type == "score_set" and submission.scores_df is None:
+            raise ValueError("must include a scores_df when creating a score set")
 
-        try:  # to post data
-            r = await self.session.request(
-                method="POST", url=url_path, data=upload_data, headers={"X-API-key": self.auth_token}
-            )
-            r.raise_for_status()
-        except ClientResponseError as e:
-            print(f"error response {e.status} while uploading data to {url_path}")
+        if submission.parent is not None:
+            parent = await created[submission.parent]
+            if parent is None:
+                raise ValueError(f"parent '{submission.parent}' was not created")
+            if record_type == "score_set":
+                dataset["experiment_urn"] = parent["urn"]
+            else:
+                dataset["experiment_set_urn"] = parent.get(
+                    "experiment_set_urn", parent.get("experimentSetUrn", parent["urn"])
+                )
+
+        validate_dataset_with_create_model(dataset, record_type)
+        if submission.scores_df is not None:
+            validate_upload_sources(submission.scores_df, submission.counts_df)
+        async with post_limit:
+            dataset = await self._post_once(dataset, record_type, submission.scores_df, submission.counts_df, deadline)
+        created[submission.key].set_result(dataset)
+        return dataset
@@ -0,0 +1,103 @@
+import json
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+import humps
+
+JsonDecoder = Callable[[bytes], Any]
+
+DECAMELIZE_MODES = ("eager", "lazy", "none")
+
+
+def default_json_decoder() -> JsonDecoder:
+    """
+    Return the fastest available function for decoding JSON response bodies: `orjson.loads` if orjson is
+    installed, else `msgspec.json.decode` if msgspec is installed, else `json.loads`.
+    """
+    try:
+        import orjson
+
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec.json
+
+        return msgspec.json.decode
+    except ImportError:
+        pass
+    return json.loads
+
+
+class DecamelizedDict(Mapping):
+    """
+    Read-only view of a decoded JSON object with decamelized keys.
+
+    Keys are decamelized the first time the object is read, and nested objects are only converted when they are
+    accessed, so reading a few fields of a large record is much faster than decamelizing all of it. Use
+    `decamelized` to get a plain copy, for example to serialize it.
+    """
+
+    def __init__(self, data: Mapping):
+        self._data = data
+        self._keys: Optional[Dict[str, str]] = None
+        self._values: Dict[str, Any] = {}
+
+    def _key_map(self) -> Dict[str, str]:
+        if self._keys is None:
+            self._keys = {humps.decamelize(key): key for key in self._data}
+        return self._keys
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            self._values[key] = lazy_decamelize(self._data[self._key_map()[key]])
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._key_map())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.decamelized()!r})"
+
+    def decamelized(self) -> Dict[str, Any]:
+        """Return a plain, fully decamelized copy of the object."""
+        return humps.decamelize(self._data)
+
+
+def lazy_decamelize(data: Any) -> Any:
+    """
+    Return decoded JSON data with objects wrapped in a `DecamelizedDict`. Lists are copied, other values are
+    returned as is.
+    """
+    if isinstance(data, Mapping):
+        return DecamelizedDict(data)
+    if isinstance(data, list):
+        return [lazy_decamelize(item) for item in data]
+    return data
+
+
+def decamelize(data: Any, mode: str = "eager") -> Any:
+    """
+    Decamelize the keys of decoded JSON data.
+
+    Parameters
+    ----------
+    data : Any
+        The decoded JSON data.
+    mode : str
+        "eager" converts all keys with `humps.decamelize`, "lazy" wraps objects in a `DecamelizedDict`, and "none"
+        returns the data as is.
+
+    Returns
+    -------
+    Any
+    """
+    if mode == "eager":
+        return humps.decamelize(data)
+    if mode == "lazy":
+        return lazy_decamelize(data)
+    if mode == "none":
+        return data
+    raise ValueError(f"decamelize mode must be one of {', '.join(DECAMELIZE_MODES)}")
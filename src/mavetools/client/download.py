@@ -0,0 +1,100 @@
+import asyncio
+import functools
+import io
+from typing import AsyncIterator
+
+import aiohttp
+import pandas as pd
+
+TEXT_COLUMNS = ("accession", "hgvs_nt", "hgvs_splice", "hgvs_pro")
+
+CHUNK_SIZE = 2**20
+
+
+class ResponseReader(io.RawIOBase):
+    """
+    Blocking file-like view of a response body that is being received on an event loop, for parsers running in
+    another thread. Each read waits for the next part of the body, so the body is never held in memory as a whole.
+    """
+
+    def __init__(self, content: aiohttp.StreamReader, loop: asyncio.AbstractEventLoop):
+        self._content = content
+        self._loop = loop
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = asyncio.run_coroutine_threadsafe(self._content.read(len(buffer)), self._loop).result()
+        buffer[: len(data)] = data
+        return len(data)
+
+
+async def iter_csv_batches(content: aiohttp.StreamReader, batch_size: int = 10000) -> AsyncIterator[pd.DataFrame]:
+    """
+    Parse a CSV response body while it is received, yielding data frames of up to `batch_size` rows.
+
+    The body is parsed by pandas in a worker thread, so about one batch is held in memory and parsing does not block
+    the event loop. The HGVS and accession columns are read as strings.
+
+    Parameters
+    ----------
+    content : aiohttp.StreamReader
+        The body of the response.
+    batch_size : int
+        The number of rows per data frame.
+
+    Yields
+    ------
+    pd.DataFrame
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    loop = asyncio.get_running_loop()
+    reader = io.BufferedReader(ResponseReader(content, loop), buffer_size=CHUNK_SIZE)
+    try:
+        batches = await loop.run_in_executor(
+            None,
+            functools.partial(pd.read_csv, reader, chunksize=batch_size, dtype=dict.fromkeys(TEXT_COLUMNS, str)),
+        )
+    except pd.errors.EmptyDataError:
+        return
+
+    done = object()
+    with batches:
+        while True:
+            batch = await loop.run_in_executor(None, next, batches, done)
+            if batch is done:
+                return
+            yield batch
+
+
+def import_pyarrow():
+    """
+    Import the optional `pyarrow` package, raising an ImportError that names it if it is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Arrow and Parquet support requires the pyarrow package") from e
+    return pyarrow
+
+
+def arrow_schema(df: pd.DataFrame):
+    """
+    Return the Arrow schema of a score or count table: strings for the HGVS and accession columns and 64-bit floats
+    for all other columns. A fixed schema keeps batches compatible even if a batch has no missing values or no
+    values at all in a column.
+    """
+    pa = import_pyarrow()
+    return pa.schema([(column, pa.string() if column in TEXT_COLUMNS else pa.float64()) for column in df.columns])
+
+
+def to_arrow(df: pd.DataFrame, schema):
+    """
+    Convert a batch of a score or count table to an Arrow table with the given schema, see `arrow_schema`.
+    """
+    pa = import_pyarrow()
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
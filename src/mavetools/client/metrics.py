@@ -0,0 +1,313 @@
+import asyncio
+import bisect
+import math
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import aiohttp
+
+# upper bounds of the latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LATENCIES = ("queued", "dns", "connect_tls", "ttfb", "total")
+
+
+class RequestMetrics(NamedTuple):
+    """
+    Measurements of a request made by a `Client`, including all of its retries. Timings are in seconds and are
+    measured for the last attempt, except for `total`.
+
+    Attributes
+    ----------
+    method : str
+        The HTTP method.
+    endpoint : str
+        The path of the request with URNs replaced by `{urn}`, e.g. "/api/v1/score-sets/{urn}/".
+    status : Optional[int]
+        The status of the response, or None if no response was received.
+    retries : int
+        The number of times the request was retried.
+    queued : Optional[float]
+        The time spent waiting for a connection from the connection pool, or None if there was no wait.
+    dns : Optional[float]
+        The time spent resolving the host name, or None if it was not resolved, e.g. because the connection was
+        reused or the DNS cache was used.
+    connect_tls : Optional[float]
+        The time spent opening a new connection: the TCP connection and, for HTTPS, the TLS handshake, but not DNS
+        resolution. None if a connection was reused. aiohttp reports the TLS handshake as part of opening the
+        connection, so it cannot be measured separately.
+    ttfb : Optional[float]
+        The time from starting the request until the response headers were received, or None if no response was
+        received.
+    total : float
+        The time from starting the first attempt until the response was read or the request failed, including
+        retries and the delays between them. For responses that are streamed to the caller, the time until the
+        response was opened.
+    request_bytes : int
+        The number of body bytes sent.
+    response_bytes : int
+        The number of body bytes received. For responses that are streamed to the caller, the bytes received when
+        the response was opened.
+    reused_connection : bool
+        True if the request was sent on a connection from the pool.
+    error : Optional[str]
+        The name of the exception the request failed with, or None if it succeeded.
+    """
+
+    method: str
+    endpoint: str
+    status: Optional[int] = None
+    retries: int = 0
+    queued: Optional[float] = None
+    dns: Optional[float] = None
+    connect_tls: Optional[float] = None
+    ttfb: Optional[float] = None
+    total: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    reused_connection: bool = False
+    error: Optional[str] = None
+
+
+def endpoint_path(url: str) -> str:
+    """
+    Return the path of a request URL with URN segments replaced by `{urn}`, so that requests for different records
+    are grouped together.
+    """
+    path = url.split("?", 1)[0]
+    return "/".join("{urn}" if ":" in segment else segment for segment in path.split("/"))
+
+
+class Histogram:
+    """
+    Cumulative histogram of observed values with fixed bucket bounds, in the style of Prometheus histograms.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Instantiate a new Histogram object.
+
+        Parameters
+        ----------
+        bounds : Sequence[float]
+            The increasing upper bounds of the buckets. Values above the last bound are counted in an extra bucket.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the histogram."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Return an upper bound for the `q` quantile of the observed values: the upper bound of the bucket that
+        contains it, or the largest value if it is above the last bound. Returns None if there are no values.
+        """
+        if self.count == 0:
+            return None
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class RequestTrace:
+    """
+    Measurements of a single attempt of a request, filled in by the `aiohttp.TraceConfig` of `ClientMetrics`.
+    """
+
+    def __init__(self):
+        self.clock = asyncio.get_running_loop().time
+        self.started = self.clock()
+        self.status: Optional[int] = None
+        self.queued: Optional[float] = None
+        self.dns: Optional[float] = None
+        self.connect_tls: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.reused_connection = False
+        self._marks: Dict[str, float] = {}
+
+    def start(self, name: str) -> None:
+        self._marks[name] = self.clock()
+
+    def elapsed(self, name: str) -> Optional[float]:
+        started = self._marks.pop(name, None)
+        return None if started is None else self.clock() - started
+
+    def result(
+        self, method: str, url: str, retries: int, total: float, error: Optional[BaseException] = None
+    ) -> RequestMetrics:
+        status = self.status
+        if isinstance(error, aiohttp.ClientResponseError):
+            status = error.status
+        connect_tls = self.connect_tls
+        if connect_tls is not None and self.dns is not None:
+            connect_tls = max(connect_tls - self.dns, 0.0)
+        return RequestMetrics(
+            method=method,
+            endpoint=endpoint_path(url),
+            status=status,
+            retries=retries,
+            queued=self.queued,
+            dns=self.dns,
+            connect_tls=connect_tls,
+            ttfb=self.ttfb,
+            total=total,
+            request_bytes=self.request_bytes,
+            response_bytes=self.response_bytes,
+            reused_connection=self.reused_connection,
+            error=None if error is None else type(error).__name__,
+        )
+
+
+def _traced(handler):
+    async def on_signal(session, trace_config_ctx, params) -> None:
+        trace = trace_config_ctx.trace_request_ctx
+        if isinstance(trace, RequestTrace):
+            handler(trace, params)
+
+    return on_signal
+
+
+def _on_request_end(trace: RequestTrace, params) -> None:
+    trace.status = params.response.status
+    trace.ttfb = trace.clock() - trace.started
+
+
+def _on_connection_create_end(trace: RequestTrace, params) -> None:
+    trace.connect_tls = trace.elapsed("connect_tls")
+
+
+def _on_dns_resolvehost_end(trace: RequestTrace, params) -> None:
+    trace.dns = trace.elapsed("dns")
+
+
+def _on_connection_queued_end(trace: RequestTrace, params) -> None:
+    trace.queued = trace.elapsed("queued")
+
+
+def _on_connection_reuseconn(trace: RequestTrace, params) -> None:
+    trace.reused_connection = True
+
+
+def _on_request_chunk_sent(trace: RequestTrace, params) -> None:
+    trace.request_bytes += len(params.chunk)
+
+
+def _on_response_chunk_received(trace: RequestTrace, params) -> None:
+    trace.response_bytes += len(params.chunk)
+
+
+class ClientMetrics:
+    """
+    Collects `RequestMetrics` for the requests of a `Client`.
+
+    Latencies are collected in a `Histogram` per endpoint and measurement, see `LATENCIES`, and status codes,
+    retries and bytes are counted per endpoint. Each `RequestMetrics` is also passed to `callback`, if given, for
+    forwarding to another metrics system. The same ClientMetrics object can be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[RequestMetrics], None]] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Instantiate a new ClientMetrics object.
+
+        Parameters
+        ----------
+        callback : Optional[Callable[[RequestMetrics], None]]
+            Called with the measurements of each request once it has completed or failed. It runs on the event
+            loop, so it should return quickly.
+        buckets : Sequence[float]
+            The upper bounds of the latency histogram buckets in seconds.
+        """
+        self.callback = callback
+        self.buckets = tuple(buckets)
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.statuses: Counter = Counter()
+        self.retries: Counter = Counter()
+        self.bytes_sent: Counter = Counter()
+        self.bytes_received: Counter = Counter()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Return a new `aiohttp.TraceConfig` that measures requests made with a `RequestTrace` as their
+        `trace_request_ctx`. Requests made without one are ignored.
+        """
+        config = aiohttp.TraceConfig()
+        config.on_request_end.append(_traced(_on_request_end))
+        config.on_connection_queued_start.append(_traced(lambda trace, params: trace.start("queued")))
+        config.on_connection_queued_end.append(_traced(_on_connection_queued_end))
+        config.on_connection_create_start.append(_traced(lambda trace, params: trace.start("connect_tls")))
+        config.on_connection_create_end.append(_traced(_on_connection_create_end))
+        config.on_connection_reuseconn.append(_traced(_on_connection_reuseconn))
+        config.on_dns_resolvehost_start.append(_traced(lambda trace, params: trace.start("dns")))
+        config.on_dns_resolvehost_end.append(_traced(_on_dns_resolvehost_end))
+        config.on_request_chunk_sent.append(_traced(_on_request_chunk_sent))
+        config.on_response_chunk_received.append(_traced(_on_response_chunk_received))
+        return config
+
+    def record(self, metrics: RequestMetrics) -> None:
+        """
+        Add the measurements of a request and pass them to the callback.
+        """
+        for name in LATENCIES:
+            value = getattr(metrics, name)
+            if value is not None:
+                self.histogram(name, metrics.endpoint).observe(value)
+        self.statuses[metrics.endpoint, metrics.status] += 1
+        self.retries[metrics.endpoint] += metrics.retries
+        self.bytes_sent[metrics.endpoint] += metrics.request_bytes
+        self.bytes_received[metrics.endpoint] += metrics.response_bytes
+        if self.callback is not None:
+            self.callback(metrics)
+
+    def histogram(self, name: str, endpoint: str) -> Histogram:
+        """
+        Return the histogram of a latency measurement for an endpoint, see `LATENCIES`.
+        """
+        key = (endpoint, name)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram(self.buckets)
+        return self.histograms[key]
+
+    def endpoints(self) -> List[str]:
+        """Return the endpoints that requests have been made to."""
+        return sorted({endpoint for endpoint, _ in self.histograms})
+
+    def summary(self, name: str = "total") -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Return the request count, mean, median, 95th percentile and maximum of a latency measurement per endpoint,
+        for example to spot slow endpoints.
+        """
+        summary = {}
+        for endpoint in self.endpoints():
+            histogram = self.histograms.get((endpoint, name))
+            if histogram is None:
+                continue
+            summary[endpoint] = {
+                "count": histogram.count,
+                "mean": histogram.mean,
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "max": histogram.max,
+            }
+        return summary
@@ -0,0 +1,180 @@
+import asyncio
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from typing import Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+_STATE = struct.Struct("d")
+
+
+def schedule(tat: float, now: float, rate: float, burst: int) -> Tuple[float, float]:
+    """
+    Reserve a token from a token bucket kept as a theoretical arrival time (`tat`), following the generic cell
+    rate algorithm. Returns the time the request may be sent and the new theoretical arrival time.
+
+    A bucket that has been idle holds `burst` tokens, and tokens are added at `rate` per second.
+    """
+    interval = 1 / rate
+    start = max(now, tat - (burst - 1) * interval)
+    return start, max(tat, start) + interval
+
+
+class RateLimiter:
+    """
+    Limits the rate of requests sent by a `Client` with a token bucket: at most `burst` requests are sent at once,
+    and `rate` requests per second on average. Each request reserves the next free slot, so waiting requests are
+    sent in order.
+
+    A RateLimiter can be shared by any number of clients and coroutines in a process. Use a `SharedRateLimiter` or
+    `FileRateLimiter` to share a limit between processes.
+    """
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Instantiate a new RateLimiter object.
+
+        Parameters
+        ----------
+        rate : float
+            The average number of requests per second.
+        burst : int
+            The number of requests that can be sent at once after the limiter has been idle.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {key: value for key, value in self.__dict__.items() if key != "_lock"}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _update(self, update) -> float:
+        """Replace the theoretical arrival time with `update(tat)` atomically and return the new value."""
+        with self._lock:
+            self._tat = update(self._tat)
+            return self._tat
+
+    def reserve(self) -> float:
+        """
+        Reserve a token and return the number of seconds to wait before sending the request.
+        """
+        now = self.clock()
+        result = []
+
+        def take(tat: float) -> float:
+            start, tat = schedule(tat, now, self.rate, self.burst)
+            result.append(start)
+            return tat
+
+        self._update(take)
+        return max(result[0] - now, 0.0)
+
+    def defer(self, seconds: float) -> None:
+        """
+        Hold back all requests for `seconds`, for example because the server asked clients to slow down. Requests
+        then resume at `rate`, without a burst.
+        """
+        resume = self.clock() + seconds + (self.burst - 1) / self.rate
+        self._update(lambda tat: max(tat, resume))
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    A `RateLimiter` whose state is kept in shared memory, so that it limits the requests of all processes it is
+    passed to. Like other `multiprocessing` shared objects, it must be passed to worker processes when they are
+    started, for example as an argument of `multiprocessing.Process` or through the `initializer` of a
+    `multiprocessing.Pool`, and the processes must be started with the same `multiprocessing` context.
+    """
+
+    # monotonic clocks are not guaranteed to be shared between processes
+    clock = staticmethod(time.time)
+
+    def __init__(self, rate: float, burst: int = 1, context=None):
+        """
+        Instantiate a new SharedRateLimiter object.
+
+        Parameters
+        ----------
+        rate : float
+            The average number of requests per second.
+        burst : int
+            The number of requests that can be sent at once after the limiter has been idle.
+        context : Optional[multiprocessing.context.BaseContext]
+            The context the worker processes are started with, e.g. `multiprocessing.get_context("spawn")`. The
+            default context is used if this is None.
+        """
+        super().__init__(rate, burst)
+        self._tat = (multiprocessing if context is None else context).Value("d", 0.0)
+
+    def _update(self, update) -> float:
+        with self._tat.get_lock():
+            self._tat.value = update(self._tat.value)
+            return self._tat.value
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    A `RateLimiter` whose state is kept in a small file that is locked while it is updated, so that it limits the
+    requests of all local processes that use the same file, including unrelated processes. Requires a POSIX system.
+    """
+
+    clock = staticmethod(time.time)
+
+    def __init__(self, path: str, rate: float, burst: int = 1):
+        """
+        Instantiate a new FileRateLimiter object.
+
+        Parameters
+        ----------
+        path : str
+            The file to keep the state in. It is created if it does not exist. Processes sharing a limit must use
+            the same file and the same `rate` and `burst`.
+        rate : float
+            The average number of requests per second.
+        burst : int
+            The number of requests that can be sent at once after the limiter has been idle.
+        """
+        if fcntl is None:
+            raise RuntimeError("FileRateLimiter requires fcntl, which is not available on this platform")
+        super().__init__(rate, burst)
+        self.path = os.path.normpath(os.path.expanduser(path))
+
+    def _update(self, update) -> float:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, _STATE.size, 0)
+            tat = update(_STATE.unpack(data)[0] if len(data) == _STATE.size else 0.0)
+            os.pwrite(fd, _STATE.pack(tat), 0)
+            return tat
+        finally:
+            os.close(fd)
+
+    async def acquire(self) -> None:
+        # waiting for the lock of another process must not block the event loop
+        delay = await asyncio.get_running_loop().run_in_executor(None, self.reserve)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,220 @@
+import asyncio
+import email.utils
+import math
+import random
+import time
+from collections import deque
+from typing import Collection, Deque, Optional
+
+import aiohttp
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed API request is retried.
+
+    Requests are retried with exponential backoff and full jitter: the n-th retry waits a random time between 0 and
+    `min(max_backoff, backoff * 2 ** n)` seconds. If the server sent a Retry-After header, the retry waits at least
+    as long as the server asked for, unless that is more than `max_retry_after` seconds, in which case the request
+    is not retried.
+
+    Idempotent requests (GET, HEAD, OPTIONS, PUT, DELETE) are retried after connection errors, timeouts and
+    responses with a status in `retry_statuses`. Other requests, such as POSTs, are only retried if the connection
+    could not be established, because only then is it certain that the server has not received the request.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        retry_statuses: Collection[int] = (429, 502, 503, 504),
+        deadline: Optional[float] = None,
+        max_retry_after: float = 60,
+    ):
+        """
+        Instantiate a new RetryPolicy object.
+
+        Parameters
+        ----------
+        max_attempts : int
+            The maximum number of times a request is sent, including the first attempt. 1 disables retries.
+        backoff : float
+            The maximum delay in seconds before the first retry. The maximum delay doubles with every retry.
+        max_backoff : float
+            The upper limit of the maximum delay in seconds. Retry-After delays are not limited by it.
+        retry_statuses : Collection[int]
+            The response statuses after which idempotent requests are retried.
+        deadline : Optional[float]
+            The default overall time limit in seconds for a call, including all retries. None means no limit.
+        max_retry_after : float
+            The longest Retry-After delay in seconds that is waited for. Requests the server asks to retry later
+            than that fail instead.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.deadline = deadline
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, method: str, error: BaseException, idempotent: Optional[bool] = None) -> bool:
+        """
+        Return True if a request made with `method` that failed with `error` can be sent again. Whether the request
+        is idempotent is inferred from `method` unless `idempotent` is given, e.g. for read-only POST requests.
+        """
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return True
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if not idempotent:
+            return False
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in self.retry_statuses
+        return isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError))
+
+    def retry_delay(
+        self, method: str, error: BaseException, retries: int, idempotent: Optional[bool] = None
+    ) -> Optional[float]:
+        """
+        Return the number of seconds to wait before retrying a failed request, or None if it should not be retried.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        error : BaseException
+            The error the request failed with.
+        retries : int
+            The number of times the request has been retried so far.
+        idempotent : Optional[bool]
+            Whether the request can safely be sent more than once, see `is_retryable`.
+
+        Returns
+        -------
+        Optional[float]
+        """
+        if retries + 1 >= self.max_attempts or not self.is_retryable(method, error, idempotent):
+            return None
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**retries))
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    @staticmethod
+    def retry_after(error: BaseException) -> Optional[float]:
+        """
+        Return the number of seconds given by the Retry-After header of a failed response, or None if there is no
+        valid header, see `parse_retry_after`.
+        """
+        if isinstance(error, aiohttp.ClientResponseError) and error.headers is not None:
+            return parse_retry_after(error.headers.get("Retry-After"))
+        return None
+
+
+class HedgePolicy:
+    """
+    Decides when a slow idempotent API request is hedged: sent a second time, so that the request completes as soon
+    as either copy does.
+
+    A request is hedged if it has not completed after the `percentile` of the latencies of recent requests, so that
+    a few requests stalled behind slow server instances do not hold up a batch. Hedges add load to the server, so
+    at most `max_extra` hedges are sent per request on average, and none are sent until `min_samples` latencies have
+    been observed.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_extra: float = 0.05,
+        min_samples: int = 20,
+        window: int = 1000,
+        min_delay: float = 0.0,
+    ):
+        """
+        Instantiate a new HedgePolicy object.
+
+        Parameters
+        ----------
+        percentile : float
+            The fraction of recent requests that must be slower than a request before it is hedged, between 0
+            and 1.
+        max_extra : float
+            The maximum number of hedges per request, e.g. 0.05 for at most 5% extra requests.
+        min_samples : int
+            The number of latencies observed before any request is hedged.
+        window : int
+            The number of recent latencies the hedge delay is computed from.
+        min_delay : float
+            The minimum number of seconds before a request is hedged.
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if max_extra < 0:
+            raise ValueError("max_extra cannot be negative")
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = max(min_samples, 1)
+        self.min_delay = min_delay
+        self.requests = 0
+        self.hedged = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._delay: Optional[float] = None
+        self._stale = 0
+
+    def observe(self, latency: float) -> None:
+        """Record the latency in seconds of a completed request."""
+        self._latencies.append(latency)
+        self._stale += 1
+
+    def delay(self) -> Optional[float]:
+        """
+        Return the number of seconds after which a request is hedged, or None if too few latencies have been
+        observed.
+        """
+        if len(self._latencies) < self.min_samples:
+            return None
+        # sorting the window for every request would cost more than the estimate is worth
+        if self._delay is None or self._stale >= max(len(self._latencies) // 100, 1):
+            latencies = sorted(self._latencies)
+            self._delay = latencies[min(math.ceil(self.percentile * len(latencies)), len(latencies)) - 1]
+            self._stale = 0
+        return max(self._delay, self.min_delay)
+
+    def start(self) -> None:
+        """Count a request toward the hedge budget."""
+        self.requests += 1
+
+    def allow_hedge(self) -> bool:
+        """Return True and count the hedge if a hedge is within the budget of `max_extra` hedges per request."""
+        if self.hedged + 1 > self.max_extra * self.requests:
+            return False
+        self.hedged += 1
+        return True
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Return the number of seconds to wait given by a Retry-After header, which is either a number of seconds or an
+    HTTP date. Returns None if the header is missing or invalid, including numbers that are not finite.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
@@ -0,0 +1,237 @@
+import asyncio
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+)
+
+import pandas as pd
+
+from mavetools.client.client import Client, DatasetResult, Submission, SubmissionResult
+from mavetools.client.upload import UploadSource
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the event loop that runs the requests of `SyncClient` objects, starting it in a daemon thread on first use.
+    The loop is shared by all SyncClient objects and runs for the life of the process.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="mavetools-client-loop", daemon=True).start()
+        return _loop
+
+
+class SyncClient:
+    """
+    Blocking interface for the MaveDB API for use from synchronous code.
+
+    A SyncClient wraps a `Client` that lives on a background event loop, so that all calls share one connection pool
+    and the session is not recreated for every call. Methods take the same arguments as the `Client` methods of the
+    same name and block until the result is available. Call `close` or use the SyncClient as a context manager to
+    release its connections.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Instantiate a new SyncClient object. Arguments are passed to `Client`.
+        """
+        self._loop = background_loop()
+        self.client: Client = self._run(_create_client(*args, **kwargs))
+
+    def __enter__(self) -> "SyncClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _run(self, coro: Awaitable) -> Any:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            # blocking here would deadlock the loop
+            raise RuntimeError("SyncClient methods cannot be called from its own event loop")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @property
+    def closed(self) -> bool:
+        """True if the client has been closed."""
+        return self.client.closed
+
+    def close(self) -> None:
+        """
+        Close the client's connections. The client cannot be used after it is closed.
+        """
+        if not self.client.closed:
+            self._run(self.client.close())
+
+    def api_version(self, refresh: bool = False) -> str:
+        """Blocking version of `Client.api_version`."""
+        return self._run(self.client.api_version(refresh))
+
+    def get_dataset(
+        self, urn: str, record_type: Optional[str] = None, deadline: Optional[float] = None
+    ) -> Optional[Mapping]:
+        """Blocking version of `Client.get_dataset`."""
+        return self._run(self.client.get_dataset(urn, record_type, deadline))
+
+    def fetch_dataset(self, urn: str, record_type: Optional[str] = None, deadline: Optional[float] = None) -> Mapping:
+        """Blocking version of `Client.fetch_dataset`."""
+        return self._run(self.client.fetch_dataset(urn, record_type, deadline))
+
+    def iter_datasets(
+        self,
+        urns: Iterable[str],
+        record_type: Optional[str] = None,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+    ) -> Iterator[DatasetResult]:
+        """Blocking version of `Client.iter_datasets`. Requests are made concurrently in the background."""
+        return self._iterate(self.client.iter_datasets(urns, record_type, concurrency, deadline))
+
+    def _iterate(self, items: AsyncIterator) -> Iterator:
+        try:
+            while True:
+                try:
+                    yield self._run(items.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run(items.aclose())
+
+    def get_datasets(
+        self,
+        urns: Iterable[str],
+        record_type: Optional[str] = None,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+    ) -> List[DatasetResult]:
+        """Blocking version of `Client.get_datasets`."""
+        return self._run(self.client.get_datasets(urns, record_type, concurrency, deadline))
+
+    def fetch_tree(
+        self,
+        urn: str,
+        record_type: Optional[str] = None,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, DatasetResult]:
+        """Blocking version of `Client.fetch_tree`."""
+        return self._run(self.client.fetch_tree(urn, record_type, concurrency, deadline))
+
+    def search_score_sets(
+        self,
+        text: Optional[str] = None,
+        page_size: int = 100,
+        full: bool = False,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+        **filters,
+    ) -> Iterator:
+        """Blocking version of `Client.search_score_sets`. The next page is requested in the background."""
+        return self._iterate(self.client.search_score_sets(text, page_size, full, concurrency, deadline, **filters))
+
+    def search_experiments(
+        self,
+        text: Optional[str] = None,
+        page_size: int = 100,
+        full: bool = False,
+        concurrency: int = 10,
+        deadline: Optional[float] = None,
+        **filters,
+    ) -> Iterator:
+        """Blocking version of `Client.search_experiments`. The next page is requested in the background."""
+        return self._iterate(self.client.search_experiments(text, page_size, full, concurrency, deadline, **filters))
+
+    def iter_scores(
+        self, urn: str, batch_size: int = 10000, deadline: Optional[float] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Blocking version of `Client.iter_scores`."""
+        return self._iterate(self.client.iter_scores(urn, batch_size, deadline))
+
+    def iter_counts(
+        self, urn: str, batch_size: int = 10000, deadline: Optional[float] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Blocking version of `Client.iter_counts`."""
+        return self._iterate(self.client.iter_counts(urn, batch_size, deadline))
+
+    def get_scores(self, urn: str, arrow: bool = False, deadline: Optional[float] = None):
+        """Blocking version of `Client.get_scores`."""
+        return self._run(self.client.get_scores(urn, arrow, deadline))
+
+    def get_counts(self, urn: str, arrow: bool = False, deadline: Optional[float] = None):
+        """Blocking version of `Client.get_counts`."""
+        return self._run(self.client.get_counts(urn, arrow, deadline))
+
+    def write_parquet(
+        self,
+        urn: str,
+        path: str,
+        table: str = "scores",
+        batch_size: int = 100000,
+        deadline: Optional[float] = None,
+    ) -> int:
+        """Blocking version of `Client.write_parquet`."""
+        return self._run(self.client.write_parquet(urn, path, table, batch_size, deadline))
+
+    def invalidate(self, urns: Optional[Iterable[str]] = None) -> None:
+        """Version of `Client.invalidate` that is safe to call while requests are running in the background."""
+        self._run(_call(self.client.invalidate, urns))
+
+    def create_dataset(
+        self,
+        dataset: Mapping,
+        scores_df: Optional[UploadSource] = None,
+        counts_df: Optional[UploadSource] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[str]:
+        """Blocking version of `Client.create_dataset`."""
+        return self._run(self.client.create_dataset(dataset, scores_df, counts_df, deadline))
+
+    def create_datasets(
+        self,
+        submissions: Iterable[Submission],
+        concurrency: int = 4,
+        upload_concurrency: int = 2,
+        deadline: Optional[float] = None,
+    ) -> List[SubmissionResult]:
+        """Blocking version of `Client.create_datasets`."""
+        return self._run(self.client.create_datasets(submissions, concurrency, upload_concurrency, deadline))
+
+    def upload_dataframes(
+        self,
+        score_set: Mapping,
+        scores_df: UploadSource,
+        counts_df: Optional[UploadSource] = None,
+        deadline: Optional[float] = None,
+        batch_size: int = 10000,
+        compress: bool = False,
+        validate: bool = True,
+    ) -> None:
+        """Blocking version of `Client.upload_dataframes`."""
+        return self._run(
+            self.client.upload_dataframes(score_set, scores_df, counts_df, deadline, batch_size, compress, validate)
+        )
+
+
+async def _create_client(*args, **kwargs) -> Client:
+    # the session must be created on the loop that runs its requests
+    return Client(*args, **kwargs)
+
+
+async def _call(function, *args) -> Any:
+    return function(*args)
@@ -0,0 +1,260 @@
+import asyncio
+import random
+from collections import Counter
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+from mavetools.client.metrics import endpoint_path
+
+API_ROOT = "/api/v1"
+
+# the number of dash-separated parts of the URNs served by each endpoint
+ENDPOINTS = {"experiment-sets": 1, "experiments": 2, "score-sets": 3}
+
+# the number of rows of a score or count table written at a time
+TABLE_CHUNK_ROWS = 1000
+
+
+class StandInServer:
+    """
+    Local stand-in for the MaveDB API, for testing and benchmarking code that uses a `Client` without a network
+    connection or a MaveDB instance.
+
+    The server implements the endpoints used by `Client`: records are served from the score-sets, experiments and
+    experiment-sets endpoints, POSTed records are stored and served back with a new `tmp:` URN, searches find
+    `search_results` records a page at a time and are recorded in `self.searches`, data uploaded to a score set is
+    read and discarded, the scores and counts of any score set are streamed as CSV tables of `table_rows` rows, and
+    the API version is served. Records that have not been created are generated on request
+    from their URN: an experiment set has `children` experiments, an experiment has `children` score sets, and each
+    record carries `payload_size` characters of text, so trees of any size can be crawled.
+
+    Every response is delayed by `latency` plus a random jitter of up to `jitter` seconds, and a fraction
+    `error_rate` of the requests fail with `error_status`. `self.requests` counts the requests per method and
+    endpoint, see `mavetools.client.metrics.endpoint_path`, and `self.uploaded_bytes` counts the bytes of uploaded
+    data.
+
+    Use the server as an async context manager, or call `start` and `close`::
+
+        async with StandInServer(latency=0.05) as server:
+            async with Client(base_url=server.url) as client:
+                dataset = await client.get_dataset("urn:mavedb:00000001-a-1")
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        payload_size: int = 1024,
+        children: int = 3,
+        search_results: int = 100,
+        paginate: bool = True,
+        table_rows: int = 1000,
+        seed: Optional[int] = None,
+        version: str = "2024.1.0",
+    ):
+        """
+        Instantiate a new StandInServer object.
+
+        Parameters
+        ----------
+        latency : float
+            Number of seconds every response is delayed by.
+        jitter : float
+            Maximum number of seconds added to the delay at random.
+        error_rate : float
+            The fraction of requests that fail, between 0 and 1.
+        error_status : int
+            The status of failed requests.
+        payload_size : int
+            The number of characters of text in each generated record.
+        children : int
+            The number of experiments of a generated experiment set and score sets of a generated experiment.
+        search_results : int
+            The number of score sets and experiments found by any search.
+        paginate : bool
+            Return a page of search results according to the `limit` and `offset` of the search, or all results if
+            False, like versions of the API without paginated searches.
+        table_rows : int
+            The number of rows of the scores and counts table of each score set.
+        seed : Optional[int]
+            Seed for the random delays and failures, to make them reproducible.
+        version : str
+            The API version served.
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_size = payload_size
+        self.children = children
+        self.search_results = search_results
+        self.paginate = paginate
+        self.table_rows = table_rows
+        self.version = version
+        self.records: Dict[str, Dict] = {}
+        self.searches: List[Dict] = []
+        self.requests: Counter = Counter()
+        self.uploaded_bytes = 0
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._url: Optional[str] = None
+
+    async def __aenter__(self) -> "StandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the API, to pass to `Client`."""
+        if self._url is None:
+            raise RuntimeError("the server has not been started")
+        return self._url
+
+    def application(self) -> web.Application:
+        """Return the aiohttp application that serves the API."""
+        app = web.Application(middlewares=[self._simulate])
+        app.router.add_get(f"{API_ROOT}/api/version", self.get_version)
+        app.router.add_get(API_ROOT + "/{endpoint}/{urn}/", self.get_record)
+        app.router.add_post(API_ROOT + "/{endpoint}/", self.create_record)
+        app.router.add_post(API_ROOT + "/{endpoint}/search", self.search)
+        app.router.add_post(API_ROOT + "/score-sets/{urn}/variants/data/", self.upload_files)
+        app.router.add_get(API_ROOT + "/score-sets/{urn}/{table:scores|counts}", self.get_table)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving on `host` and `port`, or on a free port if `port` is 0, and return the base URL of the API.
+        """
+        self._runner = web.AppRunner(self.application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self._url = f"http://{host}:{port}{API_ROOT}/"
+        return self._url
+
+    async def close(self) -> None:
+        """Stop serving and close open connections."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _simulate(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests[request.method, endpoint_path(request.path)] += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.Response(status=self.error_status)
+        return await handler(request)
+
+    def record(self, endpoint: str, urn: str) -> Optional[Dict]:
+        """
+        Return the record served for a URN, generating it if it has not been created. Returns None for unknown
+        endpoints and URNs that do not match the endpoint.
+        """
+        if urn in self.records:
+            return self.records[urn]
+        parts = urn.split("-")
+        if not urn.startswith("urn:mavedb:") or ENDPOINTS.get(endpoint) != len(parts):
+            return None
+        record = {"urn": urn, "title": f"Stand-in record {urn}", "abstractText": "x" * self.payload_size}
+        if endpoint == "experiment-sets":
+            record["experiments"] = [{"urn": f"{urn}-{_letters(i)}"} for i in range(self.children)]
+        elif endpoint == "experiments":
+            record["experimentSetUrn"] = parts[0]
+            record["scoreSetUrns"] = [f"{urn}-{i + 1}" for i in range(self.children)]
+        else:
+            record["experiment"] = {"urn": "-".join(parts[:2]), "experimentSetUrn": parts[0]}
+            record["targetGenes"] = []
+        return record
+
+    async def get_record(self, request: web.Request) -> web.Response:
+        record = self.record(request.match_info["endpoint"], request.match_info["urn"])
+        if record is None:
+            raise web.HTTPNotFound()
+        return web.json_response(record)
+
+    async def create_record(self, request: web.Request) -> web.Response:
+        if request.match_info["endpoint"] not in ENDPOINTS:
+            raise web.HTTPNotFound()
+        number = len(self.records) + 1
+        record = dict(await request.json(), urn="tmp:{:08}".format(number))
+        if request.match_info["endpoint"] == "experiments" and not record.get("experiment_set_urn"):
+            record["experiment_set_urn"] = "tmp:set-{:08}".format(number)
+        self.records[record["urn"]] = record
+        return web.json_response(record)
+
+    async def search(self, request: web.Request) -> web.Response:
+        endpoint = request.match_info["endpoint"]
+        if endpoint not in ("score-sets", "experiments"):
+            raise web.HTTPNotFound()
+        query = await request.json()
+        self.searches.append(query)
+        offset, stop = 0, self.search_results
+        if self.paginate:
+            offset = query.get("offset") or 0
+            if query.get("limit") is not None:
+                stop = min(offset + query["limit"], stop)
+        suffix = "-a-1" if endpoint == "score-sets" else "-a"
+        results = []
+        for i in range(offset, stop):
+            urn = f"urn:mavedb:{i + 1:08}{suffix}"
+            results.append({"urn": urn, "title": self.record(endpoint, urn)["title"]})
+        return web.json_response(results)
+
+    async def upload_files(self, request: web.Request) -> web.Response:
+        reader = await request.multipart()
+        async for part in reader:
+            while True:
+                chunk = await part.read_chunk()
+                if not chunk:
+                    break
+                self.uploaded_bytes += len(chunk)
+        return web.json_response({"urn": request.match_info["urn"]})
+
+    def table_csv(self, table: str, start: int = 0, stop: Optional[int] = None) -> str:
+        """
+        Return rows `start` to `stop` of the scores or counts table served for a score set as CSV, with a header if
+        `start` is 0.
+        """
+        column = "score" if table == "scores" else "count"
+        lines = [f"accession,hgvs_nt,hgvs_pro,{column}"] if start == 0 else []
+        for i in range(start, self.table_rows if stop is None else min(stop, self.table_rows)):
+            value = (i % 100) / 100 if table == "scores" else i % 1000
+            lines.append(f"#{i + 1},NA,p.Ala{i + 1}Val,{value}")
+        return "".join(line + "\n" for line in lines)
+
+    async def get_table(self, request: web.Request) -> web.StreamResponse:
+        if self.record("score-sets", request.match_info["urn"]) is None:
+            raise web.HTTPNotFound()
+        table = request.match_info["table"]
+        response = web.StreamResponse(headers={"Content-Type": "text/csv"})
+        await response.prepare(request)
+        # stream the table in pieces so that clients can parse it while it is received
+        for start in range(0, max(self.table_rows, 1), TABLE_CHUNK_ROWS):
+            await response.write(self.table_csv(table, start, start + TABLE_CHUNK_ROWS).encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def get_version(self, request: web.Request) -> web.Response:
+        return web.json_response({"name": "mavedb", "version": self.version})
+
+
+def _letters(index: int) -> str:
+    """Return the experiment suffix of a MaveDB URN for a zero-based index: a, b, ..., z, aa, ab, ..."""
+    letters = ""
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("a") + remainder) + letters
+    return letters
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import AsyncIterator, Dict, Iterator, Mapping, Optional, Union
+
+import aiohttp
+import pandas as pd
+
+UploadSource = Union[pd.DataFrame, str, os.PathLike]
+
+CHUNK_SIZE = 2**20
+
+
+def iter_csv_chunks(source: UploadSource, batch_size: int = 10000) -> Iterator[bytes]:
+    """
+    Generate the contents of a CSV file in chunks, without holding the whole file in memory.
+
+    Parameters
+    ----------
+    source : UploadSource
+        A data frame, which is converted `batch_size` rows at a time, or the path of a CSV file, which is read as is,
+        or the path of a Parquet file (ending in `.parquet` or `.pq`), which is converted `batch_size` rows at a time.
+        Reading Parquet files requires the optional `pyarrow` package.
+    batch_size : int
+        The number of rows converted at a time.
+
+    Yields
+    ------
+    bytes
+        UTF-8 encoded CSV data.
+
+    Raises
+    ------
+    ImportError
+        If `source` is a Parquet file and `pyarrow` is not installed.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    if isinstance(source, pd.DataFrame):
+        yield from _dataframe_chunks(source, batch_size)
+        return
+
+    path = os.fspath(source)
+    if path.lower().endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("reading Parquet files requires the pyarrow package") from e
+        header = True
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas().to_csv(index=False, header=header).encode("utf-8")
+            header = False
+        return
+
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _dataframe_chunks(df: pd.DataFrame, batch_size: int) -> Iterator[bytes]:
+    if len(df) == 0:
+        yield df.to_csv(index=False).encode("utf-8")
+        return
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start : start + batch_size].to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+async def _aiter_in_executor(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Iterate over a blocking iterator, producing each item in the default executor."""
+    loop = asyncio.get_running_loop()
+    done = object()
+    while True:
+        chunk = await loop.run_in_executor(None, next, chunks, done)
+        if chunk is done:
+            return
+        yield chunk
+
+
+def _hashed_chunks(chunks: Iterator[bytes], digest) -> Iterator[bytes]:
+    for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
+def content_hash(source: UploadSource, batch_size: int = 10000) -> str:
+    """
+    Return the SHA-256 hex digest of the CSV data uploaded for `source`, see `iter_csv_chunks`. The data is hashed
+    as it is converted, so about one batch is held in memory.
+    """
+    digest = hashlib.sha256()
+    for _ in _hashed_chunks(iter_csv_chunks(source, batch_size), digest):
+        pass
+    return digest.hexdigest()
+
+
+def csv_part(source: UploadSource, batch_size: int = 10000, digest=None) -> aiohttp.payload.AsyncIterablePayload:
+    """
+    Return a request payload that streams `source` as CSV, see `iter_csv_chunks`. Chunks are generated in a worker
+    thread so that converting a batch does not block the event loop, and about one batch is held in memory. If a
+    `hashlib` digest is given, it is updated with the data as it is sent.
+    """
+    chunks = iter_csv_chunks(source, batch_size)
+    if digest is not None:
+        chunks = _hashed_chunks(chunks, digest)
+    return aiohttp.payload.AsyncIterablePayload(_aiter_in_executor(chunks), content_type="text/csv")
+
+
+def multipart_upload(
+    files: Dict[str, UploadSource], batch_size: int = 10000, digests: Optional[Dict] = None
+) -> aiohttp.MultipartWriter:
+    """
+    Return a streaming `multipart/form-data` body with one CSV file part per item of `files`.
+
+    Parameters
+    ----------
+    files : Dict[str, UploadSource]
+        Maps form field names, such as "scores_file", to the data to upload in that field.
+    batch_size : int
+        The number of rows converted at a time, see `iter_csv_chunks`.
+    digests : Optional[Dict]
+        Maps form field names to `hashlib` digests that are updated with the data of the field as it is sent.
+
+    Returns
+    -------
+    aiohttp.MultipartWriter
+        The request body. It is sent with chunked transfer encoding and can only be sent once.
+    """
+    if digests is None:
+        digests = {}
+    writer = aiohttp.MultipartWriter("form-data")
+    for name, source in files.items():
+        part = writer.append_payload(csv_part(source, batch_size, digests.get(name)))
+        part.set_content_disposition("form-data", name=name, filename=f"{name}.csv")
+    return writer
+
+
+def score_set_key(dataset: Mapping, files: Dict[str, str]) -> str:
+    """
+    Return a key that identifies a score set submission by its dataset, which includes the URN of its experiment, and
+    the content hash of each of its files, see `content_hash`.
+    """
+    data = json.dumps({"dataset": dataset, "files": files}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class UploadLedger:
+    """
+    Persistent record of the score sets created and the data uploaded to them, so that an interrupted deposition can
+    be run again without creating the same score set or uploading the same data twice.
+
+    For each score set created by a `Client`, the ledger holds its URN under a key made of the submitted dataset,
+    including its experiment, and the content hash of its files, see `score_set_key`. For each score set, the ledger
+    holds the content hash of each file of the last successful upload, see `content_hash`. Records are appended to a
+    JSON lines file and flushed to disk as soon as a score set has been created or an upload has succeeded, so they
+    survive a crash of the uploading process. URNs are only unique within a server, so use a separate ledger for
+    each server.
+    """
+
+    def __init__(self, path: str):
+        """
+        Instantiate a new UploadLedger object.
+
+        Parameters
+        ----------
+        path : str
+            The file to store the ledger in. It is created when the first record is added.
+        """
+        self.path = os.path.normpath(os.path.expanduser(path))
+        self._uploads: Dict[str, Dict[str, str]] = {}
+        self._created: Dict[str, str] = {}
+        self._partial_line = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    self._partial_line = not line.endswith("\n")
+                    try:
+                        self._load(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        # a line cut short by a crash
+                        continue
+        except FileNotFoundError:
+            pass
+
+    def _load(self, record: Dict) -> None:
+        if "key" in record:
+            self._created[record["key"]] = str(record["urn"])
+        else:
+            self._uploads[record["urn"]] = dict(record["files"])
+
+    def _append(self, record: Dict) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(record) + "\n"
+        if self._partial_line:
+            # keep the record apart from a line cut short by a crash
+            line = "\n" + line
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._partial_line = False
+        self._load(record)
+
+    def get(self, urn: str) -> Optional[Dict[str, str]]:
+        """
+        Return the content hash of each file of the last successful upload to a score set, keyed by form field name,
+        or None if no upload has been recorded.
+        """
+        files = self._uploads.get(urn)
+        return None if files is None else dict(files)
+
+    def put(self, urn: str, files: Dict[str, str]) -> None:
+        """
+        Record a successful upload to a score set, replacing any earlier record for it.
+
+        Parameters
+        ----------
+        urn : str
+            The URN of the score set.
+        files : Dict[str, str]
+            The content hash of each uploaded file, keyed by form field name.
+        """
+        self._append({"urn": urn, "files": dict(files)})
+
+    def created(self, key: str) -> Optional[str]:
+        """
+        Return the URN of the score set created for a submission key, see `score_set_key`, or None if no score set
+        has been recorded for it.
+        """
+        return self._created.get(key)
+
+    def put_created(self, key: str, urn: str) -> None:
+        """
+        Record the URN of the score set created for a submission key, see `score_set_key`.
+        """
+        self._append({"key": key, "urn": urn})
+
+    def __len__(self) -> int:
+        return len(self._uploads)
@@ -1,9 +1,40 @@
-from typing import Mapping, Optional
+from typing import Iterable, List, Mapping, NamedTuple, Optional
 
 import humps
+from joblib import Parallel, delayed
 from mavedb.view_models.experiment import ExperimentCreate
 from mavedb.view_models.score_set import ScoreSetCreate
 
+CREATE_MODELS = {"score_set": ScoreSetCreate, "experiment": ExperimentCreate}
+
+
+class ValidationResult(NamedTuple):
+    """
+    The result of validating a dataset with `validate_datasets`.
+
+    Attributes
+    ----------
+    record_type : Optional[str]
+        The inferred record type, or None if it could not be inferred.
+    error : Optional[str]
+        A description of the validation errors, or None if the dataset is valid.
+    """
+
+    record_type: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def record_keys(record: Mapping) -> frozenset:
+    """
+    Return the decamelized top-level keys of a record. Only the keys are needed to infer the record type, so nested
+    values are not walked.
+    """
+    return frozenset(humps.decamelize(key) for key in record.keys())
+
 
 def infer_record_type(record: Mapping) -> Optional[str]:
     """
@@ -19,16 +50,17 @@ def infer_record_type(record: Mapping) -> Optional[str]:
     Optional[str]
         One of "experiment" or "score_set" if the dataset type can be inferred; else None.
     """
+    keys = record_keys(record)
     # TODO: make this more specific
-    if all(x in humps.decamelize(record) for x in ("title", "target_genes")):
+    if all(x in keys for x in ("title", "target_genes")):
         return "score_set"
-    elif "title" in record.keys():
+    elif "title" in keys:
         return "experiment"
     else:
         return None
 
 
-def validate_dataset_with_create_model(dataset: Mapping) -> None:
+def validate_dataset_with_create_model(dataset: Mapping, record_type: Optional[str] = None) -> str:
     """
     Validate a dataset using a MaveDB view model before uploading it to the API.
 
@@ -36,21 +68,65 @@ def validate_dataset_with_create_model(dataset: Mapping) -> None:
     ----------
     dataset : Mapping
         The dataset in a dictionary-like format.
+    record_type : Optional[str]
+        The record type of the dataset, if it has already been inferred with `infer_record_type`.
 
     Returns
     -------
-    None
+    str
+        The record type of the dataset.
 
     Raises
     ------
     ValueError
         If no suitable MaveDB view model was available.
+    pydantic.ValidationError
+        If the dataset is not valid. This is a subclass of ValueError.
 
     """
-    record_type = infer_record_type(dataset)
-    if record_type == "score_set":
-        ScoreSetCreate(**dataset)
-    elif record_type == "experiment":
-        ExperimentCreate(**dataset)
-    else:
+    if record_type is None:
+        record_type = infer_record_type(dataset)
+    if record_type not in CREATE_MODELS:
         raise ValueError("could not find a model for validating the dataset")
+    CREATE_MODELS[record_type](**dataset)
+    return record_type
+
+
+def _validation_result(dataset: Mapping) -> ValidationResult:
+    record_type = infer_record_type(dataset)
+    try:
+        validate_dataset_with_create_model(dataset, record_type)
+    except ValueError as e:
+        # pydantic errors are not reliably picklable, so they are returned from worker processes as text
+        return ValidationResult(record_type, str(e))
+    return ValidationResult(record_type)
+
+
+def validate_datasets(
+    datasets: Iterable[Mapping], n_jobs: int = 1, verbose: int = 0, backend: str = "multiprocessing"
+) -> List[ValidationResult]:
+    """
+    Validate many datasets using MaveDB view models, optionally in parallel.
+
+    Parameters
+    ----------
+    datasets : Iterable[Mapping]
+        The datasets in a dictionary-like format.
+    n_jobs : int
+        Number of jobs to run in parallel. Validation is CPU bound, so thousands of datasets validate faster in a
+        process pool.
+    verbose : int
+        Joblib's verbosity level.
+    backend : str
+        Parallel backend to use. Defaults to `multiprocessing`.
+
+    Returns
+    -------
+    List[ValidationResult]
+        The result of each dataset, in the order of `datasets`.
+    """
+    if n_jobs == 1:
+        return [_validation_result(dataset) for dataset in datasets]
+    return Parallel(n_jobs=n_jobs, verbose=verbose, backend=backend, batch_size="auto")(
+        delayed(_validation_result)(dataset) for dataset in datasets
+    )
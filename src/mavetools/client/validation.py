@@ -0,0 +1,150 @@
+import functools
+import re
+from typing import Optional
+
+import pandas as pd
+from mavehgvs.patterns import combined
+from mavehgvs.patterns.util import remove_named_groups
+
+from mavetools.client.upload import UploadSource
+from mavetools.convert.enrich2 import constants
+from mavetools.convert.enrich2.validators import (
+    validate_datasets_define_same_variants,
+    validate_hgvs_uniqueness,
+)
+
+ACCESSION_COLUMN = "accession"
+SPLICE_VARIANT_COLUMN = "hgvs_splice"
+HGVS_COLUMNS = (constants.nt_variant_col, SPLICE_VARIANT_COLUMN, constants.pro_variant_col)
+
+
+@functools.lru_cache(maxsize=None)
+def hgvs_column_pattern(column: str) -> re.Pattern:
+    """
+    Return the compiled MAVE-HGVS pattern for the variants of an HGVS column: nucleotide variants for `hgvs_nt` and
+    `hgvs_splice` and protein variants for `hgvs_pro`. The patterns are large, so they are compiled once.
+    """
+    if column == constants.pro_variant_col:
+        patterns = (combined.psv, combined.pmv)
+    else:
+        patterns = (combined.dsv, combined.dmv)
+    return re.compile("|".join(f"(?:{remove_named_groups(p)})" for p in patterns))
+
+
+def validate_hgvs_column(df: pd.DataFrame, column: str) -> None:
+    """
+    Validate the MAVE-HGVS syntax of every variant in an HGVS column. Missing values are allowed.
+
+    Raises
+    ------
+    ValueError
+        If any variant is not valid MAVE-HGVS for the column.
+    """
+    values = df[column]
+    defined = values.notna()
+    valid = values[defined].astype(str).str.fullmatch(hgvs_column_pattern(column))
+    invalid = values[defined][~valid.astype(bool)]
+    if len(invalid) > 0:
+        error_string = ", ".join(invalid.astype(str).iloc[: constants.MAX_ERROR_VARIANTS])
+        if len(invalid) > constants.MAX_ERROR_VARIANTS:
+            error_string += ", ..."
+        raise ValueError(f"found {len(invalid)} invalid variants in '{column}': {error_string}")
+
+
+def primary_variant_column(df: pd.DataFrame) -> str:
+    """
+    Return the column that identifies the variants of a data frame: `hgvs_nt` if it defines any variants,
+    else `hgvs_pro`.
+
+    Raises
+    ------
+    ValueError
+        If neither column defines any variants.
+    """
+    for column in constants.variant_columns:
+        if column in df.columns and df[column].notna().any():
+            return column
+    raise ValueError(
+        "Neither '{}' or '{}' defined any variants.".format(constants.nt_variant_col, constants.pro_variant_col)
+    )
+
+
+def validate_dataframe(df: pd.DataFrame, kind: str) -> None:
+    """
+    Validate a MaveDB score or count data frame before it is uploaded. All checks operate on whole columns.
+
+    The data frame must define variants in `hgvs_nt` or `hgvs_pro`, all HGVS columns must hold valid MAVE-HGVS,
+    the primary variant column (see `primary_variant_column`) must have no missing or duplicate values, all other
+    columns must be numeric, and a score data frame must have a `score` column.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The data frame.
+    kind : str
+        "scores" or "counts".
+
+    Raises
+    ------
+    ValueError
+        If the data frame is not valid.
+    """
+    primary_column = primary_variant_column(df)
+    for column in HGVS_COLUMNS:
+        if column in df.columns:
+            validate_hgvs_column(df, column)
+
+    if df[primary_column].isna().any():
+        raise ValueError(f"primary variant column '{primary_column}' cannot contain missing values")
+    validate_hgvs_uniqueness(df, primary_column)
+
+    for column in df.columns:
+        if column in HGVS_COLUMNS or column == ACCESSION_COLUMN:
+            continue
+        if not pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column]):
+            raise ValueError(f"expected only float or int data columns, got {df[column].dtype} in '{column}'")
+
+    if kind == constants.score_type and constants.mavedb_score_column not in df.columns:
+        raise ValueError(
+            "Missing column '{}'. Existing columns are {}.".format(constants.mavedb_score_column, ", ".join(df.columns))
+        )
+
+
+def validate_dataframe_pair(scores_df: pd.DataFrame, counts_df: Optional[pd.DataFrame] = None) -> None:
+    """
+    Validate the score data frame and optional count data frame of a score set before they are uploaded, see
+    `validate_dataframe`. A count data frame must define the same variants as the score data frame, in the same
+    order.
+
+    Raises
+    ------
+    ValueError
+        If a data frame is not valid or the data frames define different variants.
+    """
+    validate_dataframe(scores_df, constants.score_type)
+    if counts_df is None:
+        return
+    validate_dataframe(counts_df, constants.count_type)
+    if len(scores_df) != len(counts_df):
+        raise ValueError(f"scores define {len(scores_df)} variants but counts define {len(counts_df)}")
+    try:
+        validate_datasets_define_same_variants(scores_df.reset_index(drop=True), counts_df.reset_index(drop=True))
+    except AssertionError as e:
+        raise ValueError(str(e)) from e
+
+
+def validate_upload_sources(scores_df: UploadSource, counts_df: Optional[UploadSource] = None) -> None:
+    """
+    Validate the data of a score set upload, see `validate_dataframe_pair`. Only data frames are validated: files
+    are streamed to the server without being loaded, so they are left to the server to validate.
+
+    Raises
+    ------
+    ValueError
+        If a data frame is not valid or the data frames define different variants.
+    """
+    if not isinstance(scores_df, pd.DataFrame):
+        if isinstance(counts_df, pd.DataFrame):
+            validate_dataframe(counts_df, constants.count_type)
+        return
+    validate_dataframe_pair(scores_df, counts_df if isinstance(counts_df, pd.DataFrame) else None)
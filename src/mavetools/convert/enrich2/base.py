@@ -1,3 +1,4 @@
+import itertools
 import logging
 import os
 import re
@@ -5,6 +6,7 @@ from abc import ABCMeta, abstractmethod
 
 import numpy as np
 from fqfa.constants.iupac.protein import AA_CODES
+from fqfa.constants.translation.table import CODON_TABLE
 from fqfa.util.translate import translate_dna
 from fqfa.validator.validator import dna_bases_validator
 from mavehgvs import Variant
@@ -16,6 +18,17 @@ logger = logging.getLogger(LOGGER)
 
 __all__ = ["BaseProgram"]
 
+# Residue id of each codon, indexed by 16 * b1 + 4 * b2 + b3 where b1-b3
+# are the `constants.dna_base_codes` of the codon's bases.
+CODON_WEIGHTS = np.array([16, 4, 1])
+CODON_RESIDUES = np.array(
+    [
+        constants.amino_acid_ids[AA_CODES[CODON_TABLE["".join(c)]]]
+        for c in itertools.product(constants.dna_bases, repeat=3)
+    ],
+    dtype=np.uint8,
+)
+
 
 class BaseProgram(metaclass=ABCMeta):
     """
@@ -118,6 +131,9 @@ class BaseProgram(metaclass=ABCMeta):
         self._wt_sequence = None
         self.codons = None
         self.protein_sequence = None
+        self.wt_base_codes = None
+        self.codon_indices = None
+        self.substitution_residues = None
 
         self.offset = offset
         self.wt_sequence = wt_sequence
@@ -132,11 +148,85 @@ class BaseProgram(metaclass=ABCMeta):
         # Initialize sequence information.
         if dna_bases_validator(seq) is None:
             raise ValueError("{} is not a valid DNA sequence.".format(seq))
+        self.wt_base_codes = np.array([constants.dna_base_codes[b] for b in seq], dtype=np.uint8)
         if self.is_coding:
             self.protein_sequence, _ = translate_dna(seq)
             self.codons = ["".join(x) for x in batched(seq, 3)]
+            self._init_substitution_residues(seq)
         self._wt_sequence = seq
 
+    def _init_substitution_residues(self, seq):
+        """
+        Precomputes the residue id resulting from every single-base
+        substitution in each complete codon of `seq`.
+
+        `substitution_residues[c, f, b]` is the residue id of codon `c`
+        (0-based) with the base at frame position `f` (0-based) replaced by
+        the base with code `b`. Code `constants.silent_code` leaves the codon
+        unchanged, so `substitution_residues[c, 0, silent_code]` is the
+        wild-type residue.
+        """
+        n_codons = len(seq) // 3
+        digits = self.wt_base_codes[: n_codons * 3].reshape(n_codons, 3).astype(np.intp)
+        self.codon_indices = digits @ CODON_WEIGHTS
+
+        mutant_indices = (
+            self.codon_indices[:, None, None]
+            + (np.arange(len(constants.dna_bases))[None, None, :] - digits[:, :, None]) * CODON_WEIGHTS[None, :, None]
+        )
+        table = np.empty((n_codons, 3, len(constants.dna_bases) + 1), dtype=np.uint8)
+        table[:, :, : len(constants.dna_bases)] = CODON_RESIDUES[mutant_indices]
+        table[:, :, constants.silent_code] = CODON_RESIDUES[self.codon_indices][:, None]
+        self.substitution_residues = table
+
+    def infer_synonymous_residues(self, positions, alts, groups=None):
+        """
+        Vectorized residue lookup for a chunk of codon groups, used to
+        resolve Enrich2 `p.=` events without building codon strings.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            1-based nucleotide positions of the events. All events of a group
+            must fall in the same complete codon of the wild-type sequence,
+            and their reference bases must match the wild-type sequence.
+        alts : np.ndarray
+            Alt base code of each event, `constants.silent_code` if silent.
+        groups : np.ndarray, optional.
+            Group id (`0..n_groups - 1`) of each event. If `None`, every
+            event is its own group.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The wild-type and mutant residue ids of each group.
+        """
+        positions = np.asarray(positions, dtype=np.intp) - 1
+        alts = np.asarray(alts, dtype=np.intp)
+        codons, frames = np.divmod(positions, 3)
+        wt_residues = self.substitution_residues[codons, 0, constants.silent_code]
+        if groups is None:
+            return wt_residues, self.substitution_residues[codons, frames, alts]
+
+        # Events of one group are combined by shifting the wild-type codon
+        # index. Silent events change nothing and when a group changes the
+        # same base twice the last change wins.
+        groups = np.asarray(groups, dtype=np.intp)
+        _, first = np.unique(groups, return_index=True)
+        changed = np.flatnonzero(alts != constants.silent_code)
+        keys = groups[changed] * 3 + frames[changed]
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = changed[len(keys) - 1 - last]
+
+        group_codons = codons[first]
+        shift = np.zeros(len(first), dtype=np.intp)
+        np.add.at(
+            shift,
+            groups[keep],
+            (alts[keep] - self.wt_base_codes[positions[keep]]) * CODON_WEIGHTS[frames[keep]],
+        )
+        return wt_residues[first], CODON_RESIDUES[self.codon_indices[group_codons] + shift]
+
     @property
     def extension(self):
         return self.ext.lower()
@@ -201,7 +291,17 @@ class BaseProgram(metaclass=ABCMeta):
         if variant in constants.special_variants:
             return
 
-        variant = utilities.NucleotideSubstitutionEvent(variant)
+        self.validate_event_against_wt_sequence(utilities.NucleotideSubstitutionEvent(variant))
+
+    def validate_event_against_wt_sequence(self, variant):
+        """
+        Checks that the reference base of a parsed substitution event matches
+        that in the wild-type sequence provided.
+        Parameters
+        ----------
+        variant : utilities.NucleotideSubstitutionEvent
+            A parsed nucleotide substitution event.
+        """
         if variant.silent:
             return
 
@@ -246,7 +346,19 @@ class BaseProgram(metaclass=ABCMeta):
         if variant in constants.special_variants or "p.=" in variant:
             return
 
-        variant = utilities.ProteinSubstitutionEvent(variant)
+        self.validate_event_against_protein_sequence(utilities.ProteinSubstitutionEvent(variant))
+
+    def validate_event_against_protein_sequence(self, variant):
+        """
+        Checks that the reference amino acid of a parsed substitution event
+        matches that in the translated wild-type sequence provided.
+        Parameters
+        ----------
+        variant : utilities.ProteinSubstitutionEvent
+            A parsed protein substitution event.
+        """
+        if variant.position is None:
+            return
 
         if variant.position > len(self.protein_sequence):
             raise IndexError(
@@ -274,3 +386,48 @@ class BaseProgram(metaclass=ABCMeta):
                     seq=self.protein_sequence,
                 )
             )
+
+    def validate_table_against_wt_sequence(self, table):
+        """
+        Vectorized `validate_event_against_wt_sequence` for the nucleotide
+        events of an `events.EventTable`. Rows with an out of bounds position
+        or a mismatching reference base are rejected.
+        Parameters
+        ----------
+        table : events.EventTable
+            Table of parsed events.
+        """
+        checked = table.has_nt & (table.ref != constants.silent_code)
+        zero_based_pos = table.position.astype(np.intp) - int(self.one_based)
+        in_bounds = (zero_based_pos >= 0) & (zero_based_pos < len(self.wt_sequence))
+        table.reject(checked & ~in_bounds, "out_of_bounds")
+
+        checked = np.flatnonzero(checked & in_bounds)
+        table.reject(checked[self.wt_base_codes[zero_based_pos[checked]] != table.ref[checked]], "reference_mismatch")
+
+    def validate_table_against_protein_sequence(self, table):
+        """
+        Vectorized `validate_event_against_protein_sequence` for the protein
+        events of an `events.EventTable`. Rows with an out of bounds position
+        or a mismatching reference amino acid are rejected, as are rows with
+        protein events if the wild-type sequence is not coding.
+        Parameters
+        ----------
+        table : events.EventTable
+            Table of parsed events.
+        """
+        # Positions that are no longer positive after the offset belong to
+        # rows that are already rejected and would wrap around when indexed.
+        checked = table.has_pro & (table.pro_position >= 1) & ~table.invalid[table.row]
+        if not self.is_coding:
+            table.reject(checked, "non_coding")
+            return
+
+        wt_residues = self.substitution_residues[:, 0, constants.silent_code]
+        in_bounds = table.pro_position <= len(wt_residues)
+        table.reject(checked & ~in_bounds, "out_of_bounds")
+
+        checked = np.flatnonzero(checked & in_bounds)
+        table.reject(
+            checked[wt_residues[table.pro_position[checked] - 1] != table.pro_ref[checked]], "reference_mismatch"
+        )
@@ -1,6 +1,9 @@
 # TODO compare constants to constants in MaveCore, may be able to replace
 import re
 
+from fqfa.constants.iupac.protein import AA_CODES
+from mavehgvs.patterns import protein
+
 MAX_ERROR_VARIANTS = 5
 
 supported_programs = ("enrich", "enrich2", "empiric")
@@ -21,6 +24,19 @@ extra_na = (
 null_value_re = re.compile(r"\s+|nan|na|none|undefined|n/a|null")
 surrounding_brackets_re = re.compile(r"\((.*)\)")
 
+# Matches one comma-delimited entry of an Enrich2 variant string, e.g.
+# `c.1A>G (p.Met1Val)`, `c.1A>G`, `p.Met1Val` or `(p.=)`. Only simple
+# substitution and silent events are matched; anything else is left for the
+# slower mavehgvs-based parser so that error reporting is unchanged.
+variant_token_re = re.compile(
+    r"\s*"
+    r"(?:(?P<nt>(?P<nt_prefix>[cgmno])\.(?P<nt_position>(?:(?<=c\.)-)?[1-9][0-9]*)"
+    r"(?:(?P<nt_ref>[ACGT])>(?P<nt_alt>[ACGT])|=))(?: |(?=\s*(?:,|\Z))))?"
+    r"(?:(?P<bracket>\()?(?P<pro>p\.(?:(?P<pro_ref>{aa})(?P<pro_position>[1-9][0-9]*)(?:(?P<pro_alt>{aa})|=)|=))"
+    r"(?(bracket)\)))?"
+    r"\s*(?:(?P<sep>,)|\Z)".format(aa=protein.amino_acid)
+)
+
 # HGVSP constants
 hgvsp_nt_pos = "position"
 hgvsp_pro_pos = "position"
@@ -39,6 +55,39 @@ synonymous_table = "synonymous"
 variants_table = "variants"
 
 
+# Numeric codes used by the vectorized code paths. Residue ids index into
+# `amino_acids`; alt code `silent_code` marks a silent (`c.1=`) event and
+# prefix code `no_prefix` an event without a nucleotide part.
+nt_prefixes = "cgmno"
+nt_prefix_codes = {p: i for i, p in enumerate(nt_prefixes)}
+no_prefix = len(nt_prefixes)
+dna_bases = "ACGT"
+dna_base_codes = {b: i for i, b in enumerate(dna_bases)}
+silent_code = len(dna_bases)
+amino_acids = tuple(AA_CODES.values())
+amino_acid_ids = {aa: i for i, aa in enumerate(amino_acids)}
+
+
+# Error codes of rows that could not be converted and their descriptions.
+# The index of a code in `parse_error_codes` is used by the vectorized code
+# paths, where 0 means no error.
+parse_errors = {
+    "invalid_syntax": "Variant is not valid HGVS syntax",
+    "unsupported_event": "Event is not a substitution or silent event",
+    "invalid_position": "Position is not positive after applying the offset",
+    "out_of_bounds": "Position is outside of the wild-type sequence",
+    "reference_mismatch": "Reference does not match the wild-type sequence",
+    "mixed_syntax": "Variant mixes events with and without protein or nucleotide syntax",
+    "mixed_prefix": "Variant contains events with multiple prefix types",
+    "non_synonymous": "Codon group is not synonymous with the wild-type codon",
+    "non_coding": "Protein events require a coding wild-type sequence",
+    "invalid_hgvs": "Parsed variant is not valid MAVE-HGVS",
+    "invalid_variant": "Variant could not be parsed",
+}
+parse_error_codes = (None,) + tuple(parse_errors)
+parse_error_ids = {code: i for i, code in enumerate(parse_error_codes)}
+
+
 # MaveDB constants
 nt_variant_col = "hgvs_nt"
 pro_variant_col = "hgvs_pro"
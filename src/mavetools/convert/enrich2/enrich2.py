@@ -1,25 +1,24 @@
 import logging
 import os
 import re
-from itertools import groupby
-from operator import itemgetter
 
 import numpy as np
 import pandas as pd
-from fqfa.constants.iupac.protein import AA_CODES
-from fqfa.constants.translation.table import CODON_TABLE
 from mavehgvs.patterns import dna, protein
 from pandas.testing import assert_index_equal
 from tqdm import tqdm
 
-from mavetools.convert.enrich2.format import (
+from mavetools.convert.enrich2.format import (  # noqa: F401
     apply_offset,
     drop_null,
     get_count_dataframe_by_condition,
     get_replicate_score_dataframes,
+    offset_table,
+    offset_tokens,
 )
+from mavetools.convert.enrich2.sink import InvalidRowSink
 
-from . import LOGGER, base, constants, utilities, validators
+from . import LOGGER, base, constants, events, utilities, validators
 
 __all__ = [
     "Enrich2",
@@ -37,6 +36,8 @@ class Enrich2(base.BaseProgram):
 
     __doc__ = base.BaseProgram.__doc__
     LOG_MSG = "Writing {elem} {df_type} for condition '{cnd}' to '{path}'."
+    # Number of rows `convert_h5_df` parses at once.
+    CHUNK_SIZE = 10000
 
     def __init__(
         self,
@@ -158,23 +159,165 @@ class Enrich2(base.BaseProgram):
             else:
                 return variant, variant
 
-        variant = apply_offset(variant, self.offset, enrich2=self)
+        tokens = utilities.tokenize_variant(variant)
+        offset_tokens(tokens, self.offset, enrich2=self)
 
-        is_mixed = any([len(v.strip().split(" ")) == 2 for v in variant.split(",")])
-        is_nt_only = all([v.strip()[0] in "cngmo" for v in variant.split(",")])
-        is_pro_only = all([v.strip()[0] == "p" for v in variant.split(",")])
+        is_mixed = any(t.nt is not None and t.pro is not None for t in tokens)
+        is_nt_only = all(t.pro is None for t in tokens)
+        is_pro_only = all(t.nt is None for t in tokens)
 
         if is_mixed:
-            return self.parse_mixed_variant(variant, element)
+            return self.parse_mixed_events(tokens, element, variant)
         elif is_nt_only:
-            return self.parse_nucleotide_variant(variant), None
+            return self.parse_nucleotide_events([t.nt for t in tokens]), None
         elif is_pro_only:
-            return None, self.parse_protein_variant(variant)
+            return None, self.parse_protein_events([t.pro for t in tokens])
         else:
             # it should not be possible to get here since the variant must be valid
             # and therefore fit one of the other categories
             raise ValueError("Could not infer type of HGVS string from '{}'.".format(variant))  # pragma: no cover
 
+    def parse_rows(self, variants, element=None):
+        """
+        Batch version of `parse_row`. The variants are tokenized once into an
+        `events.EventTable` on which the offset, validation and synonymous
+        inference are applied column-wise, and the HGVS_ strings of each row
+        are rendered once at the end.
+
+        Rows that fail a stage are reported with an error code instead of
+        raising. Rows the table cannot represent are parsed by
+        `try_parse_row`.
+
+        Parameters
+        ----------
+        variants : Iterable[str]
+            Enrich2 variants.
+        element : str, optional.
+            The hd5 element table type (synonymous, etc) of all variants.
+
+        Returns
+        -------
+        list[utilities.ParseResult]
+            The result of each row.
+        """
+        table = events.EventTable.from_variants(variants)
+        offset_table(table, self.offset)
+        self.validate_table_against_wt_sequence(table)
+        self.validate_table_against_protein_sequence(table)
+
+        # Same classification as `parse_row`: mixed rows must have both
+        # parts on every event, other rows must be nucleotide or protein only.
+        n_events = np.diff(table.row_starts)
+        n_nt = table.count_by_row(table.has_nt)
+        n_pro = table.count_by_row(table.has_pro)
+        is_mixed = table.count_by_row(table.has_nt & table.has_pro) > 0
+        table.reject_rows(is_mixed & ((n_nt != n_events) | (n_pro != n_events)), "mixed_syntax")
+        table.reject_rows(~is_mixed & (n_nt > 0) & (n_pro > 0), "mixed_syntax")
+        table.reject(table.has_nt & (table.prefix != table.prefix[table.row_starts[table.row]]), "mixed_prefix")
+        self.resolve_synonymous_events(table, is_mixed)
+
+        results = [None] * len(table)
+        for i, value in table.render_rows():
+            results[i] = utilities.ParseResult(True, value, None)
+
+        for i in np.flatnonzero(table.special):
+            variant = table.variants[i].strip()
+            value = (None, variant) if element == constants.synonymous_table else (variant, variant)
+            results[i] = utilities.ParseResult(True, value, None)
+
+        for i in np.flatnonzero(table.invalid):
+            results[i] = utilities.ParseResult(False, *table.describe_error(i))
+
+        for i in np.flatnonzero(table.unmatched):
+            results[i] = self.try_parse_row((table.variants[i], element))
+        return results
+
+    def try_parse_row(self, row):
+        """
+        Version of `parse_row` that returns a `utilities.ParseResult` instead
+        of raising an exception for rows that cannot be parsed.
+
+        Parameters
+        ----------
+        row : tuple[str, str] | list[str] | str
+            See `parse_row`.
+
+        Returns
+        -------
+        utilities.ParseResult
+        """
+        try:
+            return utilities.ParseResult(True, self.parse_row(row), None)
+        except Exception as e:
+            return utilities.ParseResult(False, utilities.parse_error_code(e), str(e))
+
+    def resolve_synonymous_events(self, table, is_mixed):
+        """
+        Vectorized `parse_mixed_events` synonymous inference. Replaces the
+        `p.=` events of mixed rows of an `events.EventTable` with the
+        inferred `p.<aa><position>=` event of their codon. Rows with an event
+        outside of the wild-type codons, with a reference base that does not
+        match the wild-type codon or with a non-synonymous codon group are
+        rejected, as are rows with `p.=` events if the wild-type sequence is
+        not coding.
+
+        Parameters
+        ----------
+        table : events.EventTable
+            Table of offset and validated events.
+        is_mixed : np.ndarray
+            `True` for rows with mixed nucleotide and protein events.
+        """
+        selected = np.flatnonzero(is_mixed[table.row] & ~table.invalid[table.row])
+        if not self.is_coding:
+            table.reject(selected[table.unresolved[selected]], "non_coding")
+            return
+        if not len(selected):
+            return
+
+        # Bucket events by (row, codon), keeping the input order of events.
+        codons = table.codon[selected].astype(np.int64)
+        keys = table.row[selected] * (int(codons.max()) + 1) + codons
+        _, groups = np.unique(keys, return_inverse=True)
+        groups = groups.ravel()
+        unresolved = table.unresolved[selected]
+        has_unresolved = np.bincount(groups, weights=unresolved) > 0
+        is_partial = has_unresolved & (np.bincount(groups, weights=~unresolved) > 0)
+
+        synonymous = selected[unresolved]
+        n_codons = len(self.codon_indices)
+        table.reject(synonymous[table.codon[synonymous] >= n_codons], "out_of_bounds")
+
+        # Like `infer_silent_aa_substitution`, compare the reference bases of
+        # the codon group with the 1-based position, whatever `one_based` is.
+        changed = synonymous[(table.codon[synonymous] < n_codons) & (table.ref[synonymous] != constants.silent_code)]
+        table.reject(
+            changed[self.wt_base_codes[table.position[changed] - 1] != table.ref[changed]], "reference_mismatch"
+        )
+
+        for group in np.flatnonzero(is_partial):
+            members = selected[groups == group]
+            row = table.row[members[0]]
+            if not table.invalid[row]:
+                logger.warning(
+                    "Codon group '{grp}' from variant '{var}' "
+                    "is partially synonymous.".format(grp=table.format_events(members), var=table.variants[row].strip())
+                )
+
+        keep = ~table.invalid[table.row[synonymous]]
+        synonymous, synonymous_groups = synonymous[keep], groups[unresolved][keep]
+        if not len(synonymous):
+            return
+        _, synonymous_groups = np.unique(synonymous_groups, return_inverse=True)
+        synonymous_groups = synonymous_groups.ravel()
+        wt_residues, mut_residues = self.infer_synonymous_residues(
+            table.position[synonymous], table.alt[synonymous], synonymous_groups
+        )
+        table.reject(synonymous[(wt_residues != mut_residues)[synonymous_groups]], "non_synonymous")
+
+        table.pro_position[synonymous] = table.codon[synonymous] + 1
+        table.pro_ref[synonymous] = table.pro_alt[synonymous] = wt_residues[synonymous_groups]
+
     def parse_tsv_input(self, df):
         """
         Convert all score and count data frames in the Enrich2 TSV file
@@ -256,50 +399,58 @@ class Enrich2(base.BaseProgram):
         logger.info(self.LOG_MSG.format(elem=element, df_type="scores", cnd=cnd, path=filepath))
         return filepath
 
+    def invalid_rows_filepath(self, element, cnd=None):
+        """
+        Returns the path of the `.csv` file that the rows of a data frame
+        that could not be converted are written to.
+        """
+        if cnd is not None:
+            fname = self.convert_h5_filepath(
+                basename=self.src_filename,
+                element=element,
+                df_type=constants.count_type,
+                cnd=cnd,
+            )
+            fname = "{}_invalid_rows.csv".format(fname.split(".")[0])
+        else:
+            # TODO: this filename should also be formatted in an informative way
+            fname = "{}_invalid_rows.csv".format(self.src_filename)
+        return os.path.join(self.output_directory, fname)
+
     def convert_h5_df(self, df, element, df_type, cnd=None):
         """
         Creates and outputs a mavedb data frame based on the data frame `df`
         that was extracted from an Enrich2 HDF5 file.
         """
-        variants = tqdm(df.index, desc="Parsing variants", total=len(df.index))
+        logger.info("Parsing {} variants.".format(len(df.index)))
+        is_valid = np.zeros(len(df.index), dtype=bool)
         nt_protein_tups = []
-        invalid_rows = []
-        invalid_reasons = []
-        valid_rows = []
-        for v in variants:
-            try:
-                nt_protein_tups.append(self.parse_row((v, element)))
-                valid_rows.append(v)
-            except Exception as e:
-                invalid_rows.append(v)
-                invalid_reasons.append(str(e))
-                logger.warning("Could not parse row '{}'. Reason: {}".format(v, str(e)))
-
-        if invalid_rows:
-            # open bin file
-            if cnd is not None:
-                fname = self.convert_h5_filepath(
-                    basename=self.src_filename,
-                    element=element,
-                    df_type=constants.count_type,
-                    cnd=cnd,
-                )
-                fname = "{}_invalid_rows.csv".format(fname.split(".")[0])
-            else:
-                # TODO: this filename should also be formatted in an informative way
-                fname = "{}_invalid_rows.csv".format(self.src_filename)
-
-            fpath = os.path.join(self.output_directory, fname)
-            logger.info("Writing invalid rows to {}".format(fpath))
-            invalid = df.loc[invalid_rows, :]
-            invalid["error_description"] = invalid_reasons
-            invalid.to_csv(fpath, sep=",", na_rep=np.NaN)
-
-        if not nt_protein_tups:
+        # Rejected rows are handed to the sink chunk by chunk, which writes
+        # them in batches, so they are not all held in memory.
+        sink = None
+        try:
+            with tqdm(desc="Parsing variants", total=len(df.index)) as progress:
+                for start in range(0, len(df.index), self.CHUNK_SIZE):
+                    chunk = df.iloc[start : start + self.CHUNK_SIZE]
+                    results = self.parse_rows(chunk.index, element)
+                    chunk_valid = np.fromiter((r.ok for r in results), dtype=bool, count=len(results))
+                    is_valid[start : start + len(chunk)] = chunk_valid
+                    nt_protein_tups.extend(r.value for r in results if r.ok)
+                    if not chunk_valid.all():
+                        if sink is None:
+                            sink = InvalidRowSink(self.invalid_rows_filepath(element, cnd))
+                        invalid = [r for r in results if not r.ok]
+                        sink.add(chunk[~chunk_valid], [r.value for r in invalid], [r.detail for r in invalid])
+                    progress.update(len(chunk))
+        finally:
+            if sink is not None:
+                sink.close()
+
+        if not is_valid.any():
             raise ValueError("Could not parse any variants. Aborting.")
 
         # TODO: refactor this bit
-        df = df.loc[valid_rows, :]
+        df = df[is_valid]
         data = {
             constants.nt_variant_col: [tup[0] for tup in nt_protein_tups],
             constants.pro_variant_col: [tup[1] for tup in nt_protein_tups],
@@ -336,54 +487,52 @@ class Enrich2(base.BaseProgram):
         variant = utilities.format_variant(variant)
         if variant in constants.special_variants:
             return variant, variant
-        else:
-            mixed_variants = [p.strip().split(" ") for p in variant.split(",")]
-            mixed_variants = [
-                (utilities.format_variant(nt), utilities.format_variant(pro)) for (nt, pro) in mixed_variants
-            ]
-            # Group variants by their codon position. This will shuffle
-            # variant ordering compared to the input string.
-
-            def key_func(x):
-                return utilities.NucleotideSubstitutionEvent(x[0]).codon_position()
-
-            codon_groups = groupby(sorted(mixed_variants, key=key_func), key=key_func)
-
-            # Store a nucleotide variants index in the original string
-            # to preserve order in the output variant.
-            variant_index = {nt: i for i, (nt, pro) in enumerate(mixed_variants)}
-            parsed_variants = {i: () for i in range(len(mixed_variants))}
-
-            # For each codon group, if applicable, infer the correct
-            # synonymous syntax.
-            for _, codon_group in codon_groups:
-                codon_group = list(codon_group)
-
-                # Infer the correct synonymous syntax from the relevant
-                # mutations within the codon.
-                synonymous_events = [(nt, pro) for (nt, pro) in codon_group if "p.=" in pro]
-                if synonymous_events and len(codon_group) != len(synonymous_events):
-                    logger.warning(
-                        "Codon group '{grp}' from variant '{var}' "
-                        "is partially synonymous.".format(grp=codon_group, var=variant)
-                    )
-                for nt, _ in synonymous_events:
-                    inferred_pro = self.infer_silent_aa_substitution(
-                        list(map(itemgetter(0), synonymous_events)), variant
-                    )
-                    parsed_variants[variant_index[nt]] = (nt, inferred_pro)
-
-                non_synonymous_events = [(nt, pro) for (nt, pro) in codon_group if "p.=" not in pro]
-                for nt, pro in non_synonymous_events:
-                    parsed_variants[variant_index[nt]] = (nt, pro)
+        return self.parse_mixed_events(utilities.tokenize_variant(variant), element, variant)
 
-            nt_variants = [t[0] for t in parsed_variants.values()]
-            pro_variants = [t[1] for t in parsed_variants.values()]
-            return (
-                self.parse_nucleotide_variant(nt_variants),
-                self.parse_protein_variant(pro_variants),
+    def parse_mixed_events(self, tokens, element=None, variant=None):
+        """
+        Parses a list of tokens returned by `utilities.tokenize_variant`
+        where every token has both a nucleotide and a protein event.
+        `variant` is the original string, used when logging error messages.
+        """
+        if any(t.nt is None or t.pro is None for t in tokens):
+            raise ValueError(
+                "'{}' mixes events with and without both nucleotide and protein syntax.".format(
+                    utilities.format_tokens(tokens) if variant is None else variant
+                )
             )
 
+        # Bucket events by their 1-based codon position in a single pass.
+        # Output order follows the token order of the input string.
+        codon_groups = {}
+        for i, token in enumerate(tokens):
+            codon_groups.setdefault(token.nt.codon_position(), []).append(i)
+        pro_events = [t.pro.event for t in tokens]
+
+        # For each codon group, if applicable, infer the correct
+        # synonymous syntax.
+        for codon_group in codon_groups.values():
+            # Infer the correct synonymous syntax from the relevant
+            # mutations within the codon.
+            synonymous_events = [i for i in codon_group if tokens[i].pro.position is None]
+            if not synonymous_events:
+                continue
+            if len(codon_group) != len(synonymous_events):
+                logger.warning(
+                    "Codon group '{grp}' from variant '{var}' "
+                    "is partially synonymous.".format(
+                        grp=utilities.format_tokens([tokens[i] for i in codon_group]), var=variant
+                    )
+                )
+            inferred_pro = self.infer_silent_aa_substitution([tokens[i].nt for i in synonymous_events], variant)
+            for i in synonymous_events:
+                pro_events[i] = inferred_pro[2:]
+
+        return (
+            self.parse_nucleotide_events([t.nt for t in tokens]),
+            utilities.hgvs_pro_from_event_list(pro_events),
+        )
+
     def infer_silent_aa_substitution(self, codon_variants, variant=None):
         """
         Enrich2 outputs `p.=` for silent protein changes. This is incorrect.
@@ -392,26 +541,35 @@ class Enrich2(base.BaseProgram):
         function infers the correct silent protein subsitution syntax.
         Parameters
         ----------
-        codon_variants : Union[str, list]
-            List of variants corresponding to a particular codon.
+        codon_variants : Union[str, NucleotideSubstitutionEvent, list]
+            List of variants corresponding to a particular codon. Variants
+            that are already parsed events are used as-is.
         variant : str, optional
             Original variant. Used when logging error messages.
         Returns
         -------
         str
         """
-        if isinstance(codon_variants, str):
+        if isinstance(codon_variants, (str, utilities.NucleotideSubstitutionEvent)):
             codon_variants = [codon_variants]
         codon_variants = sorted(
-            [utilities.NucleotideSubstitutionEvent(v) for v in codon_variants],
+            [
+                v if isinstance(v, utilities.NucleotideSubstitutionEvent) else utilities.NucleotideSubstitutionEvent(v)
+                for v in codon_variants
+            ],
             key=lambda x: x.position,
         )
-        string_rep = ", ".join([str(v) for v in codon_variants])
 
-        if len(set(c.codon_position() for c in codon_variants)) > 1:
-            raise ValueError("Codon group '{grp}' contains variants from " "different codons.".format(grp=string_rep))
+        # aa_pos is returned as 1-based.
+        aa_pos = codon_variants[0].codon_position()
+        if any(v.codon_position() != aa_pos for v in codon_variants):
+            raise ValueError(
+                "Codon group '{grp}' contains variants from "
+                "different codons.".format(grp=", ".join(str(v) for v in codon_variants))
+            )
 
         # Enrich2 uses 1-based positions
+        changes = {}
         for v in codon_variants:
             if v.position > len(self.wt_sequence):
                 raise IndexError(
@@ -427,10 +585,10 @@ class Enrich2(base.BaseProgram):
                     )
                 )
 
+            # Silent events leave the wild-type base in place.
             if v.silent:
-                v.ref = self.wt_sequence[v.position - 1]
-                v.alt = self.wt_sequence[v.position - 1]
-            elif not v.silent and self.wt_sequence[v.position - 1] != v.ref:
+                continue
+            if self.wt_sequence[v.position - 1] != v.ref:
                 raise ValueError(
                     "Error inferring corrected synonymous syntax. "
                     "Base '{base}' at position {pos} (1-based) "
@@ -444,23 +602,37 @@ class Enrich2(base.BaseProgram):
                         row=variant,
                     )
                 )
-
-        # aa_pos is returned as 1-based.
-        aa_pos = codon_variants[0].codon_position()
-        wt_codon = self.codons[aa_pos - 1]
-        mut_codon = wt_codon
-        for v in codon_variants:
-            within_frame_pos = v.codon_frame_position()
-            mut_codon = mut_codon[: (within_frame_pos - 1)] + v.alt + mut_codon[(within_frame_pos - 1) + 1 :]
-
-        wt_aa = AA_CODES[CODON_TABLE[wt_codon.upper()]]
-        mut_aa = AA_CODES[CODON_TABLE[mut_codon.upper()]]
-        if wt_aa != mut_aa:
+            changes[v.codon_frame_position() - 1] = v.alt
+
+        # Single-base changes are looked up in the precomputed table; codons
+        # with several changed bases are translated from their shifted index.
+        wt_residue = self.substitution_residues[aa_pos - 1, 0, constants.silent_code]
+        if len(changes) <= 1:
+            frame, alt = next(iter(changes.items()), (0, None))
+            code = constants.silent_code if alt is None else constants.dna_base_codes[alt]
+            mut_residue = self.substitution_residues[aa_pos - 1, frame, code]
+        else:
+            index = int(self.codon_indices[aa_pos - 1])
+            for frame, alt in changes.items():
+                wt_code = int(self.wt_base_codes[(aa_pos - 1) * 3 + frame])
+                index += (constants.dna_base_codes[alt] - wt_code) * int(base.CODON_WEIGHTS[frame])
+            mut_residue = base.CODON_RESIDUES[index]
+
+        wt_aa = constants.amino_acids[wt_residue]
+        if wt_residue != mut_residue:
+            wt_codon = self.codons[aa_pos - 1]
+            mut_codon = "".join(changes.get(i, b) for i, b in enumerate(wt_codon))
             raise ValueError(
                 "Error inferring corrected synonymous syntax. "
                 "Wild-type codon ({}, {}) is not synonymous with "
                 "the mutant codon ({}, {}) suggested by the codon group "
-                "'{}'.".format(wt_codon, wt_aa, mut_codon, mut_aa, string_rep)
+                "'{}'.".format(
+                    wt_codon,
+                    wt_aa,
+                    mut_codon,
+                    constants.amino_acids[mut_residue],
+                    ", ".join(str(v) for v in codon_variants),
+                )
             )
         return "p.{aa}{pos}=".format(aa=wt_aa, pos=aa_pos)
 
@@ -518,3 +690,22 @@ class Enrich2(base.BaseProgram):
             raise ValueError("'{variant}' contains variants with multiple prefix " "types.".format(variant=variant))
         variants = [v[2:] for v in variants]
         return utilities.hgvs_nt_from_event_list(variants, prefix=prefix)
+
+    @staticmethod
+    def parse_protein_events(events):
+        """
+        Combines a list of parsed protein events into a single HGVS string.
+        """
+        return utilities.hgvs_pro_from_event_list([e.event for e in events])
+
+    @staticmethod
+    def parse_nucleotide_events(events):
+        """
+        Combines a list of parsed nucleotide events into a single HGVS string.
+        """
+        if len(set(e.prefix for e in events)) != 1:
+            raise ValueError(
+                "'{variant}' contains variants with multiple prefix "
+                "types.".format(variant=", ".join(e.format for e in events))
+            )
+        return utilities.hgvs_nt_from_event_list([e.event for e in events], prefix=events[0].prefix)
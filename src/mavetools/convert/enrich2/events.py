@@ -0,0 +1,349 @@
+import numpy as np
+
+from . import constants, exceptions, utilities
+
+__all__ = ["EventTable"]
+
+
+class EventTable(object):
+    """
+    Columnar (struct-of-arrays) representation of the events in a batch of
+    Enrich2 variant strings, with one entry per comma-delimited event.
+    Conversion stages update the columns in place and HGVS_ strings are
+    rendered once at the end by `render_rows`.
+
+    Special variants and rows the fast tokenizer does not match hold no
+    events. Rows a stage rejects keep their events and record an error code
+    and the event that caused it, so that they can be reported without
+    raising.
+
+    Attributes
+    ----------
+    variants : list[str]
+        The input variant strings, one per row.
+    special : np.ndarray
+        `True` for rows that are one of `constants.special_variants`.
+    unmatched : np.ndarray
+        `True` for rows that the table cannot represent. These need to be
+        parsed by the scalar code path.
+    error : np.ndarray
+        Index of the error code in `constants.parse_error_codes` of
+        rejected rows, 0 for other rows.
+    error_event : np.ndarray
+        The event that caused a row to be rejected, -1 if the row was
+        rejected as a whole.
+    error_details : dict[int, str]
+        Details of rejected rows given by the rejecting stage.
+    row : np.ndarray
+        Row id of each event.
+    prefix : np.ndarray
+        Index of the nucleotide prefix in `constants.nt_prefixes`, or
+        `constants.no_prefix` if the event has no nucleotide part.
+    position : np.ndarray
+        1-based nucleotide position, 0 if there is no nucleotide part.
+    ref, alt : np.ndarray
+        Nucleotide base codes (see `constants.dna_base_codes`). Both are
+        `constants.silent_code` for silent events such as `c.1=`.
+    has_pro : np.ndarray
+        `True` if the event has a protein part.
+    pro_position : np.ndarray
+        1-based protein position, 0 for `p.=` or if there is no protein part.
+    pro_ref, pro_alt : np.ndarray
+        Residue ids (see `constants.amino_acid_ids`) of the protein part.
+    synonymous : np.ndarray
+        `True` if the protein part is written as silent, such as
+        `p.Lys1=` or `p.=`.
+    bracketed : np.ndarray
+        `True` if the protein part was enclosed in brackets.
+    """
+
+    def __init__(self, variants, events=()):
+        self.variants = list(variants)
+        self.special = np.zeros(len(self.variants), dtype=bool)
+        self.unmatched = np.zeros(len(self.variants), dtype=bool)
+        self.error = np.zeros(len(self.variants), dtype=np.uint8)
+        self.error_event = np.full(len(self.variants), -1, dtype=np.int64)
+        self.error_details = {}
+
+        columns = list(zip(*events)) or [()] * 11
+        self.row = np.array(columns[0], dtype=np.int64)
+        self.prefix = np.array(columns[1], dtype=np.uint8)
+        self.position = np.array(columns[2], dtype=np.int32)
+        self.ref = np.array(columns[3], dtype=np.uint8)
+        self.alt = np.array(columns[4], dtype=np.uint8)
+        self.has_pro = np.array(columns[5], dtype=bool)
+        self.pro_position = np.array(columns[6], dtype=np.int32)
+        self.pro_ref = np.array(columns[7], dtype=np.uint8)
+        self.pro_alt = np.array(columns[8], dtype=np.uint8)
+        self.synonymous = np.array(columns[9], dtype=bool)
+        self.bracketed = np.array(columns[10], dtype=bool)
+
+        # Events are stored grouped by row, so each row is a slice.
+        self.row_starts = np.searchsorted(self.row, np.arange(len(self.variants) + 1))
+
+    def __len__(self):
+        return len(self.variants)
+
+    @classmethod
+    def from_variants(cls, variants):
+        """
+        Tokenizes a sequence of Enrich2 variant strings into an `EventTable`.
+
+        Parameters
+        ----------
+        variants : Iterable[str]
+            Enrich2 variant strings, such as the index of an Enrich2 table.
+
+        Returns
+        -------
+        EventTable
+        """
+        variants = list(variants)
+        events = []
+        special = []
+        unmatched = []
+        for i, variant in enumerate(variants):
+            if not isinstance(variant, str):
+                unmatched.append(i)
+                continue
+            variant = variant.strip()
+            if variant in constants.special_variants:
+                special.append(i)
+                continue
+            row_events = _scan_variant(i, variant)
+            if row_events is None:
+                unmatched.append(i)
+            else:
+                events.extend(row_events)
+
+        table = cls(variants, events)
+        table.special[special] = True
+        table.unmatched[unmatched] = True
+        return table
+
+    @property
+    def has_nt(self):
+        """`True` for events with a nucleotide part."""
+        return self.prefix != constants.no_prefix
+
+    @property
+    def unresolved(self):
+        """`True` for events whose protein part is `p.=`."""
+        return self.has_pro & (self.pro_position == 0)
+
+    @property
+    def codon(self):
+        """0-based codon index of each event's nucleotide position."""
+        return (self.position - 1) // 3
+
+    def count_by_row(self, mask):
+        """
+        Number of events per row for which `mask` is `True`.
+        """
+        return np.bincount(self.row[mask], minlength=len(self))
+
+    @property
+    def invalid(self):
+        """`True` for rows that were rejected."""
+        return self.error != 0
+
+    def reject(self, events, code):
+        """
+        Rejects the rows of the selected events with the error `code`. A row
+        keeps the first error it is rejected with.
+
+        Parameters
+        ----------
+        events : np.ndarray
+            Boolean mask or indices of the events.
+        code : str
+            One of the keys of `constants.parse_errors`.
+        """
+        events = np.flatnonzero(events) if events.dtype == bool else events
+        rows, first = np.unique(self.row[events], return_index=True)
+        new = self.error[rows] == 0
+        self.error[rows[new]] = constants.parse_error_ids[code]
+        self.error_event[rows[new]] = events[first[new]]
+
+    def reject_rows(self, rows, code, detail=None):
+        """
+        Rejects the selected rows as a whole with the error `code`. See
+        `reject`.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            Boolean mask or indices of the rows.
+        code : str
+            One of the keys of `constants.parse_errors`.
+        detail : str, optional.
+            Description of the error. Defaults to the description of `code`.
+        """
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows
+        rows = rows[self.error[rows] == 0]
+        self.error[rows] = constants.parse_error_ids[code]
+        if detail is not None:
+            self.error_details.update(dict.fromkeys(rows.tolist(), detail))
+
+    def describe_error(self, row):
+        """
+        Returns the error code and a description of the error of a
+        rejected row, naming the event that caused it.
+
+        Returns
+        -------
+        tuple[str, str]
+        """
+        code = constants.parse_error_codes[self.error[row]]
+        detail = self.error_details.get(row)
+        if detail is None:
+            variant = self.variants[row].strip()
+            event = self.error_event[row]
+            if event < 0:
+                detail = "{}: '{}'.".format(constants.parse_errors[code], variant)
+            else:
+                detail = "{}: '{}' in '{}'.".format(constants.parse_errors[code], self.format_events([event]), variant)
+        return code, detail
+
+    def render_events(self, events):
+        """
+        Renders the nucleotide and protein event strings (without prefix)
+        of the selected events. Missing parts are rendered as `None`.
+
+        Returns
+        -------
+        tuple[list, list]
+        """
+        bases = constants.dna_bases
+        amino_acids = constants.amino_acids
+        nt_events = []
+        for prefix, pos, ref, alt in zip(
+            self.prefix[events].tolist(),
+            self.position[events].tolist(),
+            self.ref[events].tolist(),
+            self.alt[events].tolist(),
+        ):
+            if prefix == constants.no_prefix:
+                nt_events.append(None)
+            elif ref == constants.silent_code:
+                nt_events.append("{}=".format(pos))
+            else:
+                nt_events.append("{}{}>{}".format(pos, bases[ref], bases[alt]))
+
+        pro_events = []
+        for has_pro, pos, ref, alt, synonymous in zip(
+            self.has_pro[events].tolist(),
+            self.pro_position[events].tolist(),
+            self.pro_ref[events].tolist(),
+            self.pro_alt[events].tolist(),
+            self.synonymous[events].tolist(),
+        ):
+            if not has_pro:
+                pro_events.append(None)
+            elif pos == 0:
+                pro_events.append("=")
+            elif synonymous:
+                pro_events.append("{}{}=".format(amino_acids[ref], pos))
+            else:
+                pro_events.append("{}{}{}".format(amino_acids[ref], pos, amino_acids[alt]))
+        return nt_events, pro_events
+
+    def format_events(self, events):
+        """
+        Formats the selected events back into an Enrich2 variant string,
+        see `utilities.format_tokens`.
+        """
+        entries = []
+        prefixes = self.prefix[events].tolist()
+        bracketed = self.bracketed[events].tolist()
+        for i, (nt, pro) in enumerate(zip(*self.render_events(events))):
+            parts = []
+            if nt is not None:
+                parts.append("{}.{}".format(constants.nt_prefixes[prefixes[i]], nt))
+            if pro is not None:
+                parts.append("(p.{})".format(pro) if bracketed[i] else "p.{}".format(pro))
+            entries.append(" ".join(parts))
+        return ", ".join(entries)
+
+    def render_rows(self):
+        """
+        Renders the MaveDB HGVS_ strings of every row that holds events and
+        is not invalid. Event strings are rendered for the whole table at
+        once and then joined per row. The nucleotide and protein strings of a
+        row are only rendered if every event of the row has that part. Rows
+        whose rendered strings are not in Mave HGVS format are rejected.
+
+        Yields
+        ------
+        tuple[int, tuple[str, str]]
+            The row id and its nucleotide and protein HGVS_ strings, either
+            of which may be `None`.
+        """
+        nt_events, pro_events = self.render_events(slice(None))
+        starts = self.row_starts.tolist()
+        prefixes = self.prefix.tolist()
+        for i in np.flatnonzero(~self.invalid & (self.row_starts[1:] > self.row_starts[:-1])).tolist():
+            start, stop = starts[i], starts[i + 1]
+            row_nt, row_pro = nt_events[start:stop], pro_events[start:stop]
+            hgvs_nt = hgvs_pro = None
+            try:
+                if None not in row_nt:
+                    hgvs_nt = utilities.hgvs_nt_from_event_list(row_nt, prefix=constants.nt_prefixes[prefixes[start]])
+                if None not in row_pro:
+                    hgvs_pro = utilities.hgvs_pro_from_event_list(row_pro)
+            except exceptions.HGVSMatchError as e:
+                self.reject_rows(np.array([i]), "invalid_hgvs", str(e))
+                continue
+            yield i, (hgvs_nt, hgvs_pro)
+
+
+def _scan_variant(row, variant):
+    """
+    Splits a stripped variant string into event records using
+    `constants.variant_token_re`. Returns `None` if an entry is not matched
+    or holds a code that the table cannot represent.
+    """
+    events = []
+    pos = 0
+    while True:
+        match = constants.variant_token_re.match(variant, pos)
+        if match is None:
+            return None
+        nt, nt_prefix, nt_position, nt_ref, nt_alt, bracket, pro, pro_ref, pro_position, pro_alt, sep = match.groups()
+        if nt is None and pro is None:
+            return None
+
+        if nt is None:
+            prefix, position, ref, alt = constants.no_prefix, 0, constants.silent_code, constants.silent_code
+        else:
+            prefix = constants.nt_prefix_codes[nt_prefix]
+            position = int(nt_position)
+            ref = alt = constants.silent_code
+            if nt_ref is not None:
+                ref, alt = constants.dna_base_codes[nt_ref], constants.dna_base_codes[nt_alt]
+
+        if pro is None or pro_ref is None:
+            pro_pos, pro_ref_id, pro_alt_id = 0, 0, 0
+        else:
+            pro_pos = int(pro_position)
+            pro_ref_id = constants.amino_acid_ids[pro_ref]
+            pro_alt_id = pro_ref_id if pro_alt is None else constants.amino_acid_ids[pro_alt]
+
+        events.append(
+            (
+                row,
+                prefix,
+                position,
+                ref,
+                alt,
+                pro is not None,
+                pro_pos,
+                pro_ref_id,
+                pro_alt_id,
+                pro is not None and pro_alt is None,
+                bracket is not None,
+            )
+        )
+        if sep is None:
+            return events
+        pos = match.end()
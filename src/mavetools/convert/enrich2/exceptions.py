@@ -38,7 +38,7 @@ class SequenceFrameError(Exception):
     pass
 
 
-class InvalidVariantType(Exception):
+class InvalidVariantType(ValueError):
     """
     Throw exception when a specific type of event is expected (sub, del, etc)
     but not found.
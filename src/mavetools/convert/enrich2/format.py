@@ -11,61 +11,68 @@ __all__ = [
     "flatten_column_names",
     "get_count_dataframe_by_condition",
     "get_replicate_score_dataframes",
+    "offset_table",
+    "offset_tokens",
 ]
 
 
 logger = logging.getLogger(LOGGER)
 
 
-def apply_offset(variant, offset, enrich2=None):  # noqa: max-complexity 12
+def apply_offset(variant, offset, enrich2=None):
     """
     Applies offset to the base position of a HGVS point mutation by
     subtraction. If `enrich2` is not None, then additional validation
     against a wild-type NT and Protein sequence are performed after applicaiton
     of the offset.
     """
-    variants = []
-    for v in variant.split(","):
-        nt_instance = None
-        if len(v.strip().split(" ")) == 2:
-            nt, pro = v.strip().split(" ")
-        elif v.strip()[0] == "p":
-            nt, pro = None, v.strip()
-        else:
-            nt, pro = v.strip(), None
+    tokens = utilities.tokenize_variant(variant)
+    offset_tokens(tokens, offset, enrich2=enrich2)
+    return utilities.format_tokens(tokens)
 
+
+def offset_tokens(tokens, offset, enrich2=None):
+    """
+    Applies offset in place to the events of a list of tokens returned by
+    `utilities.tokenize_variant`. See `apply_offset`.
+    """
+    pro_offset = (1, -1)[offset < 0] * (abs(offset) // 3)
+    for token in tokens:
+        nt, pro = token.nt, token.pro
         if nt is not None:
-            nt = utilities.NucleotideSubstitutionEvent(nt)
-            nt_instance = nt
             nt.position -= offset
             if nt.position < 1:
                 raise ValueError("Position after offset {} " "applied to {} is negative.".format(offset, nt.variant))
             if enrich2:
-                enrich2.validate_against_wt_sequence(nt.format)
-            nt = nt.format
-
-        if pro is not None and pro != "p.=":
-            use_brackets = False
-            if pro.startswith("(") and pro.endswith(")"):
-                pro = pro[1:-1]
-                use_brackets = True
-
-            pro = utilities.ProteinSubstitutionEvent(pro)
-            if nt_instance is not None:
-                pro.position = nt_instance.codon_position()
+                enrich2.validate_event_against_wt_sequence(nt)
+
+        if pro is not None and pro.position is not None:
+            if nt is not None:
+                pro.position = nt.codon_position()
             else:
-                pro_offset = (1, -1)[offset < 0] * (abs(offset) // 3)
                 pro.position -= pro_offset
 
             if enrich2:
-                enrich2.validate_against_protein_sequence(pro.format)
-            pro = pro.format
-            if use_brackets:
-                pro = "({})".format(pro)
+                enrich2.validate_event_against_protein_sequence(pro)
+    return tokens
 
-        variants.append("{} {}".format("" if nt is None else nt, "" if pro is None else pro).strip())
 
-    return ", ".join(variants)
+def offset_table(table, offset):
+    """
+    Applies offset in place to the events of an `events.EventTable`. Rows
+    with a position that is no longer positive are rejected. See
+    `offset_tokens`.
+    """
+    pro_offset = (1, -1)[offset < 0] * (abs(offset) // 3)
+    has_nt = table.has_nt
+    table.position[has_nt] -= offset
+    table.reject(has_nt & (table.position < 1), "invalid_position")
+
+    resolved = table.has_pro & (table.pro_position != 0)
+    table.pro_position[resolved & has_nt] = table.codon[resolved & has_nt] + 1
+    table.pro_position[resolved & ~has_nt] -= pro_offset
+    table.reject(resolved & (table.pro_position < 1), "invalid_position")
+    return table
 
 
 def drop_null(scores_df, counts_df=None):
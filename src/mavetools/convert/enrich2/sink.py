@@ -0,0 +1,106 @@
+import logging
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from . import LOGGER
+
+__all__ = ["InvalidRowSink"]
+
+
+logger = logging.getLogger(LOGGER)
+
+
+class InvalidRowSink(object):
+    """
+    Collects the rows of a data frame that could not be converted and writes
+    them, with their error code and description, to a `.csv` file in
+    batches. The file is only created once the first batch is written.
+    Closing the sink writes the remaining rows and logs a single summary of
+    the number of rows rejected per error code.
+
+    Parameters
+    ----------
+    path : str
+        Path of the `.csv` file to write.
+    batch_size : int, optional.
+        Number of rows to collect before writing them.
+
+    Attributes
+    ----------
+    counts : Counter
+        The number of rows added per error code.
+    """
+
+    def __init__(self, path, batch_size=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.counts = Counter()
+        self._pending = []
+        self._n_pending = 0
+        self._written = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def total(self):
+        """The number of rows added."""
+        return sum(self.counts.values())
+
+    def add(self, df, codes, details):
+        """
+        Adds rejected rows to the sink.
+
+        Parameters
+        ----------
+        df : `pd.DataFrame`
+            The rejected rows.
+        codes : list[str]
+            The error code of each row, see `constants.parse_errors`.
+        details : list[str]
+            The error description of each row.
+        """
+        self.counts.update(codes)
+        self._pending.append(df.assign(error_code=codes, error_description=details))
+        self._n_pending += len(df)
+        if self._n_pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the collected rows to the file.
+        """
+        if not self._pending:
+            return
+        if not self._written:
+            logger.info("Writing invalid rows to {}".format(self.path))
+        batch = pd.concat(self._pending)
+        batch.to_csv(self.path, sep=",", na_rep=np.NaN, mode="a" if self._written else "w", header=not self._written)
+        self._written = True
+        self._pending = []
+        self._n_pending = 0
+
+    def close(self):
+        """
+        Writes the remaining rows and logs a summary of the rejected rows.
+
+        Returns
+        -------
+        Counter
+            The number of rows rejected per error code.
+        """
+        self.flush()
+        if self.total:
+            logger.warning(
+                "Could not parse {} rows ({}). Invalid rows were written to {}.".format(
+                    self.total,
+                    ", ".join("{}: {}".format(code, n) for code, n in self.counts.most_common()),
+                    self.path,
+                )
+            )
+        return self.counts
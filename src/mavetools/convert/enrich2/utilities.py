@@ -1,9 +1,10 @@
 import re
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 
 import numpy as np
 import pandas as pd
 from mavehgvs import Variant
+from mavehgvs.exceptions import MaveHgvsParseError
 from mavehgvs.patterns import dna, protein
 
 from . import constants, exceptions
@@ -86,6 +87,8 @@ class NucleotideSubstitutionEvent(object):
         Prefix of the variant.
     """
 
+    __slots__ = ("variant", "position", "ref", "alt", "silent", "prefix")
+
     def __init__(self, variant):
         """
 
@@ -114,6 +117,38 @@ class NucleotideSubstitutionEvent(object):
             self.alt = var.sequence[1]
         self.prefix = var.prefix
 
+    @classmethod
+    def from_parts(cls, variant, prefix, position, ref=None, alt=None):
+        """
+        Creates an event from an already tokenized substitution without
+        re-parsing `variant`. A silent event is created if `ref` is `None`.
+
+        Parameters
+        ----------
+        variant : str
+            The HGVS_ string the parts were taken from.
+        prefix : str
+            Prefix of the variant.
+        position : int
+            Position of the substitution event.
+        ref : str, optional.
+            The reference base.
+        alt : str, optional.
+            The mutant base.
+
+        Returns
+        -------
+        NucleotideSubstitutionEvent
+        """
+        event = cls.__new__(cls)
+        event.variant = variant
+        event.prefix = prefix
+        event.position = position
+        event.silent = ref is None
+        event.ref = ref
+        event.alt = alt
+        return event
+
     def __repr__(self):
         return self.format
 
@@ -125,7 +160,6 @@ class NucleotideSubstitutionEvent(object):
         -------
 
         """
-        print(type("{}.{}".format(self.prefix, self.event)))
         return "{}.{}".format(self.prefix, self.event)
 
     @property
@@ -209,6 +243,8 @@ class ProteinSubstitutionEvent(object):
         Prefix of the variant.
     """
 
+    __slots__ = ("variant", "_position", "ref", "alt", "silent", "prefix")
+
     def __init__(self, variant):
         """
 
@@ -239,6 +275,37 @@ class ProteinSubstitutionEvent(object):
             self.alt = var.sequence[1]
         self.prefix = var.prefix
 
+    @classmethod
+    def from_parts(cls, variant, position=None, ref=None, alt=None):
+        """
+        Creates an event from an already tokenized substitution without
+        re-parsing `variant`. A silent event is created if `alt` is `None`,
+        and an unresolved silent event (`p.=`) if `position` is also `None`.
+
+        Parameters
+        ----------
+        variant : str
+            The HGVS_ string the parts were taken from.
+        position : int, optional.
+            Position of the substitution event.
+        ref : str, optional.
+            The reference amino acid in three-letter-code format.
+        alt : str, optional.
+            The mutant amino acid in three-letter-code format.
+
+        Returns
+        -------
+        ProteinSubstitutionEvent
+        """
+        event = cls.__new__(cls)
+        event.variant = variant
+        event.prefix = "p"
+        event._position = position
+        event.silent = alt is None
+        event.ref = ref
+        event.alt = ref if alt is None else alt
+        return event
+
     def __repr__(self):
         """
 
@@ -292,11 +359,179 @@ class ProteinSubstitutionEvent(object):
         -------
 
         """
+        if self.position is None:
+            return "="
         if self.silent:
             return "{ref}{pos}=".format(ref=self.ref, pos=self.position)
         return "{ref}{pos}{alt}".format(ref=self.ref, pos=self.position, alt=self.alt)
 
 
+VariantToken = namedtuple("VariantToken", ["nt", "pro", "bracketed"])
+VariantToken.__doc__ = """
+One comma-delimited entry of an Enrich2 variant string.
+
+Attributes
+----------
+nt : NucleotideSubstitutionEvent, optional.
+    The nucleotide event of the entry, if any.
+pro : ProteinSubstitutionEvent, optional.
+    The protein event of the entry, if any. `p.=` is represented by an
+    event with a `position` of `None`.
+bracketed : bool
+    `True` if the protein event was enclosed in brackets.
+"""
+
+
+ParseResult = namedtuple("ParseResult", ["ok", "value", "detail"])
+ParseResult.__doc__ = """
+Outcome of parsing an Enrich2 row, returned instead of raising an exception.
+
+Attributes
+----------
+ok : bool
+    `True` if the row was parsed.
+value : tuple[str, str] | str
+    The parsed `(hgvs_nt, hgvs_pro)` tuple if `ok`, otherwise the error code,
+    one of the keys of `constants.parse_errors`.
+detail : str, optional.
+    Description of the error, `None` if `ok`.
+"""
+
+
+def parse_error_code(error):
+    """
+    Categorizes an exception raised while parsing a variant into one of the
+    error codes in `constants.parse_errors`.
+
+    Parameters
+    ----------
+    error : Exception
+        The exception raised.
+
+    Returns
+    -------
+    str
+    """
+    if isinstance(error, exceptions.InvalidVariantType):
+        return "unsupported_event"
+    if isinstance(error, MaveHgvsParseError):
+        return "invalid_syntax"
+    if isinstance(error, exceptions.HGVSMatchError):
+        return "invalid_hgvs"
+    if isinstance(error, IndexError):
+        return "out_of_bounds"
+    return "invalid_variant"
+
+
+def tokenize_variant(variant):
+    """
+    Tokenizes an Enrich2 variant string such as
+    `c.1A>G (p.Met1Val), c.2T>C (p.=)` into a list of `VariantToken` in a
+    single scan, with positions converted to integers.
+
+    Entries that are not simple substitution or silent events are handed to
+    `NucleotideSubstitutionEvent` or `ProteinSubstitutionEvent` so that they
+    raise the same errors as before.
+
+    Parameters
+    ----------
+    variant : str
+        An Enrich2 variant string.
+
+    Returns
+    -------
+    list[VariantToken]
+    """
+    tokens = []
+    pos = 0
+    while True:
+        match = constants.variant_token_re.match(variant, pos)
+        if match is None or (match.group("nt") is None and match.group("pro") is None):
+            stop = variant.find(",", pos)
+            tokens.append(_tokenize_entry(variant[pos:] if stop == -1 else variant[pos:stop]))
+            if stop == -1:
+                return tokens
+            pos = stop + 1
+            continue
+
+        nt = pro = None
+        if match.group("nt") is not None:
+            nt = NucleotideSubstitutionEvent.from_parts(
+                match.group("nt"),
+                match.group("nt_prefix"),
+                int(match.group("nt_position")),
+                match.group("nt_ref"),
+                match.group("nt_alt"),
+            )
+        if match.group("pro") is not None:
+            pro_position = match.group("pro_position")
+            pro = ProteinSubstitutionEvent.from_parts(
+                match.group("pro"),
+                None if pro_position is None else int(pro_position),
+                match.group("pro_ref"),
+                match.group("pro_alt"),
+            )
+        tokens.append(VariantToken(nt, pro, match.group("bracket") is not None))
+
+        if match.group("sep") is None:
+            return tokens
+        pos = match.end()
+
+
+def _tokenize_entry(entry):
+    """
+    Slow path of `tokenize_variant` for a single entry, using mavehgvs.
+    """
+    entry = entry.strip()
+    if not entry:
+        raise ValueError("Encountered an empty event in variant string.")
+
+    parts = entry.split(" ")
+    if len(parts) == 2:
+        nt, pro = parts
+    elif entry[0] in "p(":
+        nt, pro = None, entry
+    else:
+        nt, pro = entry, None
+
+    bracketed = False
+    if nt is not None:
+        nt = NucleotideSubstitutionEvent(nt)
+    if pro is not None:
+        if pro.startswith("(") and pro.endswith(")"):
+            pro = pro[1:-1]
+            bracketed = True
+        if pro == "p.=":
+            pro = ProteinSubstitutionEvent.from_parts(pro)
+        else:
+            pro = ProteinSubstitutionEvent(pro)
+    return VariantToken(nt, pro, bracketed)
+
+
+def format_tokens(tokens):
+    """
+    Formats a list of `VariantToken` back into an Enrich2 variant string.
+
+    Parameters
+    ----------
+    tokens : list[VariantToken]
+        Tokens returned by `tokenize_variant`.
+
+    Returns
+    -------
+    str
+    """
+    entries = []
+    for token in tokens:
+        parts = []
+        if token.nt is not None:
+            parts.append(token.nt.format)
+        if token.pro is not None:
+            parts.append("({})".format(token.pro.format) if token.bracketed else token.pro.format)
+        entries.append(" ".join(parts))
+    return ", ".join(entries)
+
+
 def split_variant(variant):
     """
     Splits a multi-variant `HGVS` string into a list of single variants. If
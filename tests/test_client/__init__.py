@@ -0,0 +1,119 @@
+import asyncio
+import json
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mavetools.client.client import Client
+
+
+class ClientTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Runs a minimal stand-in for the MaveDB API and creates a `Client` for it.
+    `self.records` maps URNs to the JSON records served, `self.delays` maps URNs to a
+    response delay in seconds and `self.requests` records the path and peer (host, port)
+    of every request received. `self.max_in_flight` is the largest number of record
+    requests handled at the same time. Records are served with an ETag and
+    `self.not_modified` counts the requests answered with 304 Not Modified. Records POSTed to an endpoint are
+    served back with a new `tmp:` URN, and experiments created without an experiment set
+    are given a new one. `self.created` lists the created records in order. `self.failures` maps request paths to a
+    list of (status, headers) error responses that are sent before the request succeeds.
+    Files uploaded to a score set are stored in `self.uploads` by URN and form field name,
+    together with the Content-Encoding of the request in `self.upload_encodings`.
+    `self.tables` maps (URN, "scores" or "counts") to CSV text, which is streamed in
+    small pieces.
+    """
+
+    client_options = {}
+
+    async def asyncSetUp(self):
+        self.records = {}
+        self.delays = {}
+        self.requests = []
+        self.in_flight = 0
+        self.not_modified = 0
+        self.max_in_flight = 0
+        self.failures = {}
+        self.uploads = {}
+        self.upload_encodings = []
+        self.tables = {}
+        self.created = []
+        app = web.Application()
+        app.router.add_get("/api/v1/{endpoint}/{urn}/", self.get_record)
+        app.router.add_get("/api/v1/api/version", self.get_version)
+        app.router.add_post("/api/v1/{endpoint}/", self.create_record)
+        app.router.add_post("/api/v1/score-sets/{urn}/variants/data/", self.upload_files)
+        app.router.add_get("/api/v1/score-sets/{urn}/{table}", self.get_table)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.client = self.make_client(**self.client_options)
+
+    async def asyncTearDown(self):
+        await self.client.session.close()
+        await self.server.close()
+
+    def make_client(self, **kwargs):
+        return Client(base_url=str(self.server.make_url("/api/v1/")), **kwargs)
+
+    def failure(self, request):
+        status, headers = self.failures[request.path].pop(0)
+        return web.Response(status=status, headers=headers)
+
+    async def get_record(self, request):
+        self.requests.append((request.path, request.transport.get_extra_info("peername")))
+        if self.failures.get(request.path):
+            return self.failure(request)
+        urn = request.match_info["urn"]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(urn, 0))
+        finally:
+            self.in_flight -= 1
+        if urn not in self.records:
+            raise web.HTTPNotFound()
+        etag = '"{}"'.format(hash(json.dumps(self.records[urn], sort_keys=True)))
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response(self.records[urn], headers={"ETag": etag})
+
+    async def create_record(self, request):
+        self.requests.append((request.path, request.transport.get_extra_info("peername")))
+        if self.failures.get(request.path):
+            return self.failure(request)
+        record = dict(await request.json(), urn="tmp:{:08}".format(len(self.created) + 1))
+        if request.match_info["endpoint"] == "experiments" and not record.get("experiment_set_urn"):
+            record["experiment_set_urn"] = "tmp:set-{:08}".format(len(self.created) + 1)
+        self.created.append(record)
+        self.records[record["urn"]] = record
+        return web.json_response(record)
+
+    async def upload_files(self, request):
+        self.requests.append((request.path, request.transport.get_extra_info("peername")))
+        if self.failures.get(request.path):
+            return self.failure(request)
+        self.upload_encodings.append(request.headers.get("Content-Encoding"))
+        files = self.uploads.setdefault(request.match_info["urn"], {})
+        reader = await request.multipart()
+        async for part in reader:
+            files[part.name] = (part.filename, (await part.read()).decode("utf-8"))
+        return web.json_response({"urn": request.match_info["urn"]})
+
+    async def get_table(self, request):
+        self.requests.append((request.path, request.transport.get_extra_info("peername")))
+        key = (request.match_info["urn"], request.match_info["table"])
+        if key not in self.tables:
+            raise web.HTTPNotFound()
+        response = web.StreamResponse(headers={"Content-Type": "text/csv"})
+        await response.prepare(request)
+        data = self.tables[key].encode("utf-8")
+        for start in range(0, len(data), 64):
+            await response.write(data[start : start + 64])
+        await response.write_eof()
+        return response
+
+    async def get_version(self, request):
+        self.requests.append((request.path, request.transport.get_extra_info("peername")))
+        return web.json_response({"name": "mavedb", "version": "2024.1.0"})
@@ -0,0 +1,195 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from mavetools.client.cache import MemoryCache, ResponseCache
+from tests.test_client import ClientTestCase
+
+URN = "urn:mavedb:00000001-a-1"
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.cache = ResponseCache(self.directory)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_stores_data_and_validators(self):
+        self.cache.put("http://host/a/", {"a": 1}, etag='"x"', last_modified="yesterday")
+        entry = self.cache.get("http://host/a/")
+        self.assertEqual(entry.data, {"a": 1})
+        self.assertEqual(entry.etag, '"x"')
+        self.assertEqual(entry.last_modified, "yesterday")
+        self.assertIsNone(self.cache.get("http://host/b/"))
+
+    def test_persists_across_instances(self):
+        self.cache.put("http://host/a/", [1, 2])
+        self.assertEqual(ResponseCache(self.directory).get("http://host/a/").data, [1, 2])
+
+    def test_keys_private_responses_by_token(self):
+        self.cache.put("http://host/a/", {"private": True}, auth_token="secret")
+        self.assertIsNone(self.cache.get("http://host/a/"))
+        self.assertIsNone(self.cache.get("http://host/a/", auth_token="other"))
+        self.assertEqual(self.cache.get("http://host/a/", auth_token="secret").data, {"private": True})
+        self.assertNotIn("secret", "".join(os.listdir(self.directory)))
+
+    def test_freshness(self):
+        entry = self.cache.put("http://host/a/", {})
+        self.assertTrue(self.cache.is_fresh(entry))
+        self.assertFalse(self.cache.is_fresh(entry._replace(stored_at=time.time() - self.cache.ttl - 1)))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.max_size = 400
+        for i in range(3):
+            self.cache.put(f"http://host/{i}/", "x" * 50)
+            os.utime(self.cache._path(f"http://host/{i}/", None), (i, i))
+        self.cache.get("http://host/0/")
+        self.cache.put("http://host/3/", "x" * 50)
+        self.assertIsNotNone(self.cache.get("http://host/0/"))
+        self.assertIsNone(self.cache.get("http://host/1/"))
+        self.assertIsNotNone(self.cache.get("http://host/3/"))
+        self.assertLessEqual(self.cache._size, 400)
+
+    def test_clear(self):
+        self.cache.put("http://host/a/", {})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("http://host/a/"))
+
+
+class TestClientCache(ClientTestCase):
+    async def asyncSetUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self._directory.name, ttl=3600)
+        self.client_options = {"cache": self.cache, "memory_cache_size": 0}
+        await super().asyncSetUp()
+        self.records[URN] = {"urn": URN, "title": "a"}
+
+    async def asyncTearDown(self):
+        await super().asyncTearDown()
+        self._directory.cleanup()
+
+    async def test_serves_fresh_responses_from_cache(self):
+        self.assertEqual(await self.client.get_dataset(URN), self.records[URN])
+        self.assertEqual(await self.client.get_dataset(URN), self.records[URN])
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_revalidates_stale_responses(self):
+        self.cache.ttl = 0
+        await self.client.get_dataset(URN)
+        self.assertEqual(await self.client.get_dataset(URN), self.records[URN])
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.not_modified, 1)
+
+    async def test_updates_changed_responses(self):
+        self.cache.ttl = 0
+        await self.client.get_dataset(URN)
+        self.records[URN] = {"urn": URN, "title": "b"}
+        self.assertEqual(await self.client.get_dataset(URN), {"urn": URN, "title": "b"})
+        self.assertEqual(self.not_modified, 0)
+
+    async def test_private_responses_are_not_shared(self):
+        private_client = self.make_client(auth_token="secret", **self.client_options)
+        try:
+            await private_client.get_dataset(URN)
+        finally:
+            await private_client.session.close()
+        await self.client.get_dataset(URN)
+        self.assertEqual(len(self.requests), 2)
+
+
+class TestMemoryCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.cache = MemoryCache(max_entries=2, ttl=3600)
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.calls
+
+    async def test_shares_in_flight_requests(self):
+        results = await asyncio.gather(*(self.cache.get_or_fetch("a", self.fetch) for _ in range(5)))
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(self.calls, 1)
+
+    async def test_expires_entries(self):
+        await self.cache.get_or_fetch("a", self.fetch)
+        self.cache.ttl = 0
+        self.assertEqual(await self.cache.get_or_fetch("a", self.fetch), 2)
+
+    async def test_evicts_least_recently_used(self):
+        for key in ("a", "b", "a", "c"):
+            await self.cache.get_or_fetch(key, self.fetch)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(await self.cache.get_or_fetch("a", self.fetch), 1)
+        self.assertEqual(await self.cache.get_or_fetch("b", self.fetch), 4)
+
+    async def test_does_not_store_failures(self):
+        async def fail():
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            await self.cache.get_or_fetch("a", fail)
+        self.assertEqual(await self.cache.get_or_fetch("a", self.fetch), 1)
+
+    async def test_cancelled_caller_does_not_cancel_shared_request(self):
+        first = asyncio.ensure_future(self.cache.get_or_fetch("a", self.fetch))
+        second = asyncio.ensure_future(self.cache.get_or_fetch("a", self.fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, 1)
+
+    async def test_invalidate(self):
+        await self.cache.get_or_fetch("a", self.fetch)
+        await self.cache.get_or_fetch("b", self.fetch)
+        self.cache.invalidate(lambda key: key == "a")
+        self.assertEqual(await self.cache.get_or_fetch("a", self.fetch), 3)
+        self.assertEqual(await self.cache.get_or_fetch("b", self.fetch), 2)
+
+    async def test_invalidated_in_flight_request_is_not_stored(self):
+        task = asyncio.ensure_future(self.cache.get_or_fetch("a", self.fetch))
+        await asyncio.sleep(0)
+        self.cache.invalidate()
+        self.assertEqual(await task, 1)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestClientMemoryCache(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.records[URN] = {"urn": URN, "title": "a"}
+        self.delays[URN] = 0.01
+
+    async def test_concurrent_requests_share_one_request(self):
+        results = await asyncio.gather(*(self.client.get_dataset(URN) for _ in range(5)))
+        self.assertEqual(results, [self.records[URN]] * 5)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_keys_by_auth_token(self):
+        await self.client.get_dataset(URN)
+        self.client.auth_token = "secret"
+        await self.client.get_dataset(URN)
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_create_dataset_invalidates_referenced_records(self):
+        experiment_set_urn = "urn:mavedb:00000002"
+        self.records[experiment_set_urn] = {"urn": experiment_set_urn, "experiments": []}
+        self.client.auth_token = "secret"
+        await self.client.get_dataset(URN)
+        await self.client.get_dataset(experiment_set_urn)
+        with mock.patch("mavetools.client.client.validate_dataset_with_create_model"):
+            urn = await self.client.create_dataset({"experiment_set_urn": experiment_set_urn, "title": "b"})
+        self.records[experiment_set_urn] = {"urn": experiment_set_urn, "experiments": [urn]}
+        self.assertEqual((await self.client.get_dataset(experiment_set_urn))["experiments"], [urn])
+        await self.client.get_dataset(URN)
+        self.assertEqual(len(self.requests), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
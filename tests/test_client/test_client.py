@@ -0,0 +1,147 @@
+import asyncio
+import unittest
+
+from aiohttp import ClientResponseError
+
+from mavetools.client.client import DatasetResult
+from tests.test_client import ClientTestCase
+
+
+class TestClientConnectionPool(ClientTestCase):
+    client_options = {"memory_cache_size": 0}
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.records["urn:mavedb:00000001-a-1"] = {"urn": "urn:mavedb:00000001-a-1"}
+
+    async def test_reuses_connections(self):
+        for _ in range(3):
+            await self.client.get_dataset("urn:mavedb:00000001-a-1")
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(len({peer for _, peer in self.requests}), 1)
+
+    async def test_force_close_opens_a_connection_per_request(self):
+        await self.client.session.close()
+        self.client = self.make_client(force_close=True, **self.client_options)
+        for _ in range(3):
+            await self.client.get_dataset("urn:mavedb:00000001-a-1")
+        self.assertEqual(len({peer for _, peer in self.requests}), 3)
+
+    async def test_connector_limits(self):
+        await self.client.session.close()
+        self.client = self.make_client(limit=5, limit_per_host=2, keepalive_timeout=30)
+        connector = self.client.session.connector
+        self.assertEqual(connector.limit, 5)
+        self.assertEqual(connector.limit_per_host, 2)
+        self.assertFalse(connector.force_close)
+
+
+class TestClientLifecycle(ClientTestCase):
+    async def test_async_context_manager_closes_client(self):
+        async with self.make_client() as client:
+            self.assertEqual(await client.api_version(), "2024.1.0")
+        self.assertTrue(client.closed)
+
+
+class TestClientGetDatasets(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.urns = ["urn:mavedb:{:08}-a-1".format(i) for i in range(1, 9)]
+        for i, urn in enumerate(self.urns):
+            self.records[urn] = {"urn": urn}
+            self.delays[urn] = 0.01 * (len(self.urns) - i)
+
+    async def test_returns_results_in_input_order(self):
+        results = await self.client.get_datasets(self.urns, concurrency=4)
+        self.assertEqual([r.urn for r in results], self.urns)
+        self.assertEqual([r.dataset for r in results], [{"urn": urn} for urn in self.urns])
+        self.assertTrue(all(r.ok for r in results))
+
+    async def test_limits_concurrency(self):
+        await self.client.get_datasets(self.urns, concurrency=3)
+        self.assertEqual(len(self.requests), len(self.urns))
+        self.assertLessEqual(self.max_in_flight, 3)
+        self.assertGreater(self.max_in_flight, 1)
+
+    async def test_reports_failures_as_values(self):
+        results = await self.client.get_datasets([self.urns[0], "urn:mavedb:00000099-a-1", "not-a-urn"])
+        self.assertTrue(results[0].ok)
+        self.assertIsInstance(results[1].error, ClientResponseError)
+        self.assertEqual(results[1].error.status, 404)
+        self.assertIsNone(results[1].dataset)
+        self.assertIsInstance(results[2].error, ValueError)
+
+    async def test_accepts_async_iterator(self):
+        async def urns():
+            for urn in self.urns:
+                yield urn
+
+        results = await self.client.get_datasets(urns(), concurrency=2)
+        self.assertEqual([r.urn for r in results], self.urns)
+
+    async def test_iter_datasets_yields_results(self):
+        results = [r async for r in self.client.iter_datasets(self.urns[:2], record_type="score_set")]
+        self.assertEqual(results, [DatasetResult(urn, {"urn": urn}) for urn in self.urns[:2]])
+
+    async def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            await self.client.get_datasets(self.urns, concurrency=0)
+
+
+class TestClientFetchTree(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.records["urn:mavedb:00000001"] = {
+            "urn": "urn:mavedb:00000001",
+            "experiments": [{"urn": "urn:mavedb:00000001-a"}, {"urn": "urn:mavedb:00000001-b"}],
+        }
+        self.records["urn:mavedb:00000001-a"] = {
+            "urn": "urn:mavedb:00000001-a",
+            "scoreSetUrns": ["urn:mavedb:00000001-a-1", "urn:mavedb:00000001-a-2"],
+        }
+        self.records["urn:mavedb:00000001-b"] = {"urn": "urn:mavedb:00000001-b", "scoreSetUrns": []}
+        self.records["urn:mavedb:00000001-a-1"] = {"urn": "urn:mavedb:00000001-a-1"}
+        self.records["urn:mavedb:00000001-a-2"] = {"urn": "urn:mavedb:00000001-a-2"}
+
+    async def test_returns_flat_index(self):
+        index = await self.client.fetch_tree("urn:mavedb:00000001")
+        self.assertEqual(set(index), set(self.records))
+        self.assertTrue(all(result.ok for result in index.values()))
+        self.assertEqual(index["urn:mavedb:00000001-a-1"].dataset, self.records["urn:mavedb:00000001-a-1"])
+
+    async def test_fetches_children_without_waiting_for_siblings(self):
+        self.delays["urn:mavedb:00000001-b"] = 0.3
+        self.delays["urn:mavedb:00000001-a-1"] = 0.3
+        start = asyncio.get_running_loop().time()
+        await self.client.fetch_tree("urn:mavedb:00000001")
+        self.assertLess(asyncio.get_running_loop().time() - start, 0.5)
+
+    async def test_limits_concurrency(self):
+        for urn in self.records:
+            self.delays[urn] = 0.02
+        await self.client.fetch_tree("urn:mavedb:00000001", concurrency=1)
+        self.assertEqual(self.max_in_flight, 1)
+
+    async def test_reports_failures(self):
+        del self.records["urn:mavedb:00000001-a"]
+        index = await self.client.fetch_tree("urn:mavedb:00000001")
+        self.assertEqual(index["urn:mavedb:00000001-a"].error.status, 404)
+        self.assertNotIn("urn:mavedb:00000001-a-1", index)
+
+
+class TestClientApiVersion(ClientTestCase):
+    async def test_uses_pooled_session(self):
+        self.assertEqual(await self.client.api_version(), "2024.1.0")
+        await self.client.get_dataset("urn:mavedb:00000099-a-1")
+        self.assertEqual(len({peer for _, peer in self.requests}), 1)
+
+    async def test_caches_version(self):
+        await self.client.api_version()
+        self.assertEqual(await self.client.api_version(), "2024.1.0")
+        self.assertEqual(len(self.requests), 1)
+        await self.client.api_version(refresh=True)
+        self.assertEqual(len(self.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
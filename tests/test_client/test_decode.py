@@ -0,0 +1,85 @@
+import json
+import unittest
+from unittest import mock
+
+from mavetools.client.client import Submission
+from mavetools.client.decode import DecamelizedDict, decamelize, default_json_decoder
+from tests.test_client import ClientTestCase
+
+RECORD = {
+    "urn": "urn:mavedb:00000001-a",
+    "experimentSetUrn": "urn:mavedb:00000001",
+    "scoreSetUrns": ["urn:mavedb:00000001-a-1"],
+    "keywords": [{"keywordText": "k"}],
+    "targetGene": {"targetSequence": {"sequenceType": "dna"}},
+}
+
+DECAMELIZED = {
+    "urn": "urn:mavedb:00000001-a",
+    "experiment_set_urn": "urn:mavedb:00000001",
+    "score_set_urns": ["urn:mavedb:00000001-a-1"],
+    "keywords": [{"keyword_text": "k"}],
+    "target_gene": {"target_sequence": {"sequence_type": "dna"}},
+}
+
+
+class TestDecode(unittest.TestCase):
+    def test_default_decoder_decodes_bytes(self):
+        self.assertEqual(default_json_decoder()(json.dumps(RECORD).encode("utf-8")), RECORD)
+
+    def test_default_decoder_falls_back_to_json(self):
+        with mock.patch.dict("sys.modules", {"orjson": None, "msgspec": None, "msgspec.json": None}):
+            self.assertIs(default_json_decoder(), json.loads)
+
+    def test_decamelize_modes(self):
+        self.assertEqual(decamelize(RECORD, "eager"), DECAMELIZED)
+        self.assertIs(decamelize(RECORD, "none"), RECORD)
+        with self.assertRaises(ValueError):
+            decamelize(RECORD, "camel")
+
+    def test_lazy_decamelize(self):
+        lazy = decamelize(RECORD, "lazy")
+        self.assertIsInstance(lazy, DecamelizedDict)
+        self.assertEqual(lazy["target_gene"]["target_sequence"]["sequence_type"], "dna")
+        self.assertEqual(lazy["keywords"][0]["keyword_text"], "k")
+        self.assertIs(lazy["target_gene"], lazy["target_gene"])
+        self.assertEqual(lazy, DECAMELIZED)
+        self.assertEqual(lazy.decamelized(), DECAMELIZED)
+        self.assertNotIn("experimentSetUrn", lazy)
+        self.assertEqual(len(lazy), len(RECORD))
+
+
+class TestClientDecode(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client.auth_token = "secret"
+        patcher = mock.patch("mavetools.client.client.validate_dataset_with_create_model")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_uses_json_decoder(self):
+        self.records["urn:mavedb:00000001-a-1"] = {"urn": "urn:mavedb:00000001-a-1"}
+        decoder = mock.Mock(side_effect=json.loads)
+        self.client.json_decoder = decoder
+        await self.client.get_dataset("urn:mavedb:00000001-a-1")
+        decoder.assert_called_once()
+        self.assertIsInstance(decoder.call_args.args[0], bytes)
+
+    async def test_decamelize_modes(self):
+        for mode, cls in (("eager", dict), ("lazy", DecamelizedDict), ("none", dict)):
+            with self.subTest(mode=mode):
+                self.client.decamelize = mode
+                results = await self.client.create_datasets(
+                    [Submission("e1", {"title": "e1"}), Submission("e2", {"title": "e2"}, parent="e1")]
+                )
+                self.assertTrue(all(result.ok for result in results))
+                self.assertIsInstance(results[0].dataset, cls)
+                self.assertEqual(results[1].dataset["experiment_set_urn"], results[0].dataset["experiment_set_urn"])
+
+    async def test_rejects_unknown_modes(self):
+        with self.assertRaises(ValueError):
+            self.make_client(decamelize="camel")
+
+
+if __name__ == "__main__":
+    unittest.main()
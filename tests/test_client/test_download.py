@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from aiohttp import ClientResponseError
+
+from tests.test_client import ClientTestCase
+
+URN = "urn:mavedb:00000001-a-1"
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestClientDownload(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.scores = pd.DataFrame(
+            {
+                "accession": [f"{URN}#{i}" for i in range(1, 101)],
+                "hgvs_nt": [np.nan] * 100,
+                "hgvs_pro": [f"p.Ala{i}Val" for i in range(1, 101)],
+                "score": [i / 10 for i in range(100)],
+            }
+        )
+        self.counts = pd.DataFrame({"accession": [f"{URN}#1"], "hgvs_pro": ["p.Ala1Val"], "count": [3]})
+        self.tables[(URN, "scores")] = self.scores.to_csv(index=False)
+        self.tables[(URN, "counts")] = self.counts.to_csv(index=False)
+
+    async def test_iter_scores_yields_batches(self):
+        batches = [batch async for batch in self.client.iter_scores(URN, batch_size=30)]
+        self.assertEqual([len(batch) for batch in batches], [30, 30, 30, 10])
+        pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), self.scores, check_dtype=False)
+
+    async def test_get_scores(self):
+        df = await self.client.get_scores(URN)
+        pd.testing.assert_frame_equal(df, self.scores, check_dtype=False)
+        self.assertEqual(df["hgvs_pro"].dtype, object)
+
+    async def test_get_counts(self):
+        pd.testing.assert_frame_equal(await self.client.get_counts(URN), self.counts)
+
+    async def test_empty_table(self):
+        self.tables[(URN, "counts")] = ""
+        self.assertTrue((await self.client.get_counts(URN)).empty)
+
+    async def test_missing_table(self):
+        with self.assertRaises(ClientResponseError):
+            await self.client.get_scores("urn:mavedb:00000002-a-1")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    async def test_get_scores_as_arrow(self):
+        table = await self.client.get_scores(URN, arrow=True)
+        self.assertEqual(table.num_rows, 100)
+        self.assertEqual(table.schema.field("hgvs_nt").type, pyarrow.string())
+        self.assertEqual(table.schema.field("score").type, pyarrow.float64())
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    async def test_write_parquet(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.parquet")
+            self.assertEqual(await self.client.write_parquet(URN, path, batch_size=30), 100)
+            df = pd.read_parquet(path)
+        self.assertTrue(df["hgvs_nt"].isna().all())
+        pd.testing.assert_frame_equal(df.drop(columns="hgvs_nt"), self.scores.drop(columns="hgvs_nt"))
+
+    @unittest.skipIf(pyarrow is not None, "pyarrow is installed")
+    async def test_arrow_requires_pyarrow(self):
+        with self.assertRaises(ImportError):
+            await self.client.get_scores(URN, arrow=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
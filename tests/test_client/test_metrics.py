@@ -0,0 +1,81 @@
+import unittest
+
+import pandas as pd
+
+from mavetools.client.metrics import ClientMetrics, Histogram, endpoint_path
+from mavetools.client.retry import RetryPolicy
+from tests.test_client import ClientTestCase
+
+URN = "urn:mavedb:00000001-a-1"
+ENDPOINT = "/api/v1/score-sets/{urn}/"
+
+
+class TestHistogram(unittest.TestCase):
+    def test_quantiles(self):
+        histogram = Histogram((0.1, 1.0, 10.0))
+        self.assertIsNone(histogram.quantile(0.5))
+        for value in (0.05, 0.05, 0.5, 20.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 0, 1])
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.75), 1.0)
+        self.assertEqual(histogram.quantile(1.0), 20.0)
+        self.assertAlmostEqual(histogram.mean, 20.6 / 4)
+
+    def test_endpoint_path(self):
+        self.assertEqual(endpoint_path(f"/api/v1/score-sets/{URN}/scores?x=1"), "/api/v1/score-sets/{urn}/scores")
+        self.assertEqual(endpoint_path("/api/v1/experiments/"), "/api/v1/experiments/")
+
+
+class TestClientMetrics(ClientTestCase):
+    client_options = {"memory_cache_size": 0, "retry": RetryPolicy(max_attempts=3, backoff=0)}
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.records[URN] = {"urn": URN}
+        self.measurements = []
+        self.metrics = ClientMetrics(callback=self.measurements.append)
+        await self.client.close()
+        self.client = self.make_client(metrics=self.metrics, **self.client_options)
+
+    async def test_records_requests(self):
+        await self.client.get_dataset(URN)
+        await self.client.get_dataset(URN)
+        first, second = self.measurements
+        self.assertEqual((first.method, first.endpoint, first.status, first.retries), ("GET", ENDPOINT, 200, 0))
+        self.assertIsNotNone(first.connect_tls)
+        self.assertFalse(first.reused_connection)
+        self.assertTrue(second.reused_connection)
+        self.assertIsNone(second.connect_tls)
+        self.assertGreater(first.response_bytes, 0)
+        self.assertLessEqual(first.ttfb, first.total)
+        self.assertEqual(self.metrics.histogram("total", ENDPOINT).count, 2)
+        self.assertEqual(self.metrics.statuses[ENDPOINT, 200], 2)
+        self.assertEqual(self.metrics.summary()[ENDPOINT]["count"], 2)
+
+    async def test_records_retries_and_errors(self):
+        self.failures[f"/api/v1/score-sets/{URN}/"] = [(503, {})] * 3
+        await self.client.get_dataset(URN)
+        (measurement,) = self.measurements
+        self.assertEqual((measurement.status, measurement.retries), (503, 2))
+        self.assertEqual(measurement.error, "ClientResponseError")
+        self.assertEqual(self.metrics.retries[ENDPOINT], 2)
+
+    async def test_records_request_bytes(self):
+        self.client.auth_token = "secret"
+        scores = pd.DataFrame({"hgvs_pro": ["p.Ala1Val"], "score": [0.5]})
+        await self.client.upload_dataframes({"urn": URN}, scores)
+        (measurement,) = self.measurements
+        self.assertEqual(measurement.endpoint, "/api/v1/score-sets/{urn}/variants/data/")
+        self.assertGreater(measurement.request_bytes, len(scores.to_csv(index=False)))
+
+    async def test_clients_without_metrics_are_not_traced(self):
+        await self.client.close()
+        self.client = self.make_client(**self.client_options)
+        await self.client.get_dataset(URN)
+        self.assertEqual(self.measurements, [])
+        self.assertIsNone(self.client.metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
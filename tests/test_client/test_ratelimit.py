@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from mavetools.client.ratelimit import FileRateLimiter, RateLimiter, SharedRateLimiter
+from mavetools.client.retry import RetryPolicy
+from tests.test_client import ClientTestCase
+
+URN = "urn:mavedb:00000001-a-1"
+
+
+def reserve_in_child(limiter, count):
+    for _ in range(count):
+        limiter.reserve()
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def limiter(self, cls=RateLimiter, *args, **kwargs):
+        limiter = cls(*args, **kwargs)
+        limiter.clock = lambda: self.now
+        return limiter
+
+    def test_bursts_then_limits_rate(self):
+        limiter = self.limiter(rate=10, burst=3)
+        delays = [limiter.reserve() for _ in range(5)]
+        for delay, expected in zip(delays, [0, 0, 0, 0.1, 0.2]):
+            self.assertAlmostEqual(delay, expected)
+        self.now += 1
+        self.assertEqual([limiter.reserve() for _ in range(3)], [0, 0, 0])
+
+    def test_defer(self):
+        limiter = self.limiter(rate=10, burst=3)
+        limiter.defer(2)
+        self.assertAlmostEqual(limiter.reserve(), 2)
+        self.assertAlmostEqual(limiter.reserve(), 2.1)
+
+    def test_invalid_arguments(self):
+        for rate, burst in ((0, 1), (1, 0)):
+            with self.subTest(rate=rate, burst=burst), self.assertRaises(ValueError):
+                RateLimiter(rate, burst)
+
+    def test_file_limiters_share_state(self):
+        path = os.path.join(self._directory.name, "limit")
+        second = pickle.loads(pickle.dumps(FileRateLimiter(path, rate=10, burst=2)))
+        second.clock = lambda: self.now
+        first = self.limiter(FileRateLimiter, path, rate=10, burst=2)
+        self.assertEqual([first.reserve(), second.reserve()], [0, 0])
+        self.assertAlmostEqual(first.reserve(), 0.1)
+        self.assertAlmostEqual(second.reserve(), 0.2)
+
+    def test_shared_limiter_is_shared_with_child_processes(self):
+        context = multiprocessing.get_context("spawn")
+        limiter = SharedRateLimiter(rate=1, burst=1, context=context)
+        process = context.Process(target=reserve_in_child, args=(limiter, 100))
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        # the child reserved the next 100 seconds, minus the time it took to exit
+        self.assertGreater(limiter.reserve(), 50)
+
+
+class TestClientRateLimit(ClientTestCase):
+    client_options = {"memory_cache_size": 0, "retry": RetryPolicy(max_attempts=2, backoff=0)}
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.urns = [f"urn:mavedb:00000001-a-{i}" for i in range(1, 7)]
+        for urn in [URN] + self.urns:
+            self.records[urn] = {"urn": urn}
+
+    async def test_limits_requests(self):
+        self.client.rate_limiter = RateLimiter(rate=50, burst=1)
+        started = time.monotonic()
+        await asyncio.gather(*(self.client.get_dataset(urn) for urn in self.urns))
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertEqual(len(self.requests), 6)
+
+    async def test_too_many_requests_defers_the_limiter(self):
+        self.client.rate_limiter = mock.Mock(acquire=mock.AsyncMock())
+        self.failures[f"/api/v1/score-sets/{URN}/"] = [(429, {"Retry-After": "0"})] * 2
+        await self.client.get_dataset(URN)
+        self.assertEqual(self.client.rate_limiter.acquire.await_count, 2)
+        self.client.rate_limiter.defer.assert_not_called()
+
+        self.failures[f"/api/v1/score-sets/{URN}/"] = [(429, {"Retry-After": "1"})]
+        with mock.patch("random.uniform", return_value=0):
+            await self.client.get_dataset(URN)
+        self.client.rate_limiter.defer.assert_called_once_with(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
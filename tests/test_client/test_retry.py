@@ -0,0 +1,223 @@
+import asyncio
+import email.utils
+import time
+import unittest
+from unittest import mock
+
+import aiohttp
+from aiohttp import ClientResponseError
+
+from mavetools.client.retry import HedgePolicy, RetryPolicy, parse_retry_after
+from tests.test_client import ClientTestCase
+
+URN = "urn:mavedb:00000001-a-1"
+PATH = "/api/v1/score-sets/urn:mavedb:00000001-a-1/"
+
+
+def response_error(status, headers=None):
+    return ClientResponseError(None, (), status=status, headers=headers)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, backoff=1, max_backoff=3)
+
+    def test_retries_idempotent_requests_after_transient_errors(self):
+        self.assertTrue(self.policy.is_retryable("GET", response_error(503)))
+        self.assertTrue(self.policy.is_retryable("GET", aiohttp.ServerDisconnectedError()))
+        self.assertTrue(self.policy.is_retryable("GET", asyncio.TimeoutError()))
+        self.assertFalse(self.policy.is_retryable("GET", response_error(404)))
+
+    def test_retries_posts_only_if_not_sent(self):
+        connection_error = aiohttp.ClientConnectorError(mock.Mock(), OSError("refused"))
+        self.assertTrue(self.policy.is_retryable("POST", connection_error))
+        self.assertFalse(self.policy.is_retryable("POST", response_error(503)))
+        self.assertFalse(self.policy.is_retryable("POST", aiohttp.ServerDisconnectedError()))
+
+    def test_idempotent_override(self):
+        self.assertTrue(self.policy.is_retryable("POST", response_error(503), idempotent=True))
+        self.assertFalse(self.policy.is_retryable("GET", response_error(503), idempotent=False))
+
+    def test_backoff(self):
+        with mock.patch("random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual(self.policy.retry_delay("GET", response_error(503), 0), 1)
+            self.assertEqual(self.policy.retry_delay("GET", response_error(503), 1), 2)
+            self.policy.max_attempts = 10
+            self.assertEqual(self.policy.retry_delay("GET", response_error(503), 5), 3)
+
+    def test_stops_after_max_attempts(self):
+        self.assertIsNone(self.policy.retry_delay("GET", response_error(503), 2))
+
+    def test_honors_retry_after(self):
+        delay = self.policy.retry_delay("GET", response_error(429, {"Retry-After": "7"}), 0)
+        self.assertEqual(delay, 7)
+
+    def test_does_not_retry_after_long_retry_after(self):
+        self.policy.max_retry_after = 10
+        self.assertEqual(self.policy.retry_delay("GET", response_error(503, {"Retry-After": "10"}), 0), 10)
+        self.assertIsNone(self.policy.retry_delay("GET", response_error(503, {"Retry-After": "11"}), 0))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("5"), 5)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after("inf"))
+        self.assertIsNone(parse_retry_after("nan"))
+        retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(retry_at), 30, delta=2)
+
+
+class TestHedgePolicy(unittest.TestCase):
+    def test_delay_is_percentile_of_recent_latencies(self):
+        policy = HedgePolicy(percentile=0.9, min_samples=10, window=20)
+        for latency in range(1, 10):
+            policy.observe(latency)
+        self.assertIsNone(policy.delay())
+        policy.observe(10)
+        self.assertEqual(policy.delay(), 9)
+        for _ in range(20):
+            policy.observe(1)
+        self.assertEqual(policy.delay(), 1)
+
+    def test_min_delay(self):
+        policy = HedgePolicy(min_samples=1, min_delay=0.5)
+        policy.observe(0.1)
+        self.assertEqual(policy.delay(), 0.5)
+
+    def test_caps_extra_requests(self):
+        policy = HedgePolicy(max_extra=0.1)
+        allowed = []
+        for _ in range(100):
+            policy.start()
+            allowed.append(policy.allow_hedge())
+        self.assertEqual(sum(allowed), 10)
+        self.assertEqual(policy.hedged, 10)
+        self.assertFalse(allowed[0])
+
+    def test_invalid_arguments(self):
+        for kwargs in ({"percentile": 1}, {"percentile": 0}, {"max_extra": -1}):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                HedgePolicy(**kwargs)
+
+
+class TestClientHedge(ClientTestCase):
+    client_options = {"memory_cache_size": 0}
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.records[URN] = {"urn": URN}
+        self.hedge = HedgePolicy(percentile=0.5, max_extra=1, min_samples=5)
+        for _ in range(5):
+            self.hedge.observe(0.01)
+        self.client.hedge = self.hedge
+
+    async def slow_first_request(self, delay):
+        """Start a request for URN that is answered after `delay` seconds, while later requests are answered at once."""
+        self.delays[URN] = delay
+        task = asyncio.ensure_future(self.client.fetch_dataset(URN))
+        while not self.requests:
+            await asyncio.sleep(0.001)
+        self.delays[URN] = 0
+        return task
+
+    async def test_hedges_slow_requests(self):
+        started = time.monotonic()
+        task = await self.slow_first_request(1)
+        self.assertEqual(await task, {"urn": URN})
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.hedge.hedged, 1)
+        self.assertEqual(self.hedge.requests, 1)
+
+    async def test_caps_extra_requests(self):
+        self.hedge.max_extra = 0
+        task = await self.slow_first_request(0.2)
+        self.assertEqual(await task, {"urn": URN})
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.hedge.hedged, 0)
+
+    async def test_does_not_hedge_before_min_samples(self):
+        self.client.hedge = self.hedge = HedgePolicy(max_extra=1, min_samples=5)
+        task = await self.slow_first_request(0.2)
+        self.assertEqual(await task, {"urn": URN})
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(len(self.hedge._latencies), 1)
+
+    async def test_raises_error_if_both_requests_fail(self):
+        del self.records[URN]
+        task = await self.slow_first_request(0.2)
+        with self.assertRaises(aiohttp.ClientResponseError) as cm:
+            await task
+        self.assertEqual(cm.exception.status, 404)
+        self.assertEqual(len(self.requests), 2)
+
+
+class TestClientRetry(ClientTestCase):
+    client_options = {"memory_cache_size": 0, "retry": RetryPolicy(max_attempts=3, backoff=0)}
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.records[URN] = {"urn": URN}
+
+    async def test_retries_transient_errors(self):
+        self.failures[PATH] = [(503, {}), (429, {"Retry-After": "0"})]
+        results = await self.client.get_datasets([URN])
+        self.assertEqual(results[0].dataset, {"urn": URN})
+        self.assertEqual(results[0].retries, 2)
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_reports_retries_of_failed_requests(self):
+        self.failures[PATH] = [(503, {})] * 3
+        results = await self.client.get_datasets([URN])
+        self.assertEqual(results[0].error.status, 503)
+        self.assertEqual(results[0].retries, 2)
+
+    async def test_does_not_retry_client_errors(self):
+        results = await self.client.get_datasets(["urn:mavedb:00000002-a-1"])
+        self.assertEqual(results[0].error.status, 404)
+        self.assertEqual(results[0].retries, 0)
+
+    async def test_deadline(self):
+        self.delays[URN] = 1
+        results = await self.client.get_datasets([URN], deadline=0.05)
+        self.assertIsInstance(results[0].error, asyncio.TimeoutError)
+
+    async def test_does_not_wait_for_infinite_retry_after(self):
+        self.failures[PATH] = [(503, {"Retry-After": "inf"})] * 3
+        results = await asyncio.wait_for(self.client.get_datasets([URN]), 5)
+        self.assertEqual(results[0].error.status, 503)
+        self.assertEqual(results[0].retries, 2)
+
+    async def test_does_not_wait_for_long_retry_after(self):
+        self.failures[PATH] = [(429, {"Retry-After": "86400"})]
+        results = await asyncio.wait_for(self.client.get_datasets([URN]), 5)
+        self.assertEqual(results[0].error.status, 429)
+        self.assertEqual(results[0].retries, 0)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_does_not_wait_for_retry_after_past_deadline(self):
+        self.failures[PATH] = [(503, {"Retry-After": "30"})]
+        results = await asyncio.wait_for(self.client.get_datasets([URN], deadline=10), 5)
+        self.assertEqual(results[0].error.status, 503)
+        self.assertEqual(results[0].retries, 0)
+
+    async def test_does_not_retry_posts_after_sending(self):
+        self.failures["/api/v1/experiments/"] = [(503, {})]
+        self.client.auth_token = "secret"
+        with mock.patch("mavetools.client.client.validate_dataset_with_create_model"):
+            self.assertIsNone(await self.client.create_dataset({"title": "a"}))
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_retries_connection_errors(self):
+        client = self.make_client(**self.client_options)
+        await self.server.close()
+        try:
+            results = await client.get_datasets([URN])
+        finally:
+            await client.session.close()
+        self.assertIsInstance(results[0].error, aiohttp.ClientConnectorError)
+        self.assertEqual(results[0].retries, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+import aiohttp
+
+from mavetools.client.client import Client, DatasetResult
+from mavetools.client.retry import RetryPolicy
+from mavetools.client.testing import StandInServer
+
+SEARCH = ("POST", "/api/v1/score-sets/search")
+
+
+class TestClientSearch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = StandInServer(search_results=25, seed=0)
+        await self.server.start()
+        self.client = Client(base_url=self.server.url, retry=RetryPolicy(backoff=0))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_iterates_over_pages(self):
+        results = [result async for result in self.client.search_score_sets("brca1", page_size=10, targets=["x"])]
+        self.assertEqual([r["urn"] for r in results], [f"urn:mavedb:{i:08}-a-1" for i in range(1, 26)])
+        self.assertEqual([q["offset"] for q in self.server.searches], [0, 10, 20])
+        self.assertEqual(self.server.searches[0], {"text": "brca1", "targets": ["x"], "limit": 10, "offset": 0})
+
+    async def test_prefetches_the_next_page(self):
+        results = self.client.search_experiments(page_size=10)
+        first = await results.__anext__()
+        self.assertEqual(first["urn"], "urn:mavedb:00000001-a")
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server.requests[("POST", "/api/v1/experiments/search")], 2)
+        await results.aclose()
+
+    async def test_servers_without_pagination(self):
+        self.server.paginate = False
+        self.server.search_results = 10
+        for page_size in (4, 10):
+            with self.subTest(page_size=page_size):
+                self.server.searches.clear()
+                results = [r async for r in self.client.search_score_sets(page_size=page_size)]
+                self.assertEqual(len(results), 10)
+                self.assertEqual(len(self.server.searches), 1 if page_size == 4 else 2)
+
+    async def test_fans_out_to_full_datasets(self):
+        results = [r async for r in self.client.search_score_sets(page_size=10, full=True, concurrency=4)]
+        self.assertEqual(len(results), 25)
+        self.assertTrue(all(isinstance(r, DatasetResult) and r.ok for r in results))
+        self.assertIn("abstractText", results[0].dataset)
+        self.assertEqual(self.server.requests[("GET", "/api/v1/score-sets/{urn}/")], 25)
+
+    async def test_retries_searches(self):
+        self.server.error_rate = 1
+        with self.assertRaises(aiohttp.ClientResponseError) as context:
+            [r async for r in self.client.search_score_sets()]
+        self.assertEqual(context.exception.retries, self.client.retry.max_attempts - 1)
+
+    async def test_invalid_page_size(self):
+        with self.assertRaises(ValueError):
+            self.client.search_score_sets(page_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from mavetools.client.client import Submission
+from tests.test_client import ClientTestCase
+
+
+def experiment(title):
+    return {"title": title}
+
+
+def score_set(title):
+    return {"title": title, "target_genes": []}
+
+
+class TestClientCreateDatasets(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client.auth_token = "secret"
+        self.scores = pd.DataFrame({"hgvs_pro": ["p.Ala1Val"], "score": [0.5]})
+        patcher = mock.patch("mavetools.client.client.validate_dataset_with_create_model")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_fills_in_parent_urns(self):
+        results = await self.client.create_datasets(
+            [
+                Submission("s1", score_set("s1"), parent="e1", scores_df=self.scores),
+                Submission("e1", experiment("e1")),
+                Submission("e2", experiment("e2"), parent="e1"),
+            ]
+        )
+        self.assertEqual([r.key for r in results], ["s1", "e1", "e2"])
+        self.assertTrue(all(r.ok for r in results))
+        s1, e1, e2 = results
+        self.assertEqual(s1.dataset["experiment_urn"], e1.urn)
+        self.assertEqual(e2.dataset["experiment_set_urn"], e1.dataset["experiment_set_urn"])
+        self.assertTrue(s1.uploaded)
+        self.assertEqual(self.uploads[s1.urn]["scores_file"][1], self.scores.to_csv(index=False))
+
+    async def test_skips_descendants_of_failed_submissions(self):
+        self.failures["/api/v1/experiments/"] = [(400, {})]
+        results = await self.client.create_datasets(
+            [
+                Submission("e1", experiment("e1")),
+                Submission("s1", score_set("s1"), parent="e1", scores_df=self.scores),
+            ]
+        )
+        self.assertEqual(results[0].error.status, 400)
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertIsNone(results[1].urn)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_reports_failed_uploads(self):
+        self.failures["/api/v1/score-sets/tmp:00000002/variants/data/"] = [(400, {})]
+        results = await self.client.create_datasets(
+            [
+                Submission("e1", experiment("e1")),
+                Submission("s1", score_set("s1"), parent="e1", scores_df=self.scores),
+            ]
+        )
+        self.assertEqual(results[1].urn, "tmp:00000002")
+        self.assertEqual(results[1].error.status, 400)
+        self.assertFalse(results[1].uploaded)
+
+    async def test_requires_scores_for_score_sets(self):
+        results = await self.client.create_datasets([Submission("s1", score_set("s1"))])
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertEqual(self.requests, [])
+
+    async def test_rejects_invalid_graphs(self):
+        for submissions in (
+            [Submission("e1", experiment("e1")), Submission("e1", experiment("e2"))],
+            [Submission("e1", experiment("e1"), parent="e0")],
+            [Submission("e1", experiment("e1"), parent="e2"), Submission("e2", experiment("e2"), parent="e1")],
+        ):
+            with self.subTest(submissions=submissions), self.assertRaises(ValueError):
+                await self.client.create_datasets(submissions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mavetools.client.sync import SyncClient, background_loop
+
+URN = "urn:mavedb:00000001-a-1"
+
+
+class TestSyncClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.requests = []
+
+        async def get_record(request):
+            cls.requests.append(request.transport.get_extra_info("peername"))
+            return web.json_response({"urn": request.match_info["urn"]})
+
+        async def start_server():
+            app = web.Application()
+            app.router.add_get("/api/v1/{endpoint}/{urn}/", get_record)
+            server = TestServer(app)
+            await server.start_server()
+            return server
+
+        # the server runs on its own loop in a separate thread, like a remote server
+        cls.server_loop = asyncio.new_event_loop()
+        cls.server_thread = threading.Thread(target=cls.server_loop.run_forever, daemon=True)
+        cls.server_thread.start()
+        cls.server = asyncio.run_coroutine_threadsafe(start_server(), cls.server_loop).result()
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.server.close(), cls.server_loop).result()
+        cls.server_loop.call_soon_threadsafe(cls.server_loop.stop)
+        cls.server_thread.join()
+        cls.server_loop.close()
+
+    def setUp(self):
+        self.requests.clear()
+        self.client = SyncClient(base_url=str(self.server.make_url("/api/v1/")), memory_cache_size=0)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_reuses_session_across_calls(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get_dataset(URN), {"urn": URN})
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(len(set(self.requests)), 1)
+
+    def test_iter_datasets(self):
+        urns = ["urn:mavedb:{:08}-a-1".format(i) for i in range(1, 5)]
+        self.assertEqual([r.dataset for r in self.client.iter_datasets(urns)], [{"urn": urn} for urn in urns])
+
+    def test_clients_share_background_loop(self):
+        other = SyncClient(base_url=str(self.server.make_url("/api/v1/")))
+        try:
+            self.assertIs(other._loop, self.client._loop)
+            self.assertIs(self.client._loop, background_loop())
+        finally:
+            other.close()
+
+    def test_context_manager_closes_client(self):
+        with SyncClient(base_url=str(self.server.make_url("/api/v1/"))) as client:
+            client.get_dataset(URN)
+        self.assertTrue(client.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+
+import aiohttp
+import pandas as pd
+
+from mavetools.client.client import Client, Submission
+from mavetools.client.retry import RetryPolicy
+from mavetools.client.testing import StandInServer
+
+
+class TestStandInServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = StandInServer(payload_size=16, children=2, seed=0)
+        await self.server.start()
+        self.client = Client(base_url=self.server.url, auth_token="secret", retry=RetryPolicy(backoff=0))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_serves_generated_records(self):
+        self.assertEqual(await self.client.api_version(), "2024.1.0")
+        score_set = await self.client.fetch_dataset("urn:mavedb:00000001-a-1")
+        self.assertEqual(score_set["experiment"]["urn"], "urn:mavedb:00000001-a")
+        self.assertEqual(len(score_set["abstractText"]), 16)
+        tree = await self.client.fetch_tree("urn:mavedb:00000001")
+        self.assertEqual(len(tree), 7)
+        self.assertTrue(all(result.ok for result in tree.values()))
+        self.assertEqual(self.server.requests["GET", "/api/v1/experiments/{urn}/"], 2)
+
+    async def test_rejects_urns_of_other_endpoints(self):
+        result = (await self.client.get_datasets(["urn:mavedb:00000001-a"], record_type="score_set"))[0]
+        self.assertEqual(result.error.status, 404)
+
+    async def test_creates_datasets_and_reads_uploads(self):
+        scores = pd.DataFrame({"hgvs_pro": ["p.Ala1Val", "p.Ala2Val"], "score": [0.1, 0.2]})
+        with mock.patch("mavetools.client.client.validate_dataset_with_create_model"):
+            results = await self.client.create_datasets(
+                [
+                    Submission("e1", {"title": "e1"}),
+                    Submission("s1", {"title": "s1", "target_genes": []}, parent="e1", scores_df=scores),
+                ]
+            )
+        self.assertTrue(all(result.ok and result.urn.startswith("tmp:") for result in results))
+        self.assertEqual(self.server.records[results[1].urn]["experiment_urn"], results[0].urn)
+        self.assertEqual(self.server.uploaded_bytes, len(scores.to_csv(index=False)))
+
+    async def test_serves_score_and_count_tables(self):
+        self.server.table_rows = 2500
+        scores = await self.client.get_scores("urn:mavedb:00000001-a-1")
+        self.assertEqual(list(scores.columns), ["accession", "hgvs_nt", "hgvs_pro", "score"])
+        self.assertEqual(len(scores), 2500)
+        self.assertEqual(scores["hgvs_pro"].iloc[-1], "p.Ala2500Val")
+        batches = [batch async for batch in self.client.iter_counts("urn:mavedb:00000001-a-1", batch_size=1000)]
+        self.assertEqual([len(batch) for batch in batches], [1000, 1000, 500])
+        self.assertEqual(batches[0].columns[-1], "count")
+        self.assertEqual(self.server.requests["GET", "/api/v1/score-sets/{urn}/scores"], 1)
+        with self.assertRaises(aiohttp.ClientResponseError):
+            await self.client.get_scores("urn:mavedb:00000001-a")
+
+    async def test_injects_errors(self):
+        self.server.error_rate = 1
+        result = (await self.client.get_datasets(["urn:mavedb:00000001-a-1"]))[0]
+        self.assertEqual(result.error.status, 503)
+        self.assertEqual(result.retries, self.client.retry.max_attempts - 1)
+
+    def test_invalid_error_rate(self):
+        with self.assertRaises(ValueError):
+            StandInServer(error_rate=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
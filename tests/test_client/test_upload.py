@@ -0,0 +1,187 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from mavetools.client.client import Submission
+from mavetools.client.upload import (
+    UploadLedger,
+    content_hash,
+    iter_csv_chunks,
+    score_set_key,
+)
+from tests.test_client import ClientTestCase
+
+URN = "urn:mavedb:00000001-a-1"
+
+
+class TestIterCsvChunks(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({"hgvs_pro": [f"p.Ala{i}Val" for i in range(1, 11)], "score": range(10)})
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_converts_dataframes_in_batches(self):
+        chunks = list(iter_csv_chunks(self.df, batch_size=4))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b"".join(chunks).decode("utf-8"), self.df.to_csv(index=False))
+
+    def test_empty_dataframe_has_header(self):
+        self.assertEqual(b"".join(iter_csv_chunks(self.df.iloc[:0])), b"hgvs_pro,score\n")
+
+    def test_reads_csv_files(self):
+        path = os.path.join(self._directory.name, "scores.csv")
+        self.df.to_csv(path, index=False)
+        self.assertEqual(b"".join(iter_csv_chunks(path)).decode("utf-8"), self.df.to_csv(index=False))
+
+    def test_reads_parquet_files(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        path = os.path.join(self._directory.name, "scores.parquet")
+        self.df.to_parquet(path, index=False)
+        chunks = list(iter_csv_chunks(path, batch_size=4))
+        self.assertEqual(b"".join(chunks).decode("utf-8"), self.df.to_csv(index=False))
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            list(iter_csv_chunks(self.df, batch_size=0))
+
+
+class TestClientUpload(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client.auth_token = "secret"
+        self.scores = pd.DataFrame({"hgvs_pro": ["p.Ala1Val", "p.Ala2Val", "p.Ala3Val"], "score": [0.1, 0.2, 0.3]})
+        self.counts = pd.DataFrame({"hgvs_pro": ["p.Ala1Val", "p.Ala2Val", "p.Ala3Val"], "count": [1, 2, 3]})
+
+    async def test_uploads_dataframes(self):
+        await self.client.upload_dataframes({"urn": URN}, self.scores, self.counts, batch_size=2)
+        self.assertEqual(self.uploads[URN]["scores_file"][1], self.scores.to_csv(index=False))
+        self.assertEqual(self.uploads[URN]["counts_file"][1], self.counts.to_csv(index=False))
+        self.assertEqual(self.uploads[URN]["scores_file"][0], "scores_file.csv")
+        self.assertEqual(self.upload_encodings, [None])
+
+    async def test_uploads_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.csv")
+            self.scores.to_csv(path, index=False)
+            await self.client.upload_dataframes({"urn": URN}, path)
+        self.assertEqual(self.uploads[URN], {"scores_file": ("scores_file.csv", self.scores.to_csv(index=False))})
+
+    async def test_compresses_uploads(self):
+        await self.client.upload_dataframes({"urn": URN}, self.scores, compress=True)
+        self.assertEqual(self.uploads[URN]["scores_file"][1], self.scores.to_csv(index=False))
+        self.assertEqual(self.upload_encodings, ["gzip"])
+
+
+class TestUploadLedger(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, "ledger", "uploads.jsonl")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_records_persist(self):
+        ledger = UploadLedger(self.path)
+        self.assertIsNone(ledger.get(URN))
+        ledger.put(URN, {"scores_file": "a"})
+        ledger.put(URN, {"scores_file": "b", "counts_file": "c"})
+        self.assertEqual(UploadLedger(self.path).get(URN), {"scores_file": "b", "counts_file": "c"})
+        self.assertEqual(len(UploadLedger(self.path)), 1)
+
+    def test_created_score_sets_persist(self):
+        key = score_set_key({"title": "s1", "experiment_urn": "urn:mavedb:00000001-a"}, {"scores_file": "a"})
+        self.assertNotEqual(key, score_set_key({"title": "s1", "experiment_urn": "urn:mavedb:00000002-a"}, {}))
+        ledger = UploadLedger(self.path)
+        self.assertIsNone(ledger.created(key))
+        ledger.put_created(key, URN)
+        self.assertEqual(UploadLedger(self.path).created(key), URN)
+        self.assertIsNone(UploadLedger(self.path).get(URN))
+
+    def test_skips_partial_lines(self):
+        UploadLedger(self.path).put(URN, {"scores_file": "a"})
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write('{"urn": "urn:mavedb:00000002-a-1", "fil')
+        ledger = UploadLedger(self.path)
+        self.assertEqual(len(ledger), 1)
+        ledger.put("urn:mavedb:00000003-a-1", {"scores_file": "b"})
+        self.assertEqual(UploadLedger(self.path).get("urn:mavedb:00000003-a-1"), {"scores_file": "b"})
+
+    def test_content_hash_does_not_depend_on_batch_size(self):
+        df = pd.DataFrame({"hgvs_pro": [f"p.Ala{i}Val" for i in range(1, 11)], "score": range(10)})
+        self.assertEqual(content_hash(df, batch_size=3), content_hash(df, batch_size=100))
+        self.assertNotEqual(content_hash(df), content_hash(df.iloc[1:]))
+
+
+class TestClientUploadLedger(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self.client.auth_token = "secret"
+        self.client.upload_ledger = UploadLedger(os.path.join(self._directory.name, "uploads.jsonl"))
+        self.scores = pd.DataFrame({"hgvs_pro": ["p.Ala1Val", "p.Ala2Val", "p.Ala3Val"], "score": [0.1, 0.2, 0.3]})
+        self.counts = pd.DataFrame({"hgvs_pro": ["p.Ala1Val", "p.Ala2Val", "p.Ala3Val"], "count": [1, 2, 3]})
+
+    async def test_skips_uploaded_data(self):
+        await self.client.upload_dataframes({"urn": URN}, self.scores, self.counts)
+        self.assertEqual(
+            self.client.upload_ledger.get(URN),
+            {"scores_file": content_hash(self.scores), "counts_file": content_hash(self.counts)},
+        )
+        await self.client.upload_dataframes({"urn": URN}, self.scores, self.counts, batch_size=1)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_uploads_changed_data(self):
+        await self.client.upload_dataframes({"urn": URN}, self.scores, self.counts)
+        for scores, counts in ((self.scores.assign(score=0.0), self.counts), (self.scores, None)):
+            await self.client.upload_dataframes({"urn": URN}, scores, counts)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(self.client.upload_ledger.get(URN), {"scores_file": content_hash(self.scores)})
+
+    async def test_retried_submissions_skip_created_score_sets_and_uploads(self):
+        submissions = [
+            Submission(key, {"title": key, "experiment_urn": "urn:mavedb:00000001-a", "target_genes": []}, None, scores)
+            for key, scores in (("s1", self.scores), ("s2", self.scores.assign(score=0.0)))
+        ]
+        self.failures["/api/v1/score-sets/tmp:00000002/variants/data/"] = [(400, {})]
+        with mock.patch("mavetools.client.client.validate_dataset_with_create_model"):
+            first = await self.client.create_datasets(submissions, concurrency=1)
+            self.assertEqual([r.ok for r in first], [True, False])
+            self.requests.clear()
+            retried = await self.client.create_datasets(submissions, concurrency=1)
+
+        self.assertTrue(all(r.ok for r in retried))
+        self.assertEqual([r.urn for r in retried], ["tmp:00000001", "tmp:00000002"])
+        self.assertEqual(len(self.created), 2)
+        self.assertEqual(
+            sorted(path for path, _ in self.requests if path.endswith("/variants/data/")),
+            ["/api/v1/score-sets/tmp:00000002/variants/data/"],
+        )
+        self.assertEqual(retried[0].dataset["title"], "s1")
+
+    async def test_changed_submissions_create_new_score_sets(self):
+        submission = Submission("s1", {"title": "s1", "experiment_urn": "urn:mavedb:00000001-a", "target_genes": []})
+        with mock.patch("mavetools.client.client.validate_dataset_with_create_model"):
+            await self.client.create_datasets([submission._replace(scores_df=self.scores)])
+            await self.client.create_datasets([submission._replace(scores_df=self.scores.assign(score=0.0))])
+            await self.client.create_datasets(
+                [submission._replace(dataset=dict(submission.dataset, title="s2"), scores_df=self.scores)]
+            )
+        self.assertEqual(len(self.created), 3)
+
+    async def test_failed_uploads_are_not_recorded(self):
+        self.failures[f"/api/v1/score-sets/{URN}/variants/data/"] = [(400, {})]
+        await self.client.upload_dataframes({"urn": URN}, self.scores)
+        self.assertIsNone(self.client.upload_ledger.get(URN))
+
+
+if __name__ == "__main__":
+    unittest.main()
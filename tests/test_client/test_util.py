@@ -0,0 +1,50 @@
+import unittest
+from unittest import mock
+
+from mavetools.client import util
+from mavetools.client.util import (
+    infer_record_type,
+    validate_dataset_with_create_model,
+    validate_datasets,
+)
+
+EXPERIMENT = {"title": "t", "short_description": "s", "abstract_text": "a", "method_text": "m"}
+
+
+class TestInferRecordType(unittest.TestCase):
+    def test_infers_record_types(self):
+        self.assertEqual(infer_record_type({"title": "t", "targetGenes": []}), "score_set")
+        self.assertEqual(infer_record_type({"title": "t", "target_genes": []}), "score_set")
+        self.assertEqual(infer_record_type({"title": "t"}), "experiment")
+        self.assertIsNone(infer_record_type({"urn": "urn:mavedb:00000001"}))
+
+    def test_does_not_walk_nested_values(self):
+        with mock.patch.object(util.humps, "decamelize", wraps=util.humps.decamelize) as decamelize:
+            infer_record_type({"title": "t", "targetGenes": [{"targetSequence": {"sequenceType": "dna"}}]})
+        self.assertEqual([c.args[0] for c in decamelize.call_args_list], ["title", "targetGenes"])
+
+
+class TestValidateDatasets(unittest.TestCase):
+    def test_validate_dataset_returns_record_type(self):
+        self.assertEqual(validate_dataset_with_create_model(EXPERIMENT), "experiment")
+
+    def test_uses_given_record_type(self):
+        with mock.patch.object(util, "infer_record_type") as infer:
+            validate_dataset_with_create_model(EXPERIMENT, "experiment")
+        infer.assert_not_called()
+
+    def test_reports_errors_as_values(self):
+        results = validate_datasets([EXPERIMENT, {"title": "t"}, {}])
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[1].record_type, "experiment")
+        self.assertIn("abstractText", results[1].error)
+        self.assertIsNone(results[2].record_type)
+        self.assertFalse(results[2].ok)
+
+    def test_parallel_matches_serial(self):
+        datasets = [EXPERIMENT, {"title": "t"}] * 4
+        self.assertEqual(validate_datasets(datasets, n_jobs=2), validate_datasets(datasets))
+
+
+if __name__ == "__main__":
+    unittest.main()
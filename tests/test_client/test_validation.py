@@ -0,0 +1,92 @@
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from mavetools.client.validation import (
+    validate_dataframe,
+    validate_dataframe_pair,
+    validate_hgvs_column,
+    validate_upload_sources,
+)
+from tests.test_client import ClientTestCase
+
+URN = "urn:mavedb:00000001-a-1"
+
+
+class TestValidateDataframe(unittest.TestCase):
+    def setUp(self):
+        self.scores = pd.DataFrame(
+            {
+                "hgvs_nt": ["c.1A>G", "c.2A>T", "c.[3A>G;4C>T]"],
+                "hgvs_pro": ["p.Met1Val", None, "p.Thr2Met"],
+                "score": [0.1, 0.2, 0.3],
+            }
+        )
+        self.counts = self.scores.drop(columns="score").assign(count=[1, 2, 3])
+
+    def test_valid_dataframes(self):
+        validate_dataframe_pair(self.scores, self.counts)
+        validate_dataframe_pair(self.scores.drop(columns="hgvs_pro"))
+
+    def test_invalid_hgvs(self):
+        for column, values in (
+            ("hgvs_nt", ["c.1A>G", "c.2A>T", "p.Met1Val"]),
+            ("hgvs_pro", ["p.Met1Val", "c.2A>T", None]),
+            ("hgvs_splice", ["c.1A>G", "invalid", None]),
+        ):
+            with self.subTest(column=column), self.assertRaisesRegex(ValueError, column):
+                validate_dataframe(self.scores.assign(**{column: values}), "scores")
+
+    def test_lists_a_limited_number_of_invalid_variants(self):
+        df = pd.DataFrame({"hgvs_pro": [f"Ala{i}Val" for i in range(1, 11)]})
+        with self.assertRaisesRegex(ValueError, r"found 10 invalid variants in 'hgvs_pro': Ala1Val, .*Ala5Val, \.\.\."):
+            validate_hgvs_column(df, "hgvs_pro")
+
+    def test_requires_variants(self):
+        with self.assertRaises(ValueError):
+            validate_dataframe(self.scores.assign(hgvs_nt=None, hgvs_pro=None), "scores")
+
+    def test_primary_column_must_be_complete_and_unique(self):
+        for values in (["c.1A>G", None, "c.2A>T"], ["c.1A>G", "c.1A>G", "c.2A>T"]):
+            with self.subTest(values=values), self.assertRaises(ValueError):
+                validate_dataframe(self.scores.assign(hgvs_nt=values), "scores")
+
+    def test_data_columns_must_be_numeric(self):
+        with self.assertRaisesRegex(ValueError, "'score'"):
+            validate_dataframe(self.scores.assign(score=["a", "b", "c"]), "scores")
+
+    def test_scores_require_score_column(self):
+        with self.assertRaisesRegex(ValueError, "score"):
+            validate_dataframe(self.scores.drop(columns="score"), "scores")
+        validate_dataframe(self.counts, "counts")
+
+    def test_scores_and_counts_must_define_same_variants(self):
+        for counts in (self.counts.iloc[:2], self.counts.iloc[::-1]):
+            with self.subTest(counts=counts), self.assertRaises(ValueError):
+                validate_dataframe_pair(self.scores, counts)
+
+    def test_files_are_not_validated(self):
+        validate_upload_sources("scores.csv", "counts.csv")
+        with self.assertRaises(ValueError):
+            validate_upload_sources("scores.csv", self.counts.drop(columns="hgvs_nt"))
+
+
+class TestClientUploadValidation(ClientTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client.auth_token = "secret"
+        self.scores = pd.DataFrame({"hgvs_pro": ["p.Ala1Val", "p.Ala1Val"], "score": [0.1, 0.2]})
+
+    async def test_invalid_dataframes_are_not_uploaded(self):
+        await self.client.upload_dataframes({"urn": URN}, self.scores)
+        self.assertEqual(self.requests, [])
+
+    async def test_validation_can_be_skipped(self):
+        await self.client.upload_dataframes({"urn": URN}, self.scores, validate=False)
+        self.assertIn(URN, self.uploads)
+
+    async def test_create_dataset_validates_dataframes_before_posting(self):
+        with mock.patch("mavetools.client.client.validate_dataset_with_create_model"), self.assertRaises(ValueError):
+            await self.client.create_dataset({"title": "s1", "target_genes": []}, self.scores)
+        self.assertEqual(self.requests, [])
@@ -2,9 +2,11 @@ import os
 import unittest
 from unittest.mock import patch
 
+from fqfa.constants.iupac.protein import AA_CODES
+from fqfa.constants.translation.table import CODON_TABLE
 from mavehgvs.exceptions import MaveHgvsParseError
 
-from mavetools.convert.enrich2 import base, exceptions
+from mavetools.convert.enrich2 import base, constants, events, exceptions
 from tests import ProgramTestCase
 
 
@@ -155,6 +157,57 @@ class TestWtSequence(ProgramTestCase):
             p.wt_sequence = "fff"
 
 
+class TestSubstitutionResidues(ProgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.data_dir, "enrich", "enrich.tsv")
+        self.base = BaseTest(src=self.src, wt_sequence="ATGAAATTATGG", one_based=True)
+
+    def test_table_matches_codon_translation(self):
+        for c, codon in enumerate(self.base.codons):
+            for f in range(3):
+                for b, base_ in enumerate(constants.dna_bases):
+                    mutant = codon[:f] + base_ + codon[f + 1 :]
+                    self.assertEqual(
+                        constants.amino_acids[self.base.substitution_residues[c, f, b]],
+                        AA_CODES[CODON_TABLE[mutant]],
+                    )
+
+    def test_silent_code_gives_wt_residue(self):
+        residues = self.base.substitution_residues[:, :, constants.silent_code]
+        self.assertEqual([constants.amino_acids[r] for r in residues[:, 0]], ["Met", "Lys", "Leu", "Trp"])
+        self.assertTrue((residues == residues[:, :1]).all())
+
+    def test_ignores_incomplete_codon(self):
+        self.base.wt_sequence = "ATGAA"
+        self.assertEqual(self.base.substitution_residues.shape, (1, 3, 5))
+
+    def test_not_computed_for_non_coding(self):
+        p = BaseTest(src=self.src, wt_sequence="ATG", is_coding=False)
+        self.assertIsNone(p.substitution_residues)
+
+    def test_infers_residues_for_single_events(self):
+        codes = constants.dna_base_codes
+        wt, mut = self.base.infer_synonymous_residues([6, 7, 9], [codes["G"], codes["C"], constants.silent_code])
+        self.assertEqual([constants.amino_acids[r] for r in wt], ["Lys", "Leu", "Leu"])
+        self.assertEqual([constants.amino_acids[r] for r in mut], ["Lys", "Leu", "Leu"])
+
+    def test_infers_residues_for_grouped_events(self):
+        codes = constants.dna_base_codes
+        # TTA -> CTT (Leu), AAA -> AAG (Lys), ATG -> ATA (Ile), TTA -> TTG, last change wins
+        positions = [7, 8, 9, 6, 3, 9, 9]
+        alts = [codes["C"], constants.silent_code, codes["T"], codes["G"], codes["A"], codes["T"], codes["G"]]
+        groups = [0, 0, 0, 1, 2, 3, 3]
+        wt, mut = self.base.infer_synonymous_residues(positions, alts, groups)
+        self.assertEqual([constants.amino_acids[r] for r in wt], ["Leu", "Lys", "Met", "Leu"])
+        self.assertEqual([constants.amino_acids[r] for r in mut], ["Leu", "Lys", "Ile", "Leu"])
+
+    def test_silent_events_do_not_undo_changes(self):
+        codes = constants.dna_base_codes
+        _, mut = self.base.infer_synonymous_residues([3, 3], [codes["A"], constants.silent_code], [0, 0])
+        self.assertEqual([constants.amino_acids[r] for r in mut], ["Ile"])
+
+
 class TestBaseProgramValidateAgainstWTSeq(ProgramTestCase):
     def setUp(self):
         super().setUp()
@@ -256,5 +309,34 @@ class TestBaseProgramValidateAgainstProteinSeq(ProgramTestCase):
             self.base.validate_against_protein_sequence("p.Met3Lys")
 
 
+class TestBaseProgramValidateTable(ProgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.data_dir, "enrich", "enrich.tsv")
+        self.base = BaseTest(src=self.src, wt_sequence="ATGAAA", one_based=True)
+
+    def test_rejects_rows_not_matching_wt_sequence(self):
+        table = events.EventTable.from_variants(["c.1A>G", "c.1T>G", "c.7A>G", "c.7=", "c.2T>C, c.4G>A"])
+        self.base.validate_table_against_wt_sequence(table)
+        self.assertEqual(table.invalid.tolist(), [False, True, True, False, True])
+
+    def test_validates_non_coding_sequence(self):
+        p = BaseTest(src=self.src, wt_sequence="ATG", is_coding=False, one_based=True)
+        table = events.EventTable.from_variants(["n.1A>G", "n.1T>G"])
+        p.validate_table_against_wt_sequence(table)
+        self.assertEqual(table.invalid.tolist(), [False, True])
+
+    def test_rejects_rows_not_matching_protein_sequence(self):
+        table = events.EventTable.from_variants(["p.Met1Lys", "p.Lys1Met", "p.Lys3Met", "p.=", "p.Lys2=, p.Met2Lys"])
+        self.base.validate_table_against_protein_sequence(table)
+        self.assertEqual(table.invalid.tolist(), [False, True, True, False, True])
+
+    def test_rejects_protein_events_for_non_coding_sequence(self):
+        p = BaseTest(src=self.src, wt_sequence="ATG", is_coding=False)
+        table = events.EventTable.from_variants(["n.1A>G", "p.Met1Lys"])
+        p.validate_table_against_protein_sequence(table)
+        self.assertEqual(table.invalid.tolist(), [False, True])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -12,7 +12,8 @@ from mavehgvs.patterns import dna, protein
 from pandas.testing import assert_index_equal
 
 import mavetools
-from mavetools.convert.enrich2 import constants, enrich2, exceptions, format
+from mavetools.convert.enrich2 import constants, enrich2, exceptions, format, utilities
+from mavetools.convert.enrich2.sink import InvalidRowSink
 from tests import ProgramTestCase
 
 
@@ -310,6 +311,21 @@ class TestEnrich2ConvertH5Df(ProgramTestCase):
         self.assertTrue(np.issubdtype(result["score"].values[0], np.signedinteger))
         self.assertTrue(np.issubdtype(result["B"].values[0], np.floating))
 
+    @patch("mavetools.convert.enrich2.enrich2.tqdm")
+    def test_parses_and_reports_progress_in_chunks(self, tqdm):
+        df = pd.DataFrame(
+            data={"score": [1.1, 1.2, 1.3]},
+            index=["c.1A>G (p.Lys1Arg)", "c.2A>G (p.Lys1Arg)", "c.3A>G (p.Lys1=)"],
+        )
+        expected = self.enrich2.convert_h5_df(df=df, element=constants.variants_table, df_type=constants.score_type)
+        self.enrich2.CHUNK_SIZE = 2
+        with patch.object(self.enrich2, "parse_rows", wraps=self.enrich2.parse_rows) as parse_rows:
+            result = self.enrich2.convert_h5_df(df=df, element=constants.variants_table, df_type=constants.score_type)
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual([len(c.args[0]) for c in parse_rows.call_args_list], [2, 1])
+        progress = tqdm.return_value.__enter__.return_value
+        self.assertEqual([c.args for c in progress.update.call_args_list[-2:]], [(2,), (1,)])
+
     def test_sets_index_as_input_index(self):
         df = pd.DataFrame({"score": [1], "B": ["a"]}, index=["c.1A>T (p.Lys1Val)"])
         result = self.enrich2.convert_h5_df(df=df, element=constants.variants_table, df_type=constants.score_type)
@@ -363,6 +379,54 @@ class TestEnrich2ConvertH5Df(ProgramTestCase):
         self.assertEqual(invalid.index[0], "c.1T>G (p.Lys1Val)")
         self.assertIn("error_description", invalid.columns)
 
+    def test_invalid_rows_file_contains_error_code(self):
+        self.path = os.path.join(self.data_dir, "enrich2", "enrich2.tsv")
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="AAA")
+        invalid_rows_path = os.path.join(os.path.dirname(self.path), "enrich2_invalid_rows.csv")
+
+        df = pd.DataFrame(
+            data={"score": [1.1, 1.2, 1.3]},
+            index=["c.1A>T (p.Lys1Val)", "c.1T>G (p.Lys1Val)", "c.4A>G (p.Lys2Val)"],
+        )
+        self.enrich2.convert_h5_df(df=df, df_type=constants.score_type, element=None)
+
+        invalid = pd.read_csv(invalid_rows_path, sep=",", index_col=0)
+        self.assertEqual(list(invalid["error_code"]), ["reference_mismatch", "out_of_bounds"])
+        self.assertEqual(list(invalid["score"]), [1.2, 1.3])
+
+    def test_writes_invalid_rows_per_chunk(self):
+        self.path = os.path.join(self.data_dir, "enrich2", "enrich2.tsv")
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="AAA")
+        self.enrich2.CHUNK_SIZE = 2
+        invalid_rows_path = os.path.join(os.path.dirname(self.path), "enrich2_invalid_rows.csv")
+        df = pd.DataFrame(
+            data={"score": [1.1, 1.2, 1.3, 1.4, 1.5]},
+            index=["c.1T>G (p.Lys1Val)", "c.1A>T (p.Lys1Val)", "c.4A>G (p.Lys2Val)", "c.2A>G", "c.1T>G"],
+        )
+        with patch(
+            "mavetools.convert.enrich2.sink.InvalidRowSink.add", autospec=True, side_effect=InvalidRowSink.add
+        ) as add:
+            self.enrich2.convert_h5_df(df=df, df_type=constants.score_type, element=None)
+        self.assertEqual([len(c.args[1]) for c in add.call_args_list], [1, 1, 1])
+
+        invalid = pd.read_csv(invalid_rows_path, sep=",", index_col=0)
+        self.assertEqual(list(invalid.index), ["c.1T>G (p.Lys1Val)", "c.4A>G (p.Lys2Val)", "c.1T>G"])
+        self.assertEqual(list(invalid["score"]), [1.1, 1.3, 1.5])
+
+    @patch("mavetools.convert.enrich2.sink.logger.warning")
+    @patch("mavetools.convert.enrich2.enrich2.logger.warning")
+    def test_logs_one_summary_for_invalid_rows(self, enrich2_warning, sink_warning):
+        self.path = os.path.join(self.data_dir, "enrich2", "enrich2.tsv")
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="AAA")
+        df = pd.DataFrame(
+            data={"score": [1.1, 1.2, 1.3]},
+            index=["c.1A>T (p.Lys1Val)", "c.1T>G (p.Lys1Val)", "c.2T>G (p.Lys1Val)"],
+        )
+        self.enrich2.convert_h5_df(df=df, df_type=constants.score_type, element=None)
+        enrich2_warning.assert_not_called()
+        sink_warning.assert_called_once()
+        self.assertIn("reference_mismatch: 2", sink_warning.call_args[0][0])
+
 
 class TestEnrich2LoadInput(ProgramTestCase):
     def test_error_file_not_h5_or_tsv(self):
@@ -458,8 +522,8 @@ class TestEnrich2ParseRow(ProgramTestCase):
             self.enrich2.parse_row((constants.enrich2_synonymous, constants.synonymous_table)),
         )
 
-    @patch("mavetools.convert.enrich2.enrich2.apply_offset", return_value="c.3T>C (p.Thr1=)")
-    def test_calls_apply_offset_to_variant(self, patch):
+    @patch("mavetools.convert.enrich2.enrich2.offset_tokens")
+    def test_calls_offset_tokens_on_variant(self, patch):
         variant = "c.3T>C (p.=)"
         self.enrich2.parse_row((variant, None))
         patch.assert_called()
@@ -494,6 +558,167 @@ class TestEnrich2ParseRow(ProgramTestCase):
 
 # Protein parsing tests
 # --------------------------------------------------------------------------- #
+class TestEnrich2ParseRows(ProgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.data_dir, "enrich2", "dummy.h5")
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="AAAGGGTCTACTTTA")
+        self.variants = [
+            "c.1A>G (p.Lys1Arg), c.5G>A (p.Gly2Glu), c.9T>C (p.=)",
+            "c.9T>C p.=, c.8C>A p.Ser3Tyr",
+            "c.13T>C (p.=), c.15A>G (p.=)",
+            "c.3A>G (p.Lys1=)",
+            "c.1A>G, c.3A>C",
+            "c.2A>G",
+            "n.2A>G",
+            "p.Lys1Arg, p.=",
+            "p.=, p.Lys1Arg",
+            "p.Lys1Lys",
+            "_wt",
+            " _sy",
+        ]
+        # The first eight rows are rejected by the columnar code path.
+        self.invalid = [
+            "c.1T>G (p.Lys1Arg)",
+            "c.1A>G (p.Lys1Arg), c.4G>A",
+            "c.1A>G (p.=)",
+            "c.16= (p.=)",
+            "c.1A>G, n.2A>G",
+            "c.1A>G, p.Lys1Arg",
+            "p.Gly1Arg",
+            "p.Lys6Arg",
+            "c.1_2del",
+            "b.1A>G",
+            "c.1A>G,",
+        ]
+
+    def assert_matches_parse_row(self, variants, element=None):
+        for variant, result in zip(variants, self.enrich2.parse_rows(variants, element)):
+            try:
+                expected = self.enrich2.parse_row((variant, element))
+            except Exception:
+                self.assertFalse(result.ok)
+            else:
+                self.assertEqual(result, utilities.ParseResult(True, expected, None))
+
+    def test_matches_parse_row_for_valid_rows(self):
+        results = self.enrich2.parse_rows(self.variants)
+        self.assertTrue(all(r.ok for r in results))
+        self.assert_matches_parse_row(self.variants)
+
+    def test_matches_parse_row_for_invalid_rows(self):
+        results = self.enrich2.parse_rows(self.invalid)
+        self.assertFalse(any(r.ok for r in results))
+        self.assert_matches_parse_row(self.invalid)
+
+    def test_matches_parse_row_for_synonymous_element(self):
+        self.assert_matches_parse_row(self.variants + self.invalid, constants.synonymous_table)
+
+    def test_categorizes_invalid_rows(self):
+        codes = [r.value for r in self.enrich2.parse_rows(self.invalid)]
+        expected = [
+            "reference_mismatch",
+            "mixed_syntax",
+            "non_synonymous",
+            "out_of_bounds",
+            "mixed_prefix",
+            "mixed_syntax",
+            "reference_mismatch",
+            "out_of_bounds",
+            "unsupported_event",
+            "invalid_syntax",
+            "invalid_variant",
+        ]
+        self.assertEqual(codes, expected)
+        self.assertTrue(all(c in constants.parse_errors for c in codes))
+
+    def test_error_detail_names_event(self):
+        result = self.enrich2.parse_rows(["c.1A>G (p.Lys1Arg), c.4T>A (p.Gly2Arg)"])[0]
+        self.assertEqual(
+            result.detail,
+            "{}: 'c.4T>A (p.Gly2Arg)' in 'c.1A>G (p.Lys1Arg), c.4T>A (p.Gly2Arg)'.".format(
+                constants.parse_errors["reference_mismatch"]
+            ),
+        )
+
+    def test_does_not_raise_for_invalid_rows(self):
+        with patch.object(self.enrich2, "parse_row", side_effect=AssertionError) as parse_row:
+            self.enrich2.parse_rows(self.invalid[:8])
+        parse_row.assert_not_called()
+
+    def test_rejects_out_of_range_positions_without_raising(self):
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="ATG")
+        variants = ["p.Met5Val", "c.13A>G (p.Met5Val)", "c.13A>G (p.=)", "c.13A>G"]
+        with patch.object(self.enrich2, "parse_row", side_effect=AssertionError):
+            results = self.enrich2.parse_rows(variants)
+        self.assertEqual([r.value for r in results], ["out_of_bounds"] * 4)
+        self.assert_matches_parse_row(variants)
+
+    def test_try_parse_row(self):
+        self.assertEqual(self.enrich2.try_parse_row("c.2A>G"), utilities.ParseResult(True, ("c.2A>G", None), None))
+        result = self.enrich2.try_parse_row("c.1_2del")
+        self.assertFalse(result.ok)
+        self.assertEqual(result.value, "unsupported_event")
+        self.assertIn("c.1_2del", result.detail)
+
+    def test_matches_parse_row_with_offset(self):
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="AAAGGGTCTACTTTA", offset=-3)
+        self.assert_matches_parse_row(["c.4A>G (p.Lys2Arg), c.6A>G (p.=)", "p.Lys2Arg", "c.3A>G", "p.Lys1Arg"])
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="AAAGGGTCTACTTTA", offset=3)
+        self.assert_matches_parse_row(["c.4G>A (p.Gly2Glu), c.6G>A (p.=)", "p.Gly2Glu", "c.3A>G", "p.Gly1Glu"])
+
+    def test_rejects_positions_made_negative_by_offset(self):
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="ATG", offset=6)
+        results = self.enrich2.parse_rows(["p.Met1Val", "c.1A>G (p.Met1Val)"])
+        self.assertEqual([r.value for r in results], ["invalid_position", "invalid_position"])
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="AAAGGGTCTACTTTA", offset=6)
+        results = self.enrich2.parse_rows(["p.Thr1Val", "p.Leu4Val, p.Thr1Val"])
+        self.assertEqual([r.value for r in results], ["invalid_position", "invalid_position"])
+        self.assert_matches_parse_row(["p.Thr1Val", "p.Leu4Val, p.Thr1Val"])
+
+    def test_matches_parse_row_for_zero_based_synonymous_events(self):
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="GAGTGAAAG", offset=-3, one_based=False)
+        self.assertFalse(self.enrich2.parse_rows(["c.5G>A (p.=)"])[0].ok)
+        self.assert_matches_parse_row(["c.5G>A (p.=)", "c.5A>G (p.=)", "c.4G>A (p.=), c.5A>G (p.=)"])
+
+    def test_matches_parse_row_for_random_mixed_rows(self):
+        rng = np.random.default_rng(0)
+        residues = [AA_CODES[aa] for aa in "ACDEFGHIKLMNPQRSTVWY"]
+        for one_based in (True, False):
+            for offset in (-3, 0, 3):
+                wt_sequence = "".join(rng.choice(list("ACGT"), size=12))
+                self.enrich2 = enrich2.Enrich2(self.path, wt_sequence, offset=offset, one_based=one_based)
+                variants = []
+                for _ in range(200):
+                    events = []
+                    for _ in range(rng.integers(1, 4)):
+                        position = int(rng.integers(1, 16))
+                        ref, alt = rng.choice(list("ACGT"), size=2, replace=False)
+                        if rng.random() < 0.6:
+                            pro = "p.="
+                        else:
+                            pro = "p.{}{}{}".format(rng.choice(residues), (position - 1) // 3 + 1, rng.choice(residues))
+                        events.append("c.{}{}>{} ({})".format(position, ref, alt, pro))
+                    variants.append(", ".join(events))
+                with self.subTest(one_based=one_based, offset=offset):
+                    self.assert_matches_parse_row(variants)
+
+    def test_matches_parse_row_for_non_coding(self):
+        self.enrich2 = enrich2.Enrich2(self.path, wt_sequence="AAAGG", is_coding=False)
+        self.assert_matches_parse_row(["n.5G>A", "n.5=", "n.1A>G (p.=)", "p.=", "n.6A>G"])
+
+    def test_parses_without_scalar_path(self):
+        with patch.object(self.enrich2, "parse_row", side_effect=AssertionError) as parse_row:
+            self.enrich2.parse_rows(self.variants)
+        parse_row.assert_not_called()
+
+    @patch("mavetools.convert.enrich2.enrich2.logger.warning")
+    def test_warns_partially_synonymous_codon_groups(self, patch):
+        self.enrich2.parse_rows(["c.9T>C p.=, c.8C>A p.Ser3Tyr"])
+        patch.assert_called_once()
+        self.assertIn("'c.9T>C p.=, c.8C>A p.Ser3Tyr'", patch.call_args[0][0])
+
+
 class TestProteinHGVSParsing(ProgramTestCase):
     def setUp(self):
         super().setUp()
@@ -643,14 +868,31 @@ class TestEnrich2MixedHGVSParsing(ProgramTestCase):
         self.enrich2.wt_sequence = "AAAAAT"
         variant = "c.1= (p.=), c.6T>G (p.Asn2Lys), c.2= (p.=)"
         _, _ = self.enrich2.parse_mixed_variant(variant)
-        patch.assert_called_with(*(["c.1=", "c.2="], variant))
+        patch.assert_called_once()
+        events, row = patch.call_args[0]
+        self.assertEqual([e.format for e in events], ["c.1=", "c.2="])
+        self.assertEqual(row, variant)
 
     @patch.object(enrich2.Enrich2, "infer_silent_aa_substitution", return_value="p.Lys1=")
     def test_calls_infer_with_synonymous_variants_only(self, patch):
         self.enrich2.wt_sequence = "AAAAAT"
         variant = "c.1= (p.=), c.6T>G (p.Asn2Lys), c.2= (p.Lys1=)"
         _, _ = self.enrich2.parse_mixed_variant(variant)
-        patch.assert_called_with(*(["c.1="], variant))
+        patch.assert_called_once()
+        events, row = patch.call_args[0]
+        self.assertEqual([e.format for e in events], ["c.1="])
+        self.assertEqual(row, variant)
+
+    def test_parses_each_event_once(self):
+        self.enrich2.wt_sequence = "AAAAAT"
+        variant = "c.3A>G (p.=), c.6T>C (p.=), c.1A>C (p.Lys1Gln)"
+        with patch.object(
+            enrich2.utilities.NucleotideSubstitutionEvent, "__init__", side_effect=AssertionError
+        ) as init:
+            nt, pro = self.enrich2.parse_mixed_variant(variant)
+        init.assert_not_called()
+        self.assertEqual(nt, "c.[3A>G;6T>C;1A>C]")
+        self.assertEqual(pro, "p.[Lys1=;Asn2=;Lys1Gln]")
 
     def test_nt_variant_is_none_special_variant_is_from_synonymous_table(self):
         self.assertEqual(
@@ -726,6 +968,12 @@ class TestInferSilentAASub(ProgramTestCase):
         group = ["c.1T>C", "c.2=", "c.3A>T"]
         self.assertEqual("p.Leu1=", self.enrich2.infer_silent_aa_substitution(group))
 
+    def test_accepts_parsed_events_without_modifying_them(self):
+        self.enrich2.wt_sequence = "TTA"
+        group = [enrich2.utilities.NucleotideSubstitutionEvent(v) for v in ("c.1T>C", "c.2=")]
+        self.assertEqual("p.Leu1=", self.enrich2.infer_silent_aa_substitution(group))
+        self.assertEqual([e.format for e in group], ["c.1T>C", "c.2="])
+
     def test_valueerror_mixed_codons_in_group(self):
         with self.assertRaises(ValueError):
             self.enrich2.infer_silent_aa_substitution(["c.1T>C", "c.5T>C"])
@@ -767,13 +1015,14 @@ class TestApplyOffset(ProgramTestCase):
         self.assertEqual("p.Leu7=, p.Leu10=", enrich2.apply_offset(variant, offset))
         self.assertEqual("p.Leu7=", enrich2.apply_offset("p.Leu10=", offset))
 
-    @patch.object(mavetools.convert.enrich2.enrich2.base.BaseProgram, "validate_against_wt_sequence")
+    @patch.object(mavetools.convert.enrich2.enrich2.base.BaseProgram, "validate_event_against_wt_sequence")
     def test_validates_against_wt_sequence(self, patch):
         variant = "c.-9C>T"
         path = os.path.join(self.data_dir, "enrich2", "dummy.h5")
         p = enrich2.Enrich2(path, wt_sequence="ACT")
         enrich2.apply_offset(variant, offset=-10, enrich2=p)  # pass
-        patch.assert_called_with(*("c.1C>T",))
+        patch.assert_called_once()
+        self.assertEqual(patch.call_args[0][0].format, "c.1C>T")
 
     def test_value_error_base_mismatch_after_offset_applied(self):
         variant = "c.-9G>T"
@@ -782,13 +1031,18 @@ class TestApplyOffset(ProgramTestCase):
         with self.assertRaises(ValueError):
             enrich2.apply_offset(variant, offset=-10, enrich2=p)
 
-    @patch.object(mavetools.convert.enrich2.enrich2.base.BaseProgram, "validate_against_protein_sequence")
+    @patch.object(mavetools.convert.enrich2.enrich2.base.BaseProgram, "validate_event_against_protein_sequence")
     def test_validates_against_pro_sequence(self, patch):
         variant = "p.Gly3Leu"
         path = os.path.join(self.data_dir, "enrich2", "dummy.h5")
         p = enrich2.Enrich2(path, wt_sequence="ACG")
         enrich2.apply_offset(variant, offset=6, enrich2=p)  # pass
-        patch.assert_called_with(*("p.Gly1Leu",))
+        patch.assert_called_once()
+        self.assertEqual(patch.call_args[0][0].format, "p.Gly1Leu")
+
+    def test_preserves_brackets_around_protein_events(self):
+        variant = "c.-9A>T (p.Thr2Pro), c.-6C>A p.Gln3Lys"
+        self.assertEqual("c.1A>T (p.Thr1Pro), c.4C>A p.Gln2Lys", enrich2.apply_offset(variant, -10))
 
     def test_value_error_pro_mismatch_after_offset_applied(self):
         variant = "p.Gly3Leu"
@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+
+from mavetools.convert.enrich2 import constants, events
+
+
+class TestEventTableFromVariants(unittest.TestCase):
+    def test_one_event_per_entry(self):
+        table = events.EventTable.from_variants(["c.1A>G (p.Lys1Arg), c.6= p.=", "p.Lys1Arg"])
+        self.assertEqual(table.row.tolist(), [0, 0, 1])
+        self.assertEqual(table.row_starts.tolist(), [0, 2, 3])
+
+    def test_encodes_nucleotide_events(self):
+        table = events.EventTable.from_variants(["n.3A>G, n.6=, p.Lys1Arg"])
+        self.assertEqual(table.prefix.tolist(), [constants.nt_prefix_codes["n"]] * 2 + [constants.no_prefix])
+        self.assertEqual(table.position.tolist(), [3, 6, 0])
+        self.assertEqual(
+            table.ref.tolist(), [constants.dna_base_codes["A"], constants.silent_code, constants.silent_code]
+        )
+        self.assertEqual(
+            table.alt.tolist(), [constants.dna_base_codes["G"], constants.silent_code, constants.silent_code]
+        )
+        self.assertEqual(table.has_nt.tolist(), [True, True, False])
+
+    def test_encodes_protein_events(self):
+        table = events.EventTable.from_variants(["c.1A>G (p.Lys1Arg), c.4A>G p.Lys2=, c.7A>G (p.=), c.9A>G"])
+        self.assertEqual(table.has_pro.tolist(), [True, True, True, False])
+        self.assertEqual(table.pro_position.tolist(), [1, 2, 0, 0])
+        self.assertEqual(table.pro_ref[:2].tolist(), [constants.amino_acid_ids["Lys"]] * 2)
+        self.assertEqual(table.pro_alt[:2].tolist(), [constants.amino_acid_ids[aa] for aa in ("Arg", "Lys")])
+        self.assertEqual(table.synonymous.tolist(), [False, True, True, False])
+        self.assertEqual(table.unresolved.tolist(), [False, False, True, False])
+        self.assertEqual(table.bracketed.tolist(), [True, False, True, False])
+
+    def test_explicit_silent_protein_event_is_not_synonymous(self):
+        table = events.EventTable.from_variants(["p.Lys1Lys"])
+        self.assertEqual(table.synonymous.tolist(), [False])
+
+    def test_flags_special_variants(self):
+        table = events.EventTable.from_variants(["_wt", " _sy ", "c.1A>G"])
+        self.assertEqual(table.special.tolist(), [True, True, False])
+        self.assertEqual(table.row.tolist(), [2])
+
+    def test_flags_unmatched_rows(self):
+        table = events.EventTable.from_variants(["c.1_2del", "c.1A>G,", None, "c.1A>G"])
+        self.assertEqual(table.unmatched.tolist(), [True, True, True, False])
+        self.assertEqual(table.invalid.tolist(), [False] * 4)
+        self.assertEqual(table.row.tolist(), [3])
+
+    def test_empty(self):
+        table = events.EventTable.from_variants([])
+        self.assertEqual(len(table), 0)
+        self.assertEqual(list(table.render_rows()), [])
+
+
+class TestEventTableRender(unittest.TestCase):
+    def test_renders_each_row_once(self):
+        table = events.EventTable.from_variants(
+            ["c.1A>G (p.Lys1Arg), c.6A>G (p.Lys2=)", "c.1A>G", "p.Lys1Arg, p.Lys1Arg", "_wt"]
+        )
+        self.assertEqual(
+            list(table.render_rows()),
+            [
+                (0, ("c.[1A>G;6A>G]", "p.[Lys1Arg;Lys2=]")),
+                (1, ("c.1A>G", None)),
+                (2, (None, "p.Lys1Arg")),
+            ],
+        )
+
+    def test_skips_invalid_rows(self):
+        table = events.EventTable.from_variants(["c.1A>G", "c.2A>G"])
+        table.reject(table.position == 1, "out_of_bounds")
+        self.assertEqual(list(table.render_rows()), [(1, ("c.2A>G", None))])
+
+
+class TestEventTableReject(unittest.TestCase):
+    def setUp(self):
+        self.table = events.EventTable.from_variants(["c.1A>G, c.2A>G, c.3A>G", "c.4A>G"])
+
+    def test_keeps_first_event_of_row(self):
+        self.table.reject(self.table.position > 1, "out_of_bounds")
+        self.assertEqual(self.table.invalid.tolist(), [True, True])
+        self.assertEqual(self.table.error_event.tolist(), [1, 3])
+        self.assertEqual(
+            self.table.describe_error(0),
+            (
+                "out_of_bounds",
+                "{}: 'c.2A>G' in 'c.1A>G, c.2A>G, c.3A>G'.".format(constants.parse_errors["out_of_bounds"]),
+            ),
+        )
+
+    def test_keeps_first_error(self):
+        self.table.reject(np.array([2]), "reference_mismatch")
+        self.table.reject(np.array([0]), "out_of_bounds")
+        self.assertEqual(self.table.describe_error(0)[0], "reference_mismatch")
+        self.assertEqual(self.table.error_event[0], 2)
+
+    def test_reject_rows(self):
+        self.table.reject_rows(np.array([False, True]), "mixed_syntax")
+        self.table.reject_rows(np.array([1]), "mixed_prefix", "detail")
+        self.assertEqual(self.table.invalid.tolist(), [False, True])
+        self.assertEqual(
+            self.table.describe_error(1),
+            ("mixed_syntax", "{}: 'c.4A>G'.".format(constants.parse_errors["mixed_syntax"])),
+        )
+
+    def test_format_events_keeps_brackets(self):
+        table = events.EventTable.from_variants(["c.1A>G (p.Lys1Arg), c.6= p.="])
+        self.assertEqual(table.format_events([0, 1]), "c.1A>G (p.Lys1Arg), c.6= p.=")
@@ -0,0 +1,51 @@
+import os
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from mavetools.convert.enrich2.sink import InvalidRowSink
+from tests import ProgramTestCase
+
+
+class TestInvalidRowSink(ProgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.data_dir, "invalid_rows.csv")
+        self.df = pd.DataFrame({"score": [1.0, 2.0, 3.0]}, index=["a", "b", "c"])
+
+    def test_does_not_create_file_without_rows(self):
+        with InvalidRowSink(self.path):
+            pass
+        self.assertFalse(os.path.isfile(self.path))
+
+    def test_writes_rows_with_code_and_description(self):
+        with InvalidRowSink(self.path) as sink:
+            sink.add(self.df, ["x", "y", "x"], ["1", "2", "3"])
+        result = pd.read_csv(self.path, index_col=0)
+        self.assertEqual(list(result.index), ["a", "b", "c"])
+        self.assertEqual(list(result.columns), ["score", "error_code", "error_description"])
+        self.assertEqual(list(result["error_code"]), ["x", "y", "x"])
+
+    def test_writes_in_batches(self):
+        sink = InvalidRowSink(self.path, batch_size=2)
+        sink.add(self.df.iloc[:1], ["x"], ["1"])
+        self.assertFalse(os.path.isfile(self.path))
+        sink.add(self.df.iloc[1:2], ["x"], ["2"])
+        self.assertEqual(len(pd.read_csv(self.path, index_col=0)), 2)
+        sink.add(self.df.iloc[2:], ["y"], ["3"])
+        sink.close()
+        result = pd.read_csv(self.path, index_col=0)
+        self.assertEqual(list(result.index), ["a", "b", "c"])
+
+    @patch("mavetools.convert.enrich2.sink.logger.warning")
+    def test_logs_summary_count(self, patch):
+        with InvalidRowSink(self.path) as sink:
+            sink.add(self.df, ["x", "y", "x"], ["1", "2", "3"])
+        patch.assert_called_once()
+        self.assertIn("Could not parse 3 rows (x: 2, y: 1)", patch.call_args[0][0])
+        self.assertEqual(sink.counts, {"x": 2, "y": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
 import numpy as np
+from mavehgvs.exceptions import MaveHgvsParseError
 
 from mavetools.convert.enrich2 import constants, exceptions, utilities
 
@@ -142,6 +143,59 @@ class TestProteinSubstitutionEvent(unittest.TestCase):
         self.assertEqual(utilities.ProteinSubstitutionEvent("p.Gly2Leu").event, "Gly2Leu")
 
 
+class TestTokenizeVariant(unittest.TestCase):
+    def test_tokenizes_mixed_variant(self):
+        tokens = utilities.tokenize_variant("c.1A>G (p.Met1Val), c.2T>C (p.=)")
+        self.assertEqual(len(tokens), 2)
+        self.assertEqual(tokens[0].nt.position, 1)
+        self.assertEqual(tokens[0].nt.ref, "A")
+        self.assertEqual(tokens[0].nt.alt, "G")
+        self.assertEqual(tokens[0].pro.position, 1)
+        self.assertEqual(tokens[0].pro.ref, "Met")
+        self.assertEqual(tokens[0].pro.alt, "Val")
+        self.assertTrue(tokens[0].bracketed)
+        self.assertIsNone(tokens[1].pro.position)
+        self.assertEqual(tokens[1].pro.format, "p.=")
+
+    def test_tokenizes_nt_and_pro_only_variants(self):
+        tokens = utilities.tokenize_variant("c.-4A>G, c.2=")
+        self.assertEqual([t.nt.position for t in tokens], [-4, 2])
+        self.assertTrue(tokens[1].nt.silent)
+        self.assertTrue(all(t.pro is None for t in tokens))
+
+        tokens = utilities.tokenize_variant("p.Thr1=, p.Thr1Gly")
+        self.assertTrue(all(t.nt is None for t in tokens))
+        self.assertTrue(tokens[0].pro.silent)
+        self.assertEqual(tokens[1].pro.alt, "Gly")
+
+    def test_tokens_match_slow_parser(self):
+        for variant in ("c.1A>G", "c.1=", "c.-10T>C", "n.5G>A", "p.Lys1Arg", "p.Lys1="):
+            token = utilities.tokenize_variant(variant)[0]
+            event = token.nt or token.pro
+            if variant.startswith("p"):
+                expected = utilities.ProteinSubstitutionEvent(variant)
+            else:
+                expected = utilities.NucleotideSubstitutionEvent(variant)
+            self.assertEqual(
+                (event.prefix, event.position, event.ref, event.alt, event.silent),
+                (expected.prefix, expected.position, expected.ref, expected.alt, expected.silent),
+            )
+
+    def test_falls_back_to_slow_parser_errors(self):
+        with self.assertRaises(exceptions.InvalidVariantType):
+            utilities.tokenize_variant("c.1A>G, c.1_2del")
+        with self.assertRaises(MaveHgvsParseError):
+            utilities.tokenize_variant("g.-1A>G")
+
+    def test_error_empty_event(self):
+        with self.assertRaises(ValueError):
+            utilities.tokenize_variant("c.1A>G,")
+
+    def test_format_tokens_round_trips(self):
+        variant = "c.1A>G (p.Met1Val), c.2T>C p.=, p.Lys4Arg"
+        self.assertEqual(utilities.format_tokens(utilities.tokenize_variant(variant)), variant)
+
+
 class TestSplitVariant(unittest.TestCase):
     def test_split_hgvs_singular_list_non_multi_variant(self):
         self.assertListEqual(["c.100A>G"], utilities.split_variant("c.100A>G"))